@@ -0,0 +1,41 @@
+"""Compara la generación por columnas (arreglos) con el generador por filas.
+
+Uso: python -m benchmarks.bench_generacion [-n FILAS] [-c CATEGORIA ...]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from generador import config
+from generador.motor import construir_choices, generar_categoria
+from generador.pools import obtener_pool
+
+
+def _medir(fake, categoria, filas, por_filas):
+    fake.seed_instance(0)
+    inicio = time.perf_counter()
+    generar_categoria(fake, categoria, filas, choices=construir_choices(categoria),
+                      rng=np.random.default_rng(0), por_filas=por_filas)
+    return time.perf_counter() - inicio
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("-n", "--filas", type=int, default=20_000)
+    p.add_argument("-c", "--categoria", action="append", choices=list(config),
+                   help="categoría a medir (repetible; por defecto todas las que tienen generadores por columna)")
+    args = p.parse_args(argv)
+
+    fake = obtener_pool("es_CO")
+    categorias = args.categoria or [c for c in config if config[c].get("column_generators")]
+    print(f"{'categoría':<12} {'filas (s)':>10} {'columnas (s)':>13} {'x':>7}")
+    for cat in categorias:
+        t_filas = _medir(fake, cat, args.filas, por_filas=True)
+        t_columnas = _medir(fake, cat, args.filas, por_filas=False)
+        print(f"{cat:<12} {t_filas:>10.3f} {t_columnas:>13.4f} {t_filas / t_columnas:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Compara la inyección de datos sucios vectorizada con la versión celda a celda.
+
+Uso: python -m benchmarks.bench_sucios [-n FILAS]
+"""
+
+import argparse
+import random
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from generador.motor import Especificacion, generar_dataframes
+from generador.sucios import aplicar_datos_sucios
+
+
+# Implementación anterior (celda a celda), conservada solo como referencia.
+def aplicar_datos_sucios_por_celda(df: pd.DataFrame, porcentaje: int,
+                                   habilitar_nulos=True,
+                                   habilitar_duplicados=True,
+                                   habilitar_ruido_texto=True,
+                                   habilitar_outliers=True,
+                                   habilitar_tipos_erroneos=True):
+    if porcentaje <= 0 or df.empty:
+        return df
+
+    filas_afectadas = max(1, int(len(df) * porcentaje / 100))
+
+    # 1) Nulos
+    if habilitar_nulos:
+        for _ in range(filas_afectadas):
+            r = random.randrange(len(df))
+            c = random.choice(df.columns)
+            df.iat[r, df.columns.get_loc(c)] = None
+
+    # 2) Duplicados (copiamos filas aleatorias encima de otras)
+    if habilitar_duplicados and len(df) > 1:
+        for _ in range(filas_afectadas // 3 + 1):
+            src = df.sample(1).iloc[0]
+            dst = random.randrange(len(df))
+            df.loc[df.index[dst]] = src
+
+    # 3) Ruido en texto (espacios, mayúsculas raras, caracteres)
+    if habilitar_ruido_texto:
+        text_cols = [c for c in df.columns if df[c].dtype == object]
+        ruido_samples = max(1, filas_afectadas // 2)
+        for _ in range(ruido_samples):
+            if not text_cols:
+                break
+            c = random.choice(text_cols)
+            r = random.randrange(len(df))
+            val = df.at[df.index[r], c]
+            if val is None:
+                continue
+            s = str(val)
+            # Variantes de suciedad
+            choice = random.choice(["spaces", "caps", "garbage", "email_break"])
+            if choice == "spaces":
+                s = "  " + s + "   "
+            elif choice == "caps":
+                s = s.swapcase()
+            elif choice == "garbage":
+                s = s + random.choice(["@@@", "***", "###"])
+            elif choice == "email_break" and "email" in c.lower():
+                s = s.replace("@", "")  # email inválido
+            df.at[df.index[r], c] = s
+
+    # 4) Outliers numéricos
+    if habilitar_outliers:
+        num_cols = [c for c in df.columns if pd.api.types.is_numeric_dtype(df[c])]
+        out_samples = max(1, filas_afectadas // 2)
+        for _ in range(out_samples):
+            if not num_cols:
+                break
+            c = random.choice(num_cols)
+            r = random.randrange(len(df))
+            base = df.at[df.index[r], c]
+            if pd.isna(base):
+                continue
+            factor = random.choice([10, 25, 50])
+            df.at[df.index[r], c] = int(base) * factor
+
+    # 5) Tipos erróneos en columnas numéricas
+    if habilitar_tipos_erroneos:
+        num_cols = [c for c in df.columns if pd.api.types.is_numeric_dtype(df[c])]
+        err_samples = max(1, filas_afectadas // 3)
+        for _ in range(err_samples):
+            if not num_cols:
+                break
+            c = random.choice(num_cols)
+            r = random.randrange(len(df))
+            df.at[df.index[r], c] = "???"
+
+    return df
+
+
+def _medir(fn, df, porcentaje, **kwargs):
+    copia = df.copy()
+    inicio = time.perf_counter()
+    fn(copia, porcentaje, **kwargs)
+    return time.perf_counter() - inicio
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("-n", "--filas", type=int, default=50_000)
+    args = p.parse_args(argv)
+
+    spec = Especificacion.desde_dict({"categorias": ["Ventas", "Clientes"], "cantidad": args.filas})
+    dataframes = generar_dataframes(spec)
+    warnings.simplefilter("ignore", FutureWarning)
+
+    print(f"{'categoría':<10} {'%':>3} {'celda (s)':>10} {'vector (s)':>11} {'x':>7}")
+    for cat, df in dataframes.items():
+        for porcentaje in (10, 30):
+            t_celda = _medir(aplicar_datos_sucios_por_celda, df, porcentaje)
+            t_vector = _medir(aplicar_datos_sucios, df, porcentaje, rng=np.random.default_rng())
+            print(f"{cat:<10} {porcentaje:>3} {t_celda:>10.3f} {t_vector:>11.4f} {t_celda / t_vector:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""Suite de rendimiento: generación por categoría, datos sucios y exportadores.
+
+Uso: python -m benchmarks.suite [-o resultados.json] [--comparar anterior.json]
+
+Cada caso reporta segundos, filas/s y memoria pico (asignaciones vistas por
+``tracemalloc``, que incluye los arreglos de numpy/pandas). Los resultados se
+guardan en JSON junto con las versiones de las librerías, para comparar
+entre versiones del proyecto con ``--comparar``.
+"""
+
+import argparse
+import gc
+import json
+import platform
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from importlib import metadata
+from pathlib import Path
+
+import numpy as np
+
+from generador import config
+from generador.exportar import FORMATOS, EXTENSIONES, exportar
+from generador.motor import Especificacion, generar_dataframes
+from generador.sucios import aplicar_datos_sucios
+
+GRUPOS = ["generacion", "sucios", "exportar"]
+TIPOS_SUCIEDAD = ["nulos", "duplicados", "ruido_texto", "outliers", "tipos_erroneos"]
+LIBRERIAS = ["numpy", "pandas", "faker", "pyarrow", "xlsxwriter"]
+SEMILLA = 0
+
+
+# ===========================
+# Medición
+# ===========================
+
+def medir(fn, filas: int, memoria: bool = True) -> dict:
+    """Tiempo, filas/s y memoria pico (MiB) de ``fn()``.
+
+    El tiempo se toma sin ``tracemalloc`` (que multiplica el costo de crear
+    objetos Python); la memoria se mide en una segunda ejecución.
+    """
+    gc.collect()
+    inicio = time.perf_counter()
+    fn()
+    segundos = time.perf_counter() - inicio
+
+    pico = None
+    if memoria:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            fn()
+            pico = tracemalloc.get_traced_memory()[1] / 2**20
+        finally:
+            tracemalloc.stop()
+    return {
+        "filas": filas,
+        "segundos": round(segundos, 4),
+        "filas_por_segundo": round(filas / segundos) if segundos else None,
+        "memoria_pico_mib": None if pico is None else round(pico, 1),
+    }
+
+
+def _versiones() -> dict:
+    versiones = {"python": platform.python_version()}
+    for lib in LIBRERIAS:
+        try:
+            versiones[lib] = metadata.version(lib)
+        except metadata.PackageNotFoundError:
+            versiones[lib] = None
+    return versiones
+
+
+def _spec(categorias, cantidad: int) -> Especificacion:
+    return Especificacion.desde_dict({"categorias": list(categorias), "cantidad": cantidad,
+                                      "semilla": SEMILLA, "fecha_referencia": "2024-01-01"})
+
+
+def _imprimir(grupo: str, caso: str, r: dict):
+    if "omitido" in r:
+        print(f"{grupo:<11} {caso:<28} omitido: {r['omitido']}")
+        return
+    mem = "-" if r["memoria_pico_mib"] is None else f"{r['memoria_pico_mib']:.1f}"
+    print(f"{grupo:<11} {caso:<28} {r['filas']:>10} {r['segundos']:>9.3f} "
+          f"{r['filas_por_segundo'] or 0:>12,} {mem:>9}")
+
+
+# ===========================
+# Grupos de casos
+# ===========================
+
+def bench_generacion(categorias, tamanos, memoria):
+    # Calentar pools de Faker (disco/memoria) para no medir la primera extracción
+    generar_dataframes(_spec(categorias, 10))
+    for cat in categorias:
+        for n in tamanos:
+            spec = _spec([cat], n)
+            yield f"{cat}", medir(lambda: generar_dataframes(spec), n, memoria)
+
+
+def bench_sucios(categorias, filas, memoria):
+    dataframes = generar_dataframes(_spec(categorias, filas))
+    for cat, df in dataframes.items():
+        for porcentaje in (0, 10, 30):
+            # con 0% no se toca nada: basta un caso para medir el atajo
+            for tipo in (TIPOS_SUCIEDAD if porcentaje else []) + ["todos"]:
+                flags = {f"habilitar_{t}": tipo in (t, "todos") for t in TIPOS_SUCIEDAD}
+                rng = np.random.default_rng(SEMILLA)
+                yield (f"{cat} {porcentaje}% {tipo}",
+                       medir(lambda: aplicar_datos_sucios(df, porcentaje, rng=rng, **flags), len(df), memoria))
+
+
+def bench_exportar(categorias, filas, formatos, memoria):
+    dataframes = generar_dataframes(_spec(categorias, filas))
+    total = filas * len(dataframes)
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in formatos:
+            ruta = Path(tmp) / fmt / f"dataset{EXTENSIONES[fmt]}"
+            ruta.parent.mkdir()
+            try:
+                r = medir(lambda: exportar(dataframes, fmt, ruta), total, memoria)
+            except (ImportError, ValueError) as e:
+                # dependencia opcional ausente (pyarrow, xlsxwriter)
+                yield fmt, {"omitido": str(e)}
+                continue
+            r["bytes"] = sum(p.stat().st_size for p in ruta.parent.rglob("*") if p.is_file())
+            yield fmt, r
+
+
+# ===========================
+# Comparación con una corrida anterior
+# ===========================
+
+def comparar(resultados: list, anterior: dict):
+    previos = {(r["grupo"], r["caso"], r.get("filas")): r for r in anterior.get("resultados", [])}
+    print(f"\nComparación con {anterior.get('fecha', '?')} (x > 1 = más lento ahora)")
+    for r in resultados:
+        p = previos.get((r["grupo"], r["caso"], r.get("filas")))
+        if not p or "segundos" not in r or not p.get("segundos"):
+            continue
+        ratio = r["segundos"] / p["segundos"]
+        marca = "  <-- regresión" if ratio > 1.2 else ""
+        print(f"{r['grupo']:<11} {r['caso']:<28} {r['filas']:>10} {ratio:>7.2f}x{marca}")
+
+
+def _lista(texto: str) -> list:
+    return [x.strip() for x in texto.split(",") if x.strip()]
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("-o", "--salida", default="benchmark.json", help="archivo JSON de resultados")
+    p.add_argument("-g", "--grupos", default=",".join(GRUPOS), help="grupos a medir, separados por comas")
+    p.add_argument("-c", "--categorias", help="categorías (por defecto todas para generación; Ventas,Clientes para el resto)")
+    p.add_argument("-n", "--tamanos", default="10000,1000000,10000000",
+                   help="filas por categoría para generación, separadas por comas")
+    p.add_argument("--filas-sucios", type=int, default=1_000_000)
+    p.add_argument("--filas-exportar", type=int, default=100_000)
+    p.add_argument("-f", "--formatos", default=",".join(FORMATOS))
+    p.add_argument("--sin-memoria", action="store_true",
+                   help="no medir memoria (se ahorra la segunda ejecución de cada caso)")
+    p.add_argument("--comparar", help="JSON de una corrida anterior para detectar regresiones")
+    args = p.parse_args(argv)
+
+    grupos = _lista(args.grupos)
+    desconocidos = [g for g in grupos if g not in GRUPOS]
+    if desconocidos:
+        p.error(f"grupos desconocidos: {', '.join(desconocidos)}")
+    memoria = not args.sin_memoria
+    categorias = _lista(args.categorias) if args.categorias else None
+
+    casos = []
+    if "generacion" in grupos:
+        tamanos = [int(x) for x in _lista(args.tamanos)]
+        casos.append(("generacion", bench_generacion(categorias or list(config), tamanos, memoria)))
+    if "sucios" in grupos:
+        casos.append(("sucios", bench_sucios(categorias or ["Ventas", "Clientes"], args.filas_sucios, memoria)))
+    if "exportar" in grupos:
+        casos.append(("exportar", bench_exportar(categorias or ["Ventas", "Clientes"], args.filas_exportar,
+                                                 _lista(args.formatos), memoria)))
+
+    print(f"{'grupo':<11} {'caso':<28} {'filas':>10} {'seg':>9} {'filas/s':>12} {'MiB pico':>9}")
+    resultados = []
+    for grupo, gen in casos:
+        for caso, r in gen:
+            _imprimir(grupo, caso, r)
+            resultados.append({"grupo": grupo, "caso": caso, **r})
+
+    informe = {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "plataforma": platform.platform(),
+        "versiones": _versiones(),
+        "memoria_medida": memoria,
+        "resultados": resultados,
+    }
+    Path(args.salida).write_text(json.dumps(informe, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"\nResultados: {args.salida}")
+
+    if args.comparar:
+        comparar(resultados, json.loads(Path(args.comparar).read_text(encoding="utf-8")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+"""Generador de datos sintéticos: motor reutilizable sin dependencias de GUI."""
+
+from .dominio import IDIOMAS, opciones, config, asegurar_lista_unica
+from .sucios import aplicar_datos_sucios
+from .categorias import cargar_categorias, registrar_categoria
+from .motor import (
+    OpcionesSucias,
+    EspecCategoria,
+    Especificacion,
+    cargar_especificacion,
+    construir_choices,
+    generar_categoria,
+    generar_dataframes,
+    generar_muestra,
+)
+from .exportar import FORMATOS, exportar
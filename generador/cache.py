@@ -0,0 +1,336 @@
+"""Caché en disco de datasets generados, direccionada por contenido.
+
+Una corrida con semilla fija es determinista: la misma especificación
+produce siempre las mismas filas. La clave de la caché es un hash de todo
+lo que influye en los datos (categorías, columnas, cantidades, catálogos,
+idioma, datos sucios, semilla, fecha de referencia, relaciones, tamaño de
+bloque y de pool), de las versiones de Faker, numpy, pandas y pyarrow y del
+código del propio generador. El formato y la ruta de salida no forman parte
+de la clave: una corrida repetida en otro formato reutiliza la entrada y
+solo vuelve a codificar.
+
+Cada entrada es una carpeta con un Parquet por bloque generado (los
+bloques se sirven tal cual, así que la salida es la misma que la de una
+corrida nueva) y un ``meta.json``. Las columnas con tipos mezclados (los
+"???" de los tipos erróneos entre números) se separan en columnas de
+texto, enteros y decimales más el tipo de cada fila, y se rearman al leer.
+El tamaño total se limita borrando las entradas usadas hace más tiempo,
+como la caché de pools.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import uuid
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from faker import VERSION as FAKER_VERSION
+
+from .categorias import definiciones_usuario
+from .instrumentacion import etapa
+from .pools import directorio_cache
+
+VERSION = 1
+CACHE_DATASETS_MAX_BYTES = 2 * 1024 ** 3
+META = "meta.json"
+# Metadato Arrow con las columnas de tipos mezclados de un bloque
+CLAVE_MIXTAS = b"generador.mixtas"
+# Tipo de cada valor de una columna mezclada
+NULO, TEXTO, ENTERO, DECIMAL = range(4)
+SUFIJOS_MIXTA = {TEXTO: "\x1ftexto", ENTERO: "\x1fentero", DECIMAL: "\x1fdecimal"}
+
+
+def directorio_datasets() -> Path:
+    return directorio_cache().parent / "datasets"
+
+
+def max_bytes_datasets() -> int:
+    """Tope de la caché: ``GENERADOR_CACHE_DATASETS_MB`` o CACHE_DATASETS_MAX_BYTES."""
+    mb = os.environ.get("GENERADOR_CACHE_DATASETS_MB")
+    try:
+        return int(mb) * 1024 ** 2 if mb else CACHE_DATASETS_MAX_BYTES
+    except ValueError:
+        raise ValueError("GENERADOR_CACHE_DATASETS_MB debe ser un número entero de MiB.")
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError("Para usar la caché de datasets instala pyarrow (pip install pyarrow).")
+    return pa, pq
+
+
+# ===========================
+# Clave
+# ===========================
+
+_huella = None
+
+
+def _huella_codigo() -> str:
+    """Hash de los módulos del generador: un cambio de código invalida la caché."""
+    global _huella
+    if _huella is None:
+        h = hashlib.sha256()
+        for p in sorted(Path(__file__).parent.glob("*.py")):
+            h.update(p.name.encode())
+            h.update(p.read_bytes())
+        _huella = h.hexdigest()
+    return _huella
+
+
+def clave_corrida(spec, tamano_bloque: int) -> str:
+    """Clave de los datos que generaría ``spec`` en bloques de ``tamano_bloque`` filas.
+
+    ``spec`` debe tener la semilla y la fecha de referencia resueltas.
+    """
+    pa, _ = _pyarrow()
+    nombres = [ec.nombre for ec in spec.categorias]
+    usuario = definiciones_usuario()
+    datos = {
+        "version": VERSION,
+        "codigo": _huella_codigo(),
+        "librerias": {"faker": FAKER_VERSION, "numpy": np.__version__,
+                      "pandas": pd.__version__, "pyarrow": pa.__version__},
+        # el orden importa: el índice de cada categoría entra en sus semillas
+        "categorias": [{"nombre": ec.nombre, "columnas": ec.columnas, "requires": ec.requires,
+                        "cantidad": spec.cantidad_de(ec), "unicas": spec.unicas_de(ec)}
+                       for ec in spec.categorias],
+        "definiciones": {c: usuario[c] for c in nombres if c in usuario},
+        "idioma": spec.idioma,
+        "sucios": asdict(spec.sucios),
+        "tamano_pool": spec.tamano_pool,
+        "tamano_bloque": tamano_bloque,
+        "semilla": spec.semilla,
+        "fecha_referencia": spec.fecha_referencia,
+        "relacional": spec.relacional,
+        "relaciones": spec.relaciones,
+    }
+    texto = json.dumps(datos, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(texto.encode("utf-8")).hexdigest()
+
+
+# ===========================
+# Codificación de bloques
+# ===========================
+
+def _tipo(v) -> int:
+    if v is None:
+        return NULO
+    if isinstance(v, str):
+        return TEXTO
+    return ENTERO if isinstance(v, (int, np.integer)) else DECIMAL
+
+
+def _separar(c: str, valores: np.ndarray) -> dict:
+    """Columna mezclada -> {nombre: arreglo} con el tipo de cada fila y sus valores."""
+    tipos = np.fromiter(map(_tipo, valores), np.int8, len(valores))
+    columnas = {c: tipos}
+    for tipo, dtype in ((TEXTO, object), (ENTERO, np.int64), (DECIMAL, np.float64)):
+        m = tipos == tipo
+        arr = np.full(len(valores), None if dtype is object else 0, dtype=dtype)
+        arr[m] = valores[m]
+        columnas[c + SUFIJOS_MIXTA[tipo]] = arr
+    return columnas
+
+
+def _unir(df: pd.DataFrame, c: str) -> np.ndarray:
+    tipos = df.pop(c).to_numpy()
+    salida = np.full(len(tipos), None, dtype=object)
+    for tipo, sufijo in SUFIJOS_MIXTA.items():
+        valores = df.pop(c + sufijo).to_numpy()
+        m = tipos == tipo
+        salida[m] = valores[m]  # int64/float64 -> int/float de Python, como en el original
+    return salida
+
+
+def tabla_bloque(df: pd.DataFrame):
+    """Tabla Arrow de un bloque; las columnas mezcladas van separadas por tipo."""
+    pa, _ = _pyarrow()
+    mixtas = [c for c in df.columns
+              if df[c].dtype == object and pd.api.types.infer_dtype(df[c], skipna=True) not in ("string", "empty")]
+    if mixtas:
+        datos = {}
+        for c in df.columns:
+            datos.update(_separar(c, df[c].to_numpy()) if c in mixtas else {c: df[c]})
+        df = pd.DataFrame(datos)
+    tabla = pa.Table.from_pandas(df, preserve_index=False)
+    return tabla.replace_schema_metadata({**tabla.schema.metadata,
+                                          CLAVE_MIXTAS: json.dumps(mixtas).encode()})
+
+
+def df_bloque(tabla) -> pd.DataFrame:
+    df = tabla.to_pandas()
+    # Parquet no tiene segundos: las fechas vuelven en ms y se regresan a su unidad
+    for col in (tabla.schema.pandas_metadata or {}).get("columns", []):
+        nombre, tipo = col["name"], col["numpy_type"]
+        if tipo.startswith("datetime64[") and nombre in df and df[nombre].dtype != tipo:
+            df[nombre] = df[nombre].astype(tipo)
+    mixtas = json.loads((tabla.schema.metadata or {}).get(CLAVE_MIXTAS, b"[]"))
+    if not mixtas:
+        return df
+    columnas = [c for c in df.columns if "\x1f" not in c]
+    datos = {c: _unir(df, c) if c in mixtas else df[c] for c in columnas}
+    return pd.DataFrame(datos, columns=columnas)
+
+
+# ===========================
+# Entradas
+# ===========================
+
+def _leer_meta(entrada: Path):
+    try:
+        with open(entrada / META, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    return meta if meta.get("version") == VERSION else None
+
+
+def buscar(clave: str, directorio=None):
+    """La carpeta de la entrada ``clave`` o None; marca la entrada como usada."""
+    entrada = Path(directorio or directorio_datasets()) / clave
+    if _leer_meta(entrada) is None:
+        return None
+    os.utime(entrada / META)
+    return entrada
+
+
+def leer_bloques(entrada: Path, medidor=None):
+    """``(categoria, df)`` en el orden y con los bloques de la corrida guardada."""
+    _, pq = _pyarrow()
+    meta = _leer_meta(entrada)
+    if meta is None:
+        raise ValueError(f"La entrada de caché {entrada.name} ya no existe.")
+    for i_cat, (categoria, datos) in enumerate(meta["categorias"].items()):
+        for i_bloque in range(datos["bloques"]):
+            tabla = pq.read_table(entrada / f"{i_cat:03d}-{i_bloque:05d}.parquet")
+            with etapa(medidor, "cache", categoria, tabla.num_rows):
+                df = df_bloque(tabla)
+            yield categoria, df
+
+
+class GuardadoCache:
+    """Copia en la caché los bloques de una corrida mientras se exportan.
+
+    Se escribe en una carpeta temporal que ``confirmar`` renombra a la
+    entrada definitiva; ``descartar`` (p. ej. al cancelar) la borra.
+    """
+
+    def __init__(self, clave: str, spec, directorio=None, max_bytes: int = None):
+        self.clave = clave
+        self.directorio = Path(directorio or directorio_datasets())
+        self.max_bytes = max_bytes_datasets() if max_bytes is None else max_bytes
+        self.temporal = self.directorio / f".{clave}.{uuid.uuid4().hex[:8]}.tmp"
+        self.resumen = {
+            "idioma": spec.idioma,
+            "semilla": spec.semilla,
+            "fecha_referencia": spec.fecha_referencia,
+            "sucios": spec.sucios.porcentaje if spec.sucios.activas() else 0,
+            "relacional": spec.relacional,
+        }
+        self.categorias = {}
+        self._cerrada = False
+
+    def registrar(self, bloques, medidor=None):
+        """Deja pasar ``bloques`` guardando una copia de cada uno."""
+        _, pq = _pyarrow()
+        self.temporal.mkdir(parents=True, exist_ok=True)
+        try:
+            for categoria, df in bloques:
+                datos = self.categorias.setdefault(categoria, {"filas": 0, "bloques": 0,
+                                                               "columnas": list(df.columns)})
+                with etapa(medidor, "cache", categoria, len(df)):
+                    nombre = f"{len(self.categorias) - 1:03d}-{datos['bloques']:05d}.parquet"
+                    pq.write_table(tabla_bloque(df), self.temporal / nombre)
+                datos["filas"] += len(df)
+                datos["bloques"] += 1
+                yield categoria, df
+        finally:
+            bloques.close()
+
+    def confirmar(self):
+        """Publica la entrada (si otra corrida ya la publicó, se conserva aquella)."""
+        if self._cerrada:
+            return
+        self._cerrada = True
+        tamano = sum(p.stat().st_size for p in self.temporal.iterdir())
+        meta = {
+            "version": VERSION,
+            "clave": self.clave,
+            "creado": datetime.now().isoformat(timespec="seconds"),
+            "bytes": tamano,
+            **self.resumen,
+            "categorias": self.categorias,
+        }
+        with open(self.temporal / META, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        try:
+            os.replace(self.temporal, self.directorio / self.clave)
+        except OSError:
+            shutil.rmtree(self.temporal, ignore_errors=True)
+        podar(self.max_bytes, self.directorio)
+
+    def descartar(self):
+        if not self._cerrada:
+            self._cerrada = True
+            shutil.rmtree(self.temporal, ignore_errors=True)
+
+
+def entradas(directorio=None) -> list:
+    """Metadatos de las entradas, de la usada más recientemente a la más antigua.
+
+    Cada una trae además ``usado`` (fecha del último uso).
+    """
+    directorio = Path(directorio or directorio_datasets())
+    if not directorio.is_dir():
+        return []
+    resultado = []
+    for entrada in directorio.iterdir():
+        if entrada.name.startswith(".") or not entrada.is_dir():
+            continue
+        meta = _leer_meta(entrada)
+        if meta is None:
+            continue
+        usado = (entrada / META).stat().st_mtime
+        meta["usado"] = datetime.fromtimestamp(usado).isoformat(timespec="seconds")
+        meta["_mtime"] = usado
+        resultado.append(meta)
+    resultado.sort(key=lambda m: m.pop("_mtime"), reverse=True)
+    return resultado
+
+
+def podar(max_bytes: int = None, directorio=None):
+    """Borra las entradas usadas hace más tiempo hasta quedar bajo ``max_bytes``."""
+    max_bytes = max_bytes_datasets() if max_bytes is None else max_bytes
+    directorio = Path(directorio or directorio_datasets())
+    lista = entradas(directorio)
+    total = sum(m["bytes"] for m in lista)
+    for meta in reversed(lista):
+        if total <= max_bytes:
+            break
+        total -= meta["bytes"]
+        shutil.rmtree(directorio / meta["clave"], ignore_errors=True)
+
+
+def purgar(claves=None, directorio=None) -> int:
+    """Borra las entradas ``claves`` (todas si es None); devuelve los bytes liberados."""
+    directorio = Path(directorio or directorio_datasets())
+    if not directorio.is_dir():
+        return 0
+    liberados = 0
+    for entrada in list(directorio.iterdir()):
+        # las carpetas temporales son de corridas en curso
+        if entrada.name.startswith(".") or not entrada.is_dir() \
+                or (claves is not None and entrada.name not in claves):
+            continue
+        liberados += sum(p.stat().st_size for p in entrada.iterdir() if p.is_file())
+        shutil.rmtree(entrada, ignore_errors=True)
+    return liberados
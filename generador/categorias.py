@@ -0,0 +1,357 @@
+"""Categorías definidas por el usuario en archivos JSON/YAML.
+
+Cada archivo declara una categoría (o una lista de ellas) sin escribir
+código::
+
+    nombre: Pedidos
+    catalogos:                    # opcional; se agregan a ``opciones``
+      Canales: [Web, Tienda, Teléfono]
+    clave: ID_pedido              # opcional; ver relaciones.py
+    referencias:                  # opcional: {columna: categoría padre o {categoria, sesgo, cobertura}}
+      ID_cliente: {categoria: Clientes, sesgo: 1.1}
+    columnas:
+      Fecha:    {tipo: fecha, dias: 90}
+      Canal:    {tipo: opcion, catalogo: Canales, pesos: [6, 3, 1]}
+      Producto: {tipo: opcion, catalogo: Productos}
+      Estado:   {tipo: opcion, valores: [Abierto, Cerrado]}
+      Unidades: {tipo: entero, min: 1, max: 20}
+      Monto:    {tipo: decimal, distribucion: normal, media: 120, desviacion: 40, min: 0}
+      Cliente:  {tipo: faker, proveedor: name}
+      Correo:   {tipo: faker, proveedor: email, unico: true}
+
+La definición se valida una sola vez y se compila a generadores por columna
+("column_generators") iguales a los de las categorías incluidas, así que no
+hay generación fila a fila. Las columnas con ``catalogo`` quedan como
+'requires' de la categoría (subconjunto configurable, como las demás), y
+las de tipo faker con ``unico: true`` se generan sin valores repetidos.
+"""
+
+import json
+import os
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+
+from .dominio import config, opciones, categorica, elegir, enteros, fecha_referencia, faker_columna
+from .relaciones import validar_relacion
+
+TIPOS_COLUMNA = ["entero", "decimal", "fecha", "opcion", "faker"]
+DISTRIBUCIONES = ["uniforme", "normal", "lognormal", "exponencial"]
+EXTENSIONES_ESQUEMA = {".json", ".yaml", ".yml"}
+INT32_MAX = 2**31 - 1
+
+# Definiciones (tal como se leyeron) de las categorías registradas por el
+# usuario; se reenvían a los procesos de generación para recompilarlas allí.
+_definiciones = {}
+_faker_validacion = None
+
+
+def leer_json_o_yaml(ruta):
+    """Contenido de un archivo JSON o YAML (según la extensión)."""
+    ruta = Path(ruta)
+    with open(ruta, encoding="utf-8") as f:
+        if ruta.suffix.lower() in (".yaml", ".yml"):
+            try:
+                import yaml
+            except ImportError:
+                raise ValueError("Para leer YAML instala PyYAML (pip install pyyaml).")
+            return yaml.safe_load(f)
+        return json.load(f)
+
+
+# ===========================
+# Validación
+# ===========================
+
+def _numero(d: dict, clave: str, donde: str, defecto=None):
+    valor = d.get(clave, defecto)
+    if valor is None:
+        return None
+    if isinstance(valor, bool) or not isinstance(valor, (int, float)):
+        raise ValueError(f"{donde}: '{clave}' debe ser un número.")
+    return valor
+
+
+def _fecha(d: dict, clave: str, donde: str):
+    valor = d.get(clave)
+    if valor is None:
+        return None
+    try:
+        return date.fromisoformat(str(valor))
+    except ValueError:
+        raise ValueError(f"{donde}: '{clave}' debe tener formato AAAA-MM-DD.")
+
+
+def _proveedor_texto(proveedor: str, donde: str):
+    """El proveedor debe existir y devolver texto (los pools son de cadenas)."""
+    global _faker_validacion
+    if _faker_validacion is None:
+        from faker import Faker
+        _faker_validacion = Faker()
+    metodo = getattr(_faker_validacion, proveedor, None) if isinstance(proveedor, str) else None
+    if not callable(metodo) or proveedor.startswith("_"):
+        raise ValueError(f"{donde}: proveedor de Faker desconocido: {proveedor}")
+    if not isinstance(metodo(), str):
+        raise ValueError(f"{donde}: el proveedor {proveedor} no devuelve texto; "
+                         f"usa los tipos entero, decimal o fecha.")
+
+
+def _pesos(d: dict, n_valores: int, donde: str):
+    pesos = d.get("pesos")
+    if pesos is None:
+        return None
+    if (not isinstance(pesos, list) or len(pesos) != n_valores
+            or not all(isinstance(p, (int, float)) and p >= 0 for p in pesos) or sum(pesos) <= 0):
+        raise ValueError(f"{donde}: 'pesos' debe ser una lista de {n_valores} números no negativos.")
+    return np.asarray(pesos, dtype=float)
+
+
+# ===========================
+# Compilación a generadores por columna
+# ===========================
+
+def _muestras(rng, d: dict, n: int) -> np.ndarray:
+    """n valores float de la distribución declarada, recortados a [min, max]."""
+    dist = d.get("distribucion", "uniforme")
+    if dist == "uniforme":
+        valores = rng.uniform(d["min"], d["max"], n)
+    elif dist == "normal":
+        valores = rng.normal(d["media"], d["desviacion"], n)
+    elif dist == "lognormal":
+        valores = rng.lognormal(d["mu"], d["sigma"], n)
+    else:
+        valores = rng.exponential(d["media"], n)
+    if d.get("min") is not None or d.get("max") is not None:
+        valores = np.clip(valores, d.get("min"), d.get("max"))
+    return valores
+
+
+def _validar_distribucion(d: dict, donde: str):
+    dist = d.get("distribucion", "uniforme")
+    if dist not in DISTRIBUCIONES:
+        raise ValueError(f"{donde}: distribución desconocida: {dist} (usa {', '.join(DISTRIBUCIONES)}).")
+    requeridos = {"uniforme": ["min", "max"], "normal": ["media", "desviacion"],
+                  "lognormal": ["mu", "sigma"], "exponencial": ["media"]}[dist]
+    for clave in requeridos:
+        if _numero(d, clave, donde) is None:
+            raise ValueError(f"{donde}: la distribución {dist} requiere '{clave}'.")
+    minimo, maximo = _numero(d, "min", donde), _numero(d, "max", donde)
+    if minimo is not None and maximo is not None and minimo > maximo:
+        raise ValueError(f"{donde}: 'min' no puede ser mayor que 'max'.")
+    for clave in ("desviacion", "sigma", "media" if dist == "exponencial" else None):
+        if clave and d.get(clave) is not None and d[clave] <= 0:
+            raise ValueError(f"{donde}: '{clave}' debe ser positivo.")
+
+
+def _columna_entero(d, donde):
+    _validar_distribucion(d, donde)
+    if d.get("distribucion", "uniforme") == "uniforme":
+        minimo, maximo = int(d["min"]), int(d["max"])
+        gen = lambda fake, rng, choices, n: enteros(rng, minimo, maximo, n)
+    else:
+        gen = lambda fake, rng, choices, n: np.rint(_muestras(rng, d, n)).astype(np.int64)
+    limite = max(abs(d.get("min") or 0), abs(d.get("max") or 0))
+    abierto = d.get("distribucion", "uniforme") != "uniforme" and d.get("max") is None
+    return gen, "int64" if abierto or limite > INT32_MAX // 50 else "int32"
+
+
+def _columna_decimal(d, donde):
+    _validar_distribucion(d, donde)
+    decimales = int(_numero(d, "decimales", donde, 2))
+    return (lambda fake, rng, choices, n: np.round(_muestras(rng, d, n), decimales)), "float64"
+
+
+def _columna_fecha(d, donde):
+    desde, hasta = _fecha(d, "desde", donde), _fecha(d, "hasta", donde)
+    if desde is not None or hasta is not None:
+        if desde is None or hasta is None or desde > hasta:
+            raise ValueError(f"{donde}: indica 'desde' y 'hasta' (desde <= hasta).")
+        inicio, dias = np.datetime64(desde, "D"), (hasta - desde).days
+        return (lambda fake, rng, choices, n:
+                inicio + rng.integers(0, dias, n, endpoint=True).astype("timedelta64[D]")), "date"
+    dias = _numero(d, "dias", donde, 30)
+    if dias < 0:
+        raise ValueError(f"{donde}: 'dias' no puede ser negativo.")
+    dias = int(dias)
+
+    def gen(fake, rng, choices, n):
+        # como fechas_recientes: la fecha de referencia se lee en cada corrida
+        hoy = np.datetime64(fecha_referencia(), "D")
+        return hoy - rng.integers(0, dias, n, endpoint=True).astype("timedelta64[D]")
+    return gen, "date"
+
+
+def _columna_opcion(d, donde, catalogos):
+    catalogo, valores = d.get("catalogo"), d.get("valores")
+    if (catalogo is None) == (valores is None):
+        raise ValueError(f"{donde}: indica 'catalogo' o 'valores' (uno de los dos).")
+    if valores is not None:
+        if not isinstance(valores, list) or not valores:
+            raise ValueError(f"{donde}: 'valores' debe ser una lista no vacía.")
+        valores = [str(v) for v in valores]
+        pesos = _pesos(d, len(valores), donde)
+        if pesos is None:
+            return (lambda fake, rng, choices, n: elegir(rng, valores, n)), None
+        p = pesos / pesos.sum()
+        return (lambda fake, rng, choices, n: categorica(valores, rng.choice(len(valores), n, p=p))), None
+
+    if catalogo not in catalogos and catalogo not in opciones:
+        raise ValueError(f"{donde}: catálogo desconocido: {catalogo}")
+    total = len(catalogos.get(catalogo) or opciones[catalogo])
+    pesos = _pesos(d, total, donde)
+
+    def gen(fake, rng, choices, n):
+        valores = choices[catalogo]
+        if pesos is None:
+            return elegir(rng, valores, n)
+        # los pesos siguen al catálogo completo; el subconjunto usa sus primeros
+        p = pesos[:len(valores)]
+        p = p / p.sum() if p.sum() > 0 else None
+        return categorica(valores, rng.choice(len(valores), n, p=p))
+    return gen, catalogo
+
+
+def _columna_faker(d, donde):
+    proveedor = d.get("proveedor")
+    _proveedor_texto(proveedor, donde)
+    return lambda fake, rng, choices, n: faker_columna(fake, proveedor, rng, n)
+
+
+def compilar_categoria(definicion: dict):
+    """Valida la definición y devuelve ``(nombre, entrada de config, catálogos)``."""
+    if not isinstance(definicion, dict):
+        raise ValueError("Cada categoría debe ser un objeto con 'nombre' y 'columnas'.")
+    nombre = definicion.get("nombre")
+    if not nombre or not isinstance(nombre, str):
+        raise ValueError("La categoría necesita un 'nombre'.")
+    columnas = definicion.get("columnas")
+    if not isinstance(columnas, dict) or not columnas:
+        raise ValueError(f"Categoría {nombre}: 'columnas' debe ser un objeto no vacío.")
+
+    catalogos = definicion.get("catalogos") or {}
+    for clave, valores in catalogos.items():
+        if not isinstance(valores, list) or not valores:
+            raise ValueError(f"Categoría {nombre}: el catálogo {clave} debe ser una lista no vacía.")
+        if clave in opciones and clave not in _catalogos_usuario() and opciones[clave] != valores:
+            raise ValueError(f"Categoría {nombre}: el catálogo {clave} ya existe con otros valores.")
+    catalogos = {k: [str(v) for v in vs] for k, vs in catalogos.items()}
+
+    gens, schema, requires, proveedores, unicas = {}, {}, [], {}, []
+    for col, d in columnas.items():
+        donde = f"Categoría {nombre}, columna {col}"
+        if not isinstance(d, dict):
+            raise ValueError(f"{donde}: la definición debe ser un objeto con 'tipo'.")
+        tipo = d.get("tipo")
+        if d.get("unico") and tipo != "faker":
+            raise ValueError(f"{donde}: solo las columnas de tipo faker pueden ser únicas.")
+        if tipo == "entero":
+            gens[col], schema[col] = _columna_entero(d, donde)
+        elif tipo == "decimal":
+            gens[col], schema[col] = _columna_decimal(d, donde)
+        elif tipo == "fecha":
+            gens[col], schema[col] = _columna_fecha(d, donde)
+        elif tipo == "opcion":
+            gens[col], catalogo = _columna_opcion(d, donde, catalogos)
+            schema[col] = "category"
+            if catalogo is not None and catalogo not in requires:
+                requires.append(catalogo)
+        elif tipo == "faker":
+            gens[col], schema[col] = _columna_faker(d, donde), "string"
+            proveedores[col] = d["proveedor"]
+            if not isinstance(d.get("unico", False), bool):
+                raise ValueError(f"{donde}: 'unico' debe ser true o false.")
+            if d.get("unico"):
+                unicas.append(col)
+        else:
+            raise ValueError(f"{donde}: tipo desconocido: {tipo} (usa {', '.join(TIPOS_COLUMNA)}).")
+
+    entrada = {
+        "columns": list(columnas),
+        "requires": requires,
+        "schema": schema,
+        "column_generators": gens,
+        "faker": proveedores,
+        "unicas": unicas,
+    }
+    entrada.update(_compilar_claves(nombre, definicion, columnas))
+    return nombre, entrada, catalogos
+
+
+def _compilar_claves(nombre: str, definicion: dict, columnas: dict) -> dict:
+    claves = {}
+    clave = definicion.get("clave")
+    if clave is not None:
+        if not isinstance(clave, str) or clave in columnas:
+            raise ValueError(f"Categoría {nombre}: 'clave' debe ser un nombre de columna nuevo.")
+        claves["clave"] = clave
+    referencias = definicion.get("referencias")
+    if referencias is not None:
+        if not isinstance(referencias, dict):
+            raise ValueError(f"Categoría {nombre}: 'referencias' debe ser un objeto {{columna: categoría}}.")
+        for col, ref in referencias.items():
+            donde = f"Categoría {nombre}, referencia {col}"
+            if col in columnas or col == clave:
+                raise ValueError(f"{donde}: la columna ya existe en la categoría.")
+            if isinstance(ref, dict):
+                validar_relacion(donde, ref)
+                ref = ref.get("categoria")
+            if not isinstance(ref, str) or not ref:
+                raise ValueError(f"{donde}: indica la categoría padre.")
+        claves["referencias"] = dict(referencias)
+    return claves
+
+
+def _catalogos_usuario() -> set:
+    return {k for d in _definiciones.values() for k in (d.get("catalogos") or {})}
+
+
+# ===========================
+# Registro
+# ===========================
+
+def registrar_categoria(definicion: dict) -> str:
+    """Compila la definición y la agrega a ``config`` (y sus catálogos a ``opciones``)."""
+    nombre, entrada, catalogos = compilar_categoria(definicion)
+    if nombre in config and nombre not in _definiciones:
+        raise ValueError(f"La categoría {nombre} ya existe y no se puede redefinir.")
+    opciones.update(catalogos)
+    config[nombre] = entrada
+    _definiciones[nombre] = definicion
+    return nombre
+
+
+def definiciones_usuario() -> dict:
+    """{nombre: definición} de las categorías registradas (para otros procesos)."""
+    return dict(_definiciones)
+
+
+def _archivos(ruta: Path):
+    if ruta.is_dir():
+        return sorted(p for p in ruta.iterdir() if p.suffix.lower() in EXTENSIONES_ESQUEMA)
+    return [ruta]
+
+
+def cargar_categorias(*rutas) -> list:
+    """Registra las categorías de los archivos (o carpetas) dados; devuelve sus nombres."""
+    nombres = []
+    for ruta in rutas:
+        for archivo in _archivos(Path(ruta)):
+            try:
+                datos = leer_json_o_yaml(archivo)
+            except (OSError, json.JSONDecodeError) as e:
+                raise ValueError(f"No se pudo leer {archivo}: {e}")
+            if isinstance(datos, dict) and "categorias" in datos:
+                datos = datos["categorias"]
+            for definicion in datos if isinstance(datos, list) else [datos]:
+                try:
+                    nombres.append(registrar_categoria(definicion))
+                except ValueError as e:
+                    raise ValueError(f"{archivo}: {e}")
+    return nombres
+
+
+def cargar_categorias_entorno() -> list:
+    """Carga las rutas de ``$GENERADOR_CATEGORIAS`` (separadas por ``os.pathsep``)."""
+    rutas = [r for r in os.environ.get("GENERADOR_CATEGORIAS", "").split(os.pathsep) if r]
+    return cargar_categorias(*rutas)
@@ -0,0 +1,149 @@
+"""Línea de comandos sin interfaz gráfica: ``python -m generador spec.json``."""
+
+import argparse
+import json
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+from .cache import entradas, purgar
+from .categorias import cargar_categorias, cargar_categorias_entorno
+from .corrida import categorias_activas, ejecutar_corrida
+from .exportar import FORMATOS, EXTENSIONES
+from .instrumentacion import Medidor
+from .motor import cargar_especificacion
+
+
+def construir_parser():
+    p = argparse.ArgumentParser(
+        prog="python -m generador",
+        description="Genera datasets sintéticos a partir de una especificación JSON/YAML.",
+    )
+    p.add_argument("spec", nargs="?", help="archivo de especificación (.json, .yaml o .yml)")
+    p.add_argument("-e", "--esquemas", action="append", default=[], metavar="RUTA",
+                   help="archivo o carpeta con categorías definidas por el usuario (repetible)")
+    p.add_argument("-o", "--salida", help="ruta de salida (sobrescribe 'salida' del spec)")
+    p.add_argument("-f", "--formato", choices=FORMATOS, help="formato de exportación")
+    p.add_argument("-c", "--compresion",
+                   help="compresión de Parquet/Feather (snappy, zstd, gzip, lz4, ninguna) "
+                        "o de CSV/JSON/JSONL (gzip, zstd, ninguna)")
+    p.add_argument("--nivel-compresion", type=int, help="nivel de gzip/zstd para CSV/JSON/JSONL")
+    p.add_argument("--filas-por-parte", type=int,
+                   help="CSV/JSONL: carpeta por categoría con archivos part-NNNNN de este número de filas")
+    p.add_argument("--hilos-escritura", type=int,
+                   help="CSV/JSONL: 1 (por defecto) escribe en segundo plano, 0 en el hilo principal")
+    p.add_argument("--json-legible", action="store_true",
+                   help="JSON con sangría (por defecto compacto)")
+    p.add_argument("--indices", help="columnas a indexar en SQL, separadas por comas (p. ej. Fecha,Producto)")
+    p.add_argument("-n", "--cantidad", type=int, help="número de registros por categoría")
+    p.add_argument("-b", "--tamano-bloque", type=int,
+                   help="generar y escribir en bloques de este tamaño (cualquier formato)")
+    p.add_argument("-s", "--semilla", type=int, help="semilla maestra (misma semilla, misma salida)")
+    p.add_argument("-p", "--procesos", type=int, help="procesos de generación en paralelo")
+    p.add_argument("-r", "--relacional", action="store_true",
+                   help="agregar claves primarias y foráneas entre las categorías")
+    p.add_argument("-a", "--anexar", action="store_true",
+                   help="agregar las filas a la salida existente (CSV, JSONL, SQL o Parquet como dataset), "
+                        "continuando semilla y claves desde su manifiesto")
+    p.add_argument("--cache", action="store_true",
+                   help="reutilizar el dataset si ya se generó con la misma especificación y semilla "
+                        "(y guardarlo si no); requiere pyarrow")
+    p.add_argument("--cache-listar", action="store_true", help="listar la caché de datasets y salir")
+    p.add_argument("--cache-vaciar", action="store_true", help="vaciar la caché de datasets y salir")
+    p.add_argument("--informe", nargs="?", const="-", metavar="RUTA",
+                   help="medir cada etapa y escribir el informe JSON en RUTA (o en stdout sin RUTA)")
+    p.add_argument("--sin-memoria", action="store_true",
+                   help="con --informe, medir solo tiempos (tracemalloc encarece la corrida)")
+    return p
+
+
+def listar_cache():
+    lista = entradas()
+    for meta in lista:
+        filas = ", ".join(f"{c} {d['filas']}" for c, d in meta["categorias"].items())
+        print(f"{meta['clave'][:12]}  {meta['bytes'] / 2**20:8.1f} MiB  usado {meta['usado']}  "
+              f"semilla {meta['semilla']} ({meta['fecha_referencia']}, {meta['idioma']})  {filas}")
+    print(f"{len(lista)} entradas, {sum(m['bytes'] for m in lista) / 2**20:.1f} MiB")
+
+
+def main(argv=None):
+    parser = construir_parser()
+    args = parser.parse_args(argv)
+    if args.cache_listar or args.cache_vaciar:
+        if args.cache_vaciar:
+            print(f"Caché vaciada: {purgar() / 2**20:.1f} MiB liberados")
+        else:
+            listar_cache()
+        return 0
+    if args.spec is None:
+        parser.error("falta el archivo de especificación")
+    try:
+        cargar_categorias_entorno()
+        cargar_categorias(*args.esquemas)
+        spec = cargar_especificacion(args.spec)
+        if args.formato:
+            spec.formato = args.formato
+        if args.cantidad is not None:
+            spec.cantidad = args.cantidad
+        if args.salida:
+            spec.salida = args.salida
+        if args.compresion:
+            spec.opciones_formato["compresion"] = args.compresion
+        if args.nivel_compresion is not None:
+            spec.opciones_formato["nivel_compresion"] = args.nivel_compresion
+        if args.filas_por_parte is not None:
+            spec.opciones_formato["filas_por_parte"] = args.filas_por_parte
+        if args.hilos_escritura is not None:
+            spec.opciones_formato["hilos_escritura"] = args.hilos_escritura
+        if args.json_legible:
+            spec.opciones_formato["estilo"] = "legible"
+        if args.indices:
+            spec.opciones_formato["indices"] = [c.strip() for c in args.indices.split(",") if c.strip()]
+        if args.tamano_bloque is not None:
+            spec.tamano_bloque = args.tamano_bloque
+        if args.semilla is not None:
+            spec.semilla = args.semilla
+        if args.procesos is not None:
+            spec.procesos = args.procesos
+        if args.relacional:
+            spec.relacional = True
+        if args.anexar:
+            spec.anexar = True
+        if args.cache:
+            spec.cache = True
+        spec.validar()
+        if spec.cache and spec.semilla is None:
+            print("Aviso: la caché de datasets solo se usa con una semilla fija (-s).", file=sys.stderr)
+        if spec.formato not in FORMATOS:
+            raise ValueError("Formato no soportado.")
+        salida = spec.salida or f"dataset{EXTENSIONES[spec.formato]}"
+        Path(salida).parent.mkdir(parents=True, exist_ok=True)
+
+        categorias = categorias_activas(spec)
+
+        medidor = Medidor(memoria=not args.sin_memoria) if args.informe else None
+        inicio = time.perf_counter()
+        ruta = ejecutar_corrida(spec, salida, medidor=medidor)
+        if medidor is not None:
+            informe = json.dumps(medidor.informe(
+                formato=spec.formato, ruta=ruta, cantidad=spec.cantidad, categorias=categorias,
+                semilla=spec.semilla, fecha_referencia=spec.fecha_referencia,
+                procesos=spec.procesos, tamano_bloque=spec.tamano_bloque,
+            ), indent=2, ensure_ascii=False)
+            if args.informe == "-":
+                print(informe)
+            else:
+                with open(args.informe, "w", encoding="utf-8") as f:
+                    f.write(informe)
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    filas = {ec.nombre: spec.cantidad_de(ec) for ec in spec.categorias if ec.nombre in categorias}
+    # con el informe en stdout, el resumen va a stderr para no romper el JSON
+    print(f"Exportado {sum(filas.values())} filas "
+          f"({', '.join(f'{c} {n}' for c, n in filas.items())}) en {time.perf_counter() - inicio:.2f}s "
+          f"[semilla {spec.semilla}, fecha {spec.fecha_referencia}]: {ruta}",
+          file=sys.stderr if args.informe == "-" else sys.stdout)
+    return 0
@@ -0,0 +1,195 @@
+"""Una corrida completa: generar y exportar, con progreso y cancelación.
+
+La usan la CLI y el hilo de trabajo de la GUI. ``progreso`` se invoca
+desde el hilo que ejecuta la corrida; quien la reciba debe reenviarla a su
+propio hilo si lo necesita (la GUI la pasa por una cola).
+"""
+
+import os
+import shutil
+
+from .cache import GuardadoCache, buscar, clave_corrida, leer_bloques
+from .esquemas import tipos_corrida
+from .exportar import (
+    FORMATOS,
+    POR_CATEGORIA,
+    COMPRIMIBLES,
+    EXTENSIONES,
+    ESCRITORES_POR_BLOQUES,
+    con_compresion,
+    exportar,
+    exportar_por_bloques,
+    rutas_por_categoria,
+    rutas_texto,
+)
+from .manifiesto import avance, descartar_manifiesto, guardar_manifiesto, preparar_anexo, tipos_anexo
+from .motor import generar_bloques, reparto, unir_bloques
+
+
+class Cancelado(Exception):
+    """La corrida se canceló; la salida parcial ya fue borrada (o recortada, al anexar)."""
+
+
+def categorias_activas(spec) -> list:
+    return [ec.nombre for ec in spec.categorias if ec.columnas is None or ec.columnas]
+
+
+def rutas_salida(formato: str, ruta, categorias, compresion=None, filas_por_parte=None, **opciones) -> list:
+    """Archivos (o carpetas) que escribe una corrida en ``ruta``.
+
+    Recibe las mismas opciones de formato que el escritor.
+    """
+    if formato not in COMPRIMIBLES or compresion == "ninguna":
+        compresion = None
+    if formato in ("CSV", "JSONL"):
+        return list(rutas_texto(ruta, categorias, EXTENSIONES[formato], compresion, bool(filas_por_parte)).values())
+    if formato in POR_CATEGORIA:
+        return list(rutas_por_categoria(ruta, categorias, EXTENSIONES[formato]).values())
+    return [con_compresion(ruta, compresion)]
+
+
+def _borrar(rutas):
+    for p in rutas:
+        if p.is_dir():
+            shutil.rmtree(p, ignore_errors=True)
+        elif p.exists():
+            p.unlink()
+
+
+def _archivos(rutas):
+    for p in rutas:
+        if p.is_dir():
+            yield from (a for a in p.rglob("*") if a.is_file())
+        elif p.exists():
+            yield p
+
+
+def _instantanea(rutas) -> dict:
+    """{archivo: tamaño} de la salida antes de anexarle filas."""
+    return {a: a.stat().st_size for a in _archivos(rutas)}
+
+
+def _restaurar(rutas, instantanea):
+    """Deshace lo anexado: recorta cada archivo a su tamaño previo y borra los nuevos."""
+    for a in list(_archivos(rutas)):
+        tamano = instantanea.get(a)
+        if tamano is None:
+            a.unlink()
+        elif a.stat().st_size > tamano:
+            os.truncate(a, tamano)
+    _borrar(p for p in rutas if p.is_dir() and not any(p.iterdir()))
+
+
+def ejecutar_corrida(spec, ruta, progreso=None, cancelar=None, medidor=None) -> str:
+    """Genera y exporta ``spec`` en ``ruta``; devuelve la ruta resultante.
+
+    Con ``spec.tamano_bloque`` se genera y escribe por bloques; si no, cada
+    categoría se arma entera en memoria. ``progreso(categoria, filas_hechas,
+    total)`` se llama tras cada bloque y ``cancelar`` (un ``threading.Event``) se
+    consulta entre bloques: si está activo se borra lo ya escrito y se
+    lanza ``Cancelado`` (en SQL el ROLLBACK deja la base como estaba y el
+    archivo solo se borra si lo creó esta corrida). Con ``medidor`` (un ``instrumentacion.Medidor``) se
+    mide cada etapa; el informe se obtiene luego con ``medidor.informe()``.
+
+    Con ``spec.anexar`` la salida existente se continúa (ver ``manifiesto``)
+    y cancelar la deja como estaba antes de la corrida.
+
+    Con ``spec.cache`` y una semilla fija los bloques se buscan en la caché
+    de datasets (ver ``cache``): si están, solo se exportan; si no, se
+    guardan mientras se generan. Al anexar no se usa la caché.
+    """
+    categorias = categorias_activas(spec)
+    if not categorias:
+        raise ValueError("No hay columnas activas en las categorías seleccionadas.")
+    if spec.formato not in FORMATOS:
+        raise ValueError("Formato no soportado.")
+    if spec.tamano_bloque and spec.formato not in ESCRITORES_POR_BLOQUES:
+        raise ValueError(f"El formato {spec.formato} no admite escritura por bloques.")
+
+    salida = rutas_salida(spec.formato, ruta, categorias, **spec.opciones_formato)
+    opciones = dict(spec.opciones_formato)
+    if spec.anexar:
+        previo = preparar_anexo(spec, ruta, categorias, [p for p in salida if p.exists()])
+        inicio = avance(previo)
+        opciones.update(anexar=True, tipos=tipos_anexo(previo) or tipos_corrida(spec))
+        # SQL deshace lo anexado con ROLLBACK; los demás se recortan al cancelar
+        instantanea = _instantanea(salida) if spec.formato != "SQL" else None
+    else:
+        inicio = None
+        existentes = {p for p in salida if p.exists()}
+        # la salida se reemplaza: un manifiesto anterior ya no la describe
+        descartar_manifiesto(spec, ruta)
+    tamano = spec.tamano_bloque or spec.cantidad_maxima()
+
+    en_cache = guardado = None
+    if spec.cache and spec.semilla is not None and not spec.anexar:
+        spec.resolver_semilla()  # fija la fecha de referencia, parte de la clave
+        clave = clave_corrida(spec, tamano)
+        en_cache = buscar(clave)
+        if en_cache is None:
+            guardado = GuardadoCache(clave, spec)
+
+    def bloques():
+        if en_cache is not None:
+            return leer_bloques(en_cache, medidor)
+        generados = generar_bloques(spec, tamano_bloque=tamano, medidor=medidor, inicio=inicio)
+        return generados if guardado is None else guardado.registrar(generados, medidor)
+
+    def cancelada():
+        if spec.anexar:
+            if instantanea is not None:
+                _restaurar(salida, instantanea)
+        elif spec.formato == "SQL":
+            # una base previa puede tener otras tablas: no se borra
+            _borrar(p for p in salida if p not in existentes)
+        else:
+            _borrar(salida)
+
+    def terminada(resultado):
+        if spec.anexar:
+            guardar_manifiesto(spec, ruta, categorias, previo, reparto(spec, tamano))
+        if guardado is not None:
+            guardado.confirmar()
+        return resultado
+
+    total = sum(spec.cantidad_de(ec) for ec in spec.categorias if ec.nombre in categorias)
+    hechas = 0
+
+    def seguimiento(bloques):
+        nonlocal hechas
+        try:
+            for cat, df in bloques:
+                if cancelar is not None and cancelar.is_set():
+                    raise Cancelado()
+                yield cat, df
+                hechas += len(df)
+                if progreso is not None:
+                    progreso(cat, hechas, total)
+        finally:
+            bloques.close()  # libera el pool de procesos si se cortó a medias
+
+    if medidor is not None:
+        medidor.iniciar()
+    try:
+        if spec.tamano_bloque:
+            opciones.setdefault("tipos", tipos_corrida(spec))
+            try:
+                return terminada(exportar_por_bloques(
+                    seguimiento(bloques()),
+                    spec.formato, ruta, categorias, medidor=medidor,
+                    cantidades={ec.nombre: spec.cantidad_de(ec) for ec in spec.categorias},
+                    **opciones))
+            except Cancelado:
+                cancelada()
+                raise
+
+        # En memoria no se escribe nada hasta el final: cancelar no deja restos
+        dataframes = unir_bloques(seguimiento(bloques()))
+        if cancelar is not None and cancelar.is_set():
+            raise Cancelado()
+        return terminada(exportar(dataframes, spec.formato, ruta, medidor=medidor, **opciones))
+    finally:
+        if guardado is not None:
+            guardado.descartar()  # sin efecto si ya se confirmó
+        if medidor is not None:
+            medidor.detener()
@@ -0,0 +1,239 @@
+"""Catálogos de dominio: idiomas, opciones globales y categorías."""
+
+import random
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from .pools import obtener_pool
+
+# =========================
+# Configuración de dominio
+# =========================
+
+IDIOMAS = {
+    "Español (CO)": "es_CO",
+    "Inglés (US)": "en_US",
+    "Francés (FR)": "fr_FR",
+    "Alemán (DE)": "de_DE",
+    "Portugués (BR)": "pt_BR",
+}
+
+# Opciones globales
+opciones = {
+    "Productos": ["Café", "Té", "Pan", "Leche", "Queso", "Arepa", "Chocolate", "Yogurt", "Mantequilla", "Galletas"],
+    "Ciudades": ["Bogotá", "Medellín", "Cali", "Barranquilla", "Cartagena",
+                 "Bucaramanga", "Pereira", "Santa Marta", "Cúcuta", "Manizales",
+                 "Neiva", "Villavicencio", "Armenia", "Ibagué", "Popayán",
+                 "Montería", "Sincelejo", "Riohacha", "Quibdó", "Tunja"],
+    "Departamentos": ["Ventas", "TI", "Recursos Humanos", "Logística", "Marketing", "Finanzas", "Producción"],
+    "Rutas": ["Ruta A", "Ruta B", "Ruta C", "Ruta D", "Ruta E", "Ruta F", "Ruta G"],
+    "Géneros": ["Novela", "Ciencia Ficción", "Historia", "Infantil", "Fantasía", "Poesía", "Ensayo", "Drama"],
+    "Autores": ["Gabo", "Orwell", "Rowling", "Cervantes", "Huxley", "Tolstoi", "Shakespeare", "Borges"]
+}
+
+# =========================
+# Generadores por columnas
+# =========================
+# Cada función produce una columna completa de n valores de una sola vez;
+# "column_generators" en config asocia cada columna con la suya, de modo que
+# las columnas desactivadas nunca se calculan.
+
+# Fecha que hace de "hoy" para las columnas de fecha; el motor la fija en cada
+# corrida para que una misma semilla reproduzca las mismas fechas otro día.
+_fecha_referencia = None
+
+def fijar_fecha_referencia(fecha):
+    global _fecha_referencia
+    _fecha_referencia = fecha
+
+def fecha_referencia() -> date:
+    return _fecha_referencia or date.today()
+
+def fechas_recientes(rng, n, dias):
+    """Fechas uniformes entre hoy-``dias`` y hoy (como fake.date_between)."""
+    hoy = np.datetime64(fecha_referencia(), "D")
+    return hoy - rng.integers(0, dias, n, endpoint=True).astype("timedelta64[D]")
+
+def enteros(rng, minimo, maximo, n):
+    """Enteros uniformes en [minimo, maximo] (como random.randint)."""
+    return rng.integers(minimo, maximo, n, endpoint=True)
+
+def categorica(valores, codigos) -> pd.Categorical:
+    """Columna categórica: ``codigos`` (índices en ``valores``) + tabla de categorías.
+
+    Ocupa un entero chico por fila en lugar de un objeto str; los valores
+    repetidos del catálogo comparten categoría.
+    """
+    valores = list(valores)
+    unicos = list(dict.fromkeys(valores))
+    if len(unicos) != len(valores):
+        posicion = {v: i for i, v in enumerate(unicos)}
+        codigos = np.array([posicion[v] for v in valores])[codigos]
+    return pd.Categorical.from_codes(codigos, categories=unicos)
+
+def elegir(rng, valores, n):
+    """n elecciones uniformes de ``valores`` (como random.choice), como categórica."""
+    return categorica(valores, rng.integers(0, len(valores), n))
+
+def faker_columna(fake, proveedor, rng, n):
+    """n valores del proveedor de Faker ``proveedor`` (p. ej. "name").
+
+    Con un PoolFaker se muestrea su pool pre-generado; con un Faker normal
+    se llama al proveedor n veces.
+    """
+    muestrear = getattr(fake, "muestrear", None)
+    if muestrear is not None:
+        return muestrear(proveedor, rng, n)
+    metodo = getattr(fake, proveedor)
+    return np.array([metodo() for _ in range(n)], dtype=object)
+
+def faker_unicos(fake, proveedor, inicio, n, semilla):
+    """Valores del proveedor distintos en toda la columna (ver PoolFaker.unicos).
+
+    ``inicio`` es el número de la primera fila en la columna completa. Con
+    un Faker normal se usa el pool por defecto de su idioma.
+    """
+    unicos = getattr(fake, "unicos", None)
+    if unicos is None:
+        unicos = obtener_pool(fake.locales[0]).unicos
+    return unicos(proveedor, inicio, n, semilla)
+
+# Catálogo de categorías. "schema" declara el tipo de cada columna limpia
+# (date, string, category, int16, int32, int64, float64) para los formatos
+# tipados; "category" son las columnas elegidas de una lista (ver elegir).
+# "clave" y "referencias" declaran la clave primaria y las foráneas que se
+# agregan en las corridas relacionales (ver relaciones.py). "faker" indica el
+# proveedor de las columnas que pueden generarse sin repetidos ("unicas" de la
+# especificación; ver faker_unicos) y "unicas" las que lo son por defecto.
+config = {
+    "Ventas": {
+        "columns": ["Fecha", "Producto", "Cantidad", "Precio_unitario"],
+        "requires": ["Productos"],
+        "schema": {"Fecha": "date", "Producto": "category", "Cantidad": "int32", "Precio_unitario": "int32"},
+        "clave": "ID_venta",
+        "referencias": {"ID_cliente": "Clientes", "ID_producto": "Inventario"},
+        "generator": lambda fake, choices: [
+            fake.date_between(start_date="-30d", end_date="today"),
+            random.choice(choices["Productos"]),
+            random.randint(1, 10),
+            random.randint(1000, 5000)
+        ],
+        "column_generators": {
+            "Fecha": lambda fake, rng, choices, n: fechas_recientes(rng, n, 30),
+            "Producto": lambda fake, rng, choices, n: elegir(rng, choices["Productos"], n),
+            "Cantidad": lambda fake, rng, choices, n: enteros(rng, 1, 10, n),
+            "Precio_unitario": lambda fake, rng, choices, n: enteros(rng, 1000, 5000, n)
+        }
+    },
+    "Biblioteca": {
+        "columns": ["Usuario", "Género", "Autor", "Días_prestamo", "Email"],
+        "requires": ["Géneros", "Autores"],
+        "schema": {"Usuario": "string", "Género": "category", "Autor": "category", "Días_prestamo": "int32", "Email": "string"},
+        "clave": "ID_prestamo",
+        "faker": {"Usuario": "first_name", "Email": "email"},
+        "generator": lambda fake, choices: [
+            fake.first_name(),
+            random.choice(choices["Géneros"]),
+            random.choice(choices["Autores"]),
+            random.randint(2, 14),
+            fake.email()
+        ],
+        "column_generators": {
+            "Usuario": lambda fake, rng, choices, n: faker_columna(fake, "first_name", rng, n),
+            "Género": lambda fake, rng, choices, n: elegir(rng, choices["Géneros"], n),
+            "Autor": lambda fake, rng, choices, n: elegir(rng, choices["Autores"], n),
+            "Días_prestamo": lambda fake, rng, choices, n: enteros(rng, 2, 14, n),
+            "Email": lambda fake, rng, choices, n: faker_columna(fake, "email", rng, n)
+        }
+    },
+    "Clientes": {
+        "columns": ["Nombre", "Ciudad", "Edad", "Email"],
+        "requires": ["Ciudades"],
+        "schema": {"Nombre": "string", "Ciudad": "category", "Edad": "int32", "Email": "string"},
+        "clave": "ID_cliente",
+        "faker": {"Nombre": "name", "Email": "email"},
+        "generator": lambda fake, choices: [
+            fake.name(),
+            random.choice(choices["Ciudades"]),
+            random.randint(18, 65),
+            fake.email()
+        ],
+        "column_generators": {
+            "Nombre": lambda fake, rng, choices, n: faker_columna(fake, "name", rng, n),
+            "Ciudad": lambda fake, rng, choices, n: elegir(rng, choices["Ciudades"], n),
+            "Edad": lambda fake, rng, choices, n: enteros(rng, 18, 65, n),
+            "Email": lambda fake, rng, choices, n: faker_columna(fake, "email", rng, n)
+        }
+    },
+    "Inventario": {
+        "columns": ["Producto", "Categoría", "Stock", "Precio"],
+        "requires": [],
+        "schema": {"Producto": "category", "Categoría": "category", "Stock": "int32", "Precio": "int32"},
+        "clave": "ID_producto",
+        "generator": lambda fake, choices: [
+            random.choice(["Café", "Azúcar", "Leche", "Arroz", "Aceite", "Harina", "Chocolate"]),
+            random.choice(["Bebidas", "Aseo", "Alimentos", "Tecnología"]),
+            random.randint(0, 100),
+            random.randint(1000, 50000)
+        ],
+        "column_generators": {
+            "Producto": lambda fake, rng, choices, n: elegir(rng, ["Café", "Azúcar", "Leche", "Arroz", "Aceite", "Harina", "Chocolate"], n),
+            "Categoría": lambda fake, rng, choices, n: elegir(rng, ["Bebidas", "Aseo", "Alimentos", "Tecnología"], n),
+            "Stock": lambda fake, rng, choices, n: enteros(rng, 0, 100, n),
+            "Precio": lambda fake, rng, choices, n: enteros(rng, 1000, 50000, n)
+        }
+    },
+    "Empleados": {
+        "columns": ["Nombre", "Departamento", "Salario", "Años_empresa", "Estado", "Email"],
+        "requires": ["Departamentos"],
+        "schema": {"Nombre": "string", "Departamento": "category", "Salario": "int64",
+                   "Años_empresa": "int32", "Estado": "category", "Email": "string"},
+        "clave": "ID_empleado",
+        "faker": {"Nombre": "name", "Email": "company_email"},
+        "generator": lambda fake, choices: [
+            fake.name(),
+            random.choice(choices["Departamentos"]),
+            random.randint(1_000_000, 6_000_000),
+            random.randint(1, 20),
+            random.choice(["Activo", "Inactivo"]),
+            fake.company_email()
+        ],
+        "column_generators": {
+            "Nombre": lambda fake, rng, choices, n: faker_columna(fake, "name", rng, n),
+            "Departamento": lambda fake, rng, choices, n: elegir(rng, choices["Departamentos"], n),
+            "Salario": lambda fake, rng, choices, n: enteros(rng, 1_000_000, 6_000_000, n),
+            "Años_empresa": lambda fake, rng, choices, n: enteros(rng, 1, 20, n),
+            "Estado": lambda fake, rng, choices, n: elegir(rng, ["Activo", "Inactivo"], n),
+            "Email": lambda fake, rng, choices, n: faker_columna(fake, "company_email", rng, n)
+        }
+    },
+    "Viajes": {
+        "columns": ["Fecha", "Ruta", "Pasajeros", "Tarifa"],
+        "requires": ["Rutas"],
+        "schema": {"Fecha": "date", "Ruta": "category", "Pasajeros": "int32", "Tarifa": "int32"},
+        "clave": "ID_viaje",
+        "referencias": {"ID_conductor": "Empleados"},
+        "generator": lambda fake, choices: [
+            fake.date_between(start_date="-15d", end_date="today"),
+            random.choice(choices["Rutas"]),
+            random.randint(5, 50),
+            random.randint(2000, 8000)
+        ],
+        "column_generators": {
+            "Fecha": lambda fake, rng, choices, n: fechas_recientes(rng, n, 15),
+            "Ruta": lambda fake, rng, choices, n: elegir(rng, choices["Rutas"], n),
+            "Pasajeros": lambda fake, rng, choices, n: enteros(rng, 5, 50, n),
+            "Tarifa": lambda fake, rng, choices, n: enteros(rng, 2000, 8000, n)
+        }
+    }
+}
+
+# ===============
+# Utilitarios
+# ===============
+
+def asegurar_lista_unica(lst, n):
+    """Devuelve los primeros n elementos (o todos si n>len) sin fallar."""
+    return lst[:max(0, min(n, len(lst)))]
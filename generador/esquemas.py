@@ -0,0 +1,108 @@
+"""Tipos declarados por categoría y conversión a tablas Arrow (Parquet/Feather).
+
+Las columnas limpias conservan su tipo compacto (enteros, fechas). Una
+columna numérica que puede recibir valores de tipo erróneo ("???") se
+escribe como texto, porque un esquema Arrow no admite mezclar tipos. Las
+columnas "category" se escriben como diccionario (códigos + valores), igual
+que su ``pd.Categorical`` en memoria.
+"""
+
+import pandas as pd
+
+from .dominio import config
+from .relaciones import columnas_clave, plan_claves
+
+NUMERICOS = {"int16", "int32", "int64", "float64"}
+TIPOS = {"date", "string", "category"} | NUMERICOS
+
+
+def tipos_categoria(categoria: str, columnas=None) -> dict:
+    """Tipo declarado de cada columna; "string" si la categoría no lo declara.
+
+    Las claves primarias/foráneas (ver ``relaciones``) son siempre int64.
+    """
+    schema = dict(config[categoria].get("schema", {}))
+    schema.update(dict.fromkeys(columnas_clave(categoria), "int64"))
+    columnas = config[categoria]["columns"] if columnas is None else columnas
+    return {c: schema.get(c, "string") for c in columnas}
+
+
+def tipos_efectivos(categoria: str, df: pd.DataFrame) -> dict:
+    """Tipos declarados, pasando a "string" las numéricas que ya traen otros tipos."""
+    tipos = tipos_categoria(categoria, list(df.columns))
+    for c, t in tipos.items():
+        if t in NUMERICOS and not pd.api.types.is_numeric_dtype(df[c]):
+            tipos[c] = "string"
+    return tipos
+
+
+def tipos_corrida(spec) -> dict:
+    """{categoria: {columna: tipo}} para una especificación completa.
+
+    Se usa al escribir por bloques, donde el esquema debe fijarse antes de
+    ver todos los datos: si la corrida puede inyectar tipos erróneos, las
+    columnas numéricas se declaran como texto.
+    """
+    erroneos = spec.sucios.activas() and spec.sucios.tipos_erroneos
+    claves = plan_claves(spec)
+    resultado = {}
+    for ec in spec.categorias:
+        pk, fks = claves.get(ec.nombre, (None, []))
+        columnas = ([pk] if pk else []) + [c for c, *_ in fks]
+        tipos = tipos_categoria(ec.nombre, ec.columnas)
+        if erroneos:
+            tipos = {c: "string" if t in NUMERICOS else t for c, t in tipos.items()}
+        # las claves no se ensucian: conservan su tipo entero
+        resultado[ec.nombre] = {**dict.fromkeys(columnas, "int64"), **tipos}
+    return resultado
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise ValueError("Para exportar a Parquet/Feather instala pyarrow (pip install pyarrow).")
+    return pa
+
+
+def esquema_arrow(tipos: dict, diccionarios: bool = True):
+    """Esquema Arrow; con ``diccionarios=False`` las "category" se guardan como texto."""
+    pa = _pyarrow()
+    arrow = {
+        "date": pa.date32(),
+        "string": pa.string(),
+        "category": pa.dictionary(pa.int32(), pa.string()) if diccionarios else pa.string(),
+        "int16": pa.int16(),
+        "int32": pa.int32(),
+        "int64": pa.int64(),
+        "float64": pa.float64(),
+    }
+    return pa.schema([(c, arrow[t]) for c, t in tipos.items()])
+
+
+def como_texto(s: pd.Series) -> pd.Series:
+    """Valores como texto conservando los nulos (3.0 -> "3" si era un entero)."""
+    if pd.api.types.infer_dtype(s, skipna=True) in ("string", "empty"):
+        return s
+    return pd.Series(
+        [None if pd.isna(v) else str(int(v)) if isinstance(v, float) and v.is_integer() else str(v)
+         for v in s],
+        index=s.index, dtype=object,
+    )
+
+
+def tabla_arrow(df: pd.DataFrame, esquema):
+    pa = _pyarrow()
+    arrays = []
+    for campo in esquema:
+        s = df[campo.name]
+        texto = pa.types.is_string(campo.type) or pa.types.is_dictionary(campo.type)
+        if texto and isinstance(s.dtype, pd.CategoricalDtype):
+            # códigos + categorías tal cual, sin pasar por objetos str
+            s = s.cat.rename_categories(como_texto(pd.Series(s.cat.categories)).tolist())
+            arrays.append(pa.Array.from_pandas(s).cast(campo.type))
+        elif pa.types.is_dictionary(campo.type):
+            arrays.append(pa.Array.from_pandas(como_texto(s), type=pa.string()).dictionary_encode().cast(campo.type))
+        else:
+            arrays.append(pa.Array.from_pandas(como_texto(s) if texto else s, type=campo.type))
+    return pa.Table.from_arrays(arrays, schema=esquema)
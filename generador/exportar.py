@@ -0,0 +1,721 @@
+"""Escritores de los DataFrames generados.
+
+Todos los formatos se escriben por bloques: reciben ``(categoria, df)``
+sucesivos y los agregan al archivo, hoja o tabla, así que la memoria queda
+acotada por el tamaño del bloque y no por la cantidad total de filas.
+
+Las opciones propias de cada formato (p. ej. ``compresion``) llegan como
+argumentos con nombre; cada escritor ignora las que no le corresponden.
+Con ``anexar=True`` los escritores de CSV, JSON Lines, SQL y Parquet (como
+dataset) agregan filas a una salida existente en lugar de reemplazarla
+(ver ``manifiesto``).
+"""
+
+import gzip
+import io
+import json
+import sqlite3
+import time
+import shutil
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .esquemas import esquema_arrow, tabla_arrow, tipos_categoria, tipos_efectivos
+from .instrumentacion import etapa
+from .relaciones import clave_de, referencias_de
+
+FORMATOS = ["CSV", "Excel", "JSON", "JSONL", "SQL", "Parquet", "Feather"]
+
+EXTENSIONES = {
+    "CSV": ".csv",
+    "Excel": ".xlsx",
+    "JSON": ".json",
+    "JSONL": ".jsonl",
+    "SQL": ".db",
+    "Parquet": ".parquet",
+    "Feather": ".feather",
+}
+
+# Formatos que escriben un archivo por categoría (base + sufijo)
+POR_CATEGORIA = {"CSV", "JSONL", "Parquet", "Feather"}
+
+# Compresión de los formatos de texto: extensión que se agrega a la ruta
+COMPRESIONES_TEXTO = {"gzip": ".gz", "zstd": ".zst"}
+COMPRIMIBLES = {"CSV", "JSON", "JSONL"}
+ESTILOS_JSON = ["compacto", "legible"]
+
+# Formatos cuya salida puede continuarse con anexar=True
+ANEXABLES = {"CSV", "JSONL", "SQL", "Parquet"}
+
+# Filas por hoja de Excel, incluido el encabezado
+MAX_FILAS_EXCEL = 1_048_576
+
+
+def nombre_tabla(categoria: str) -> str:
+    return categoria.lower().replace(" ", "_")
+
+
+def fechas_a_texto(df: pd.DataFrame) -> pd.DataFrame:
+    """Las columnas de fecha (datetime64) se escriben como 'AAAA-MM-DD'."""
+    fechas = [c for c in df.columns if pd.api.types.is_datetime64_any_dtype(df[c])]
+    if not fechas:
+        return df
+    df = df.copy()
+    for c in fechas:
+        dias = df[c].to_numpy().astype("datetime64[D]")
+        texto = np.datetime_as_string(dias, unit="D").astype(object)
+        texto[np.isnat(dias)] = None
+        df[c] = texto
+    return df
+
+
+def texto_csv(df: pd.DataFrame, encabezado: bool = True) -> str:
+    """Un bloque como CSV, tal como lo escribe ``EscritorCSV``."""
+    return df.to_csv(index=False, header=encabezado)
+
+
+def texto_jsonl(df: pd.DataFrame) -> str:
+    """Un bloque como JSON Lines (vacío si no tiene filas), tal como lo escribe ``EscritorJSONL``."""
+    if df.empty:
+        return ""
+    texto = fechas_a_texto(df).to_json(orient="records", lines=True, force_ascii=False)
+    return texto if texto.endswith("\n") else texto + "\n"
+
+
+def rutas_por_categoria(ruta, categorias, extension: str) -> dict:
+    """Un archivo si hay una sola categoría; si no, base + sufijo por categoría."""
+    if len(categorias) == 1:
+        return {categorias[0]: Path(ruta)}
+    base = Path(ruta)
+    return {cat: base.with_name(f"{base.stem}_{cat}{extension}") for cat in categorias}
+
+
+def compresion_texto(compresion):
+    """'gzip', 'zstd' o None ('ninguna' o sin indicar)."""
+    if compresion in (None, "", "ninguna"):
+        return None
+    if compresion not in COMPRESIONES_TEXTO:
+        raise ValueError(f"Compresión no soportada para texto: {compresion} "
+                         f"(usa {', '.join(COMPRESIONES_TEXTO)} o ninguna).")
+    return compresion
+
+
+def con_compresion(ruta, compresion) -> Path:
+    """``ruta`` con la extensión de la compresión (dataset.jsonl -> dataset.jsonl.gz)."""
+    ruta = Path(ruta)
+    sufijo = COMPRESIONES_TEXTO.get(compresion)
+    if sufijo and ruta.suffix != sufijo:
+        ruta = ruta.with_name(ruta.name + sufijo)
+    return ruta
+
+
+def sin_compresion(ruta) -> Path:
+    ruta = Path(ruta)
+    return ruta.with_suffix("") if ruta.suffix in COMPRESIONES_TEXTO.values() else ruta
+
+
+def rutas_texto(ruta, categorias, extension: str, compresion=None, partes: bool = False) -> dict:
+    """{categoria: archivo} de CSV/JSON Lines; con ``partes``, {categoria: carpeta}."""
+    rutas = rutas_por_categoria(sin_compresion(ruta), categorias, extension)
+    if partes:
+        return rutas
+    return {cat: con_compresion(r, compresion) for cat, r in rutas.items()}
+
+
+def abrir_texto(ruta, compresion=None, nivel=None, anexar=False):
+    """Archivo de texto UTF-8 para escribir, comprimido al vuelo si se pide.
+
+    Con ``anexar`` se escribe al final del archivo; comprimido, lo nuevo va
+    en otro miembro gzip o frame zstd, que los lectores leen de corrido.
+    zstd requiere el paquete ``zstandard``.
+    """
+    modo = "a" if anexar else "w"
+    if compresion == "gzip":
+        return gzip.open(ruta, modo + "t", compresslevel=6 if nivel is None else nivel,
+                         encoding="utf-8", newline="")
+    if compresion == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raise ValueError("Para comprimir con zstd instala zstandard (pip install zstandard).")
+        flujo = zstandard.ZstdCompressor(level=3 if nivel is None else nivel).stream_writer(open(ruta, modo + "b"))
+        return io.TextIOWrapper(flujo, encoding="utf-8", newline="")
+    return open(ruta, modo, encoding="utf-8", newline="")
+
+
+def siguiente_parte(carpeta) -> int:
+    """Número del próximo ``part-NNNNN`` de ``carpeta`` (0 si no hay ninguno)."""
+    carpeta = Path(carpeta)
+    if not carpeta.is_dir():
+        return 0
+    numeros = [int(p.name[5:10]) for p in carpeta.glob("part-*") if p.name[5:10].isdigit()]
+    return max(numeros) + 1 if numeros else 0
+
+
+# ===========================
+# Escritores por bloques
+# ===========================
+
+class _EscritorPorBloques:
+    def __init__(self, ruta, categorias, **opciones):
+        self.ruta = Path(ruta)
+        self.categorias = list(categorias)
+        self.filas = 0
+
+    def escribir(self, categoria: str, df: pd.DataFrame):
+        raise NotImplementedError
+
+    def cerrar(self):
+        pass
+
+    def resultado(self) -> str:
+        return str(self.ruta)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+class _EscritorArchivos(_EscritorPorBloques):
+    """Un archivo de texto por categoría, abierto durante toda la escritura.
+
+    - ``compresion`` ('gzip' o 'zstd') comprime cada archivo al vuelo con
+      ``nivel_compresion``.
+    - ``filas_por_parte`` convierte cada categoría en una carpeta con archivos
+      ``part-00000.csv``... de a lo sumo ese número de filas (cada uno con su
+      encabezado), como el dataset de Parquet.
+    - ``hilos_escritura`` (1 por defecto) escribe y comprime desde un hilo en
+      segundo plano, en el orden en que llegan los bloques, para que la
+      generación del siguiente no espere al disco; 0 escribe en el hilo que
+      llama.
+    - ``anexar`` agrega al final de los archivos existentes (sin repetir el
+      encabezado) o, con partes, sigue numerándolas desde la última.
+    """
+    extension = ""
+
+    def __init__(self, ruta, categorias, compresion=None, nivel_compresion=None, filas_por_parte=None,
+                 hilos_escritura=None, anexar=False, **opciones):
+        super().__init__(ruta, categorias)
+        self.anexar = anexar
+        self.compresion = compresion_texto(compresion)
+        self.nivel = nivel_compresion
+        if filas_por_parte is not None and filas_por_parte < 1:
+            raise ValueError("'filas_por_parte' debe ser un entero positivo.")
+        self.filas_por_parte = filas_por_parte
+        self.rutas = rutas_texto(ruta, self.categorias, self.extension, self.compresion, bool(filas_por_parte))
+        self.ruta = sin_compresion(ruta) if filas_por_parte else con_compresion(ruta, self.compresion)
+        self._archivos = {}  # {categoria: (parte, archivo)}
+        self._partes = {}    # {categoria: (parte, filas escritas en ella)}
+        if hilos_escritura is None:
+            hilos_escritura = 1
+        if hilos_escritura not in (0, 1):
+            raise ValueError("'hilos_escritura' debe ser 0 (sin hilo) o 1 (escritura en segundo plano).")
+        self._pool = ThreadPoolExecutor(1, thread_name_prefix="escritura") if hilos_escritura else None
+        self._pendientes = deque()
+
+    def _escribir_df(self, f, df, encabezado: bool):
+        raise NotImplementedError
+
+    def _archivo(self, categoria, parte=0):
+        actual = self._archivos.get(categoria)
+        if actual is not None and actual[0] == parte:
+            return actual[1], False
+        if actual is not None:
+            actual[1].close()
+        if self.filas_por_parte:
+            carpeta = self.rutas[categoria]
+            carpeta.mkdir(parents=True, exist_ok=True)
+            ruta = con_compresion(carpeta / f"part-{parte:05d}{self.extension}", self.compresion)
+        else:
+            ruta = self.rutas[categoria]
+        nuevo = not (self.anexar and ruta.exists() and ruta.stat().st_size > 0)
+        f = abrir_texto(ruta, self.compresion, self.nivel, anexar=self.anexar)
+        self._archivos[categoria] = (parte, f)
+        return f, nuevo
+
+    def _escribir_partes(self, categoria, df):
+        if not self.filas_por_parte:
+            f, primero = self._archivo(categoria)
+            self._escribir_df(f, df, primero)
+            return
+        if categoria not in self._partes:
+            primera = siguiente_parte(self.rutas[categoria]) if self.anexar else 0
+            self._partes[categoria] = (primera, 0)
+        inicio = 0
+        while True:
+            parte, escritas = self._partes[categoria]
+            if escritas == self.filas_por_parte and inicio < len(df):
+                parte, escritas = parte + 1, 0
+            n = min(len(df) - inicio, self.filas_por_parte - escritas)
+            f, primero = self._archivo(categoria, parte)
+            if n or primero:
+                self._escribir_df(f, df.iloc[inicio:inicio + n], primero)
+            self._partes[categoria] = (parte, escritas + n)
+            inicio += n
+            if inicio >= len(df):
+                break
+
+    def escribir(self, categoria, df):
+        self.filas += len(df)
+        if self._pool is None:
+            self._escribir_partes(categoria, df)
+            return
+        # un solo hilo atiende en orden: los bloques de cada categoría no se cruzan
+        self._pendientes.append(self._pool.submit(self._escribir_partes, categoria, df))
+        while len(self._pendientes) > 2:
+            # acota los bloques retenidos si el disco va más lento que la generación
+            self._pendientes.popleft().result()
+
+    def cerrar(self):
+        try:
+            while self._pendientes:
+                self._pendientes.popleft().result()
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+            for _, f in self._archivos.values():
+                f.close()
+            self._archivos.clear()
+
+    def resultado(self) -> str:
+        return str(self.ruta) if len(self.categorias) == 1 else str(self.ruta.parent)
+
+
+class EscritorCSV(_EscritorArchivos):
+    extension = ".csv"
+
+    def _escribir_df(self, f, df, encabezado):
+        # el bloque entero en una sola escritura: el compresor trabaja sobre un
+        # buffer grande (y libera el GIL) en lugar de los trozos de to_csv
+        f.write(texto_csv(df, encabezado))
+
+
+class EscritorJSONL(_EscritorArchivos):
+    extension = ".jsonl"
+
+    def _escribir_df(self, f, df, encabezado):
+        if not df.empty:
+            f.write(texto_jsonl(df))
+
+
+class EscritorJSON(_EscritorPorBloques):
+    """Un solo documento ``{categoria: [registros, ...]}`` escrito por bloques.
+
+    Cada bloque se codifica de una vez desde sus columnas con el codificador
+    de pandas (sin un dict por fila) y las fechas salen como 'AAAA-MM-DD'.
+    ``estilo="compacto"`` no agrega espacios; ``"legible"`` indenta como el
+    formato anterior. Los bloques de una categoría deben llegar seguidos,
+    como los produce ``generar_bloques``.
+    """
+
+    def __init__(self, ruta, categorias, estilo="compacto", compresion=None, nivel_compresion=None,
+                 **opciones):
+        super().__init__(ruta, categorias)
+        if estilo not in ESTILOS_JSON:
+            raise ValueError(f"Estilo de JSON desconocido: {estilo} (usa {', '.join(ESTILOS_JSON)}).")
+        self.legible = estilo == "legible"
+        compresion = compresion_texto(compresion)
+        self.ruta = con_compresion(ruta, compresion)
+        self._f = abrir_texto(self.ruta, compresion, nivel_compresion)
+        self._f.write("{")
+        self._actual = None
+        self._vistas = set()
+        self._vacia = True
+
+    def _abrir_categoria(self, categoria):
+        if categoria in self._vistas:
+            raise ValueError(f"JSON: los bloques de {categoria} deben llegar seguidos.")
+        if self._actual is not None:
+            self._f.write("\n  ]," if self.legible else "],")
+        clave = json.dumps(categoria, ensure_ascii=False)
+        self._f.write(f"\n  {clave}: [" if self.legible else f"{clave}:[")
+        self._actual = categoria
+        self._vistas.add(categoria)
+        self._vacia = True
+
+    def escribir(self, categoria, df):
+        if categoria != self._actual:
+            self._abrir_categoria(categoria)
+        if not df.empty:
+            df = fechas_a_texto(df)
+            texto = df.to_json(orient="records", force_ascii=False)
+            if self.legible:
+                # pandas no pone espacio tras ":"; json.dumps sí, como el formato anterior.
+                # Registros a 4 espacios y campos a 6, dentro de la categoría
+                texto = json.dumps(json.loads(texto), ensure_ascii=False, indent=2,
+                                   separators=(",", ": "))[1:-2].replace("\n", "\n  ")
+            else:
+                texto = texto[1:-1]
+            self._f.write(texto if self._vacia else "," + texto)
+            self._vacia = False
+        self.filas += len(df)
+
+    def cerrar(self):
+        if self._f.closed:
+            return
+        if self._actual is not None:
+            self._f.write("\n  ]\n}\n" if self.legible else "]}\n")
+        else:
+            self._f.write("}\n")
+        self._f.close()
+
+
+TIPOS_SQLITE = {
+    "date": "TEXT",
+    "string": "TEXT",
+    "category": "TEXT",
+    "int16": "INTEGER",
+    "int32": "INTEGER",
+    "int64": "INTEGER",
+    "float64": "REAL",
+}
+
+
+def _ident(nombre: str) -> str:
+    return '"' + nombre.replace('"', '""') + '"'
+
+
+class EscritorSQL(_EscritorPorBloques):
+    """Carga masiva en SQLite: una tabla tipada por categoría.
+
+    Las tablas se crean con los tipos declarados en ``config[cat]["schema"]``
+    (la afinidad de SQLite guarda igual los "???" como texto), todas las filas
+    entran con ``executemany`` dentro de una sola transacción con pragmas de
+    carga masiva, y los índices pedidos se construyen al final, con los datos
+    ya cargados. En corridas relacionales las claves se declaran como
+    PRIMARY KEY / REFERENCES y las foráneas se indexan siempre.
+
+    ``indices`` puede ser una lista de columnas (se indexan en cada categoría
+    que las tenga) o un dict ``{categoria: [columnas]}``. Con ``anexar`` las
+    tablas existentes se conservan y las filas se agregan a ellas.
+    """
+
+    PRAGMAS = (
+        "PRAGMA journal_mode = MEMORY",
+        "PRAGMA synchronous = OFF",
+        "PRAGMA temp_store = MEMORY",
+        "PRAGMA cache_size = -262144",  # 256 MiB
+    )
+
+    def __init__(self, ruta, categorias, indices=None, anexar=False, **opciones):
+        super().__init__(ruta, categorias)
+        self.indices = indices or []
+        self.anexar = anexar
+        self.conn = sqlite3.connect(self.ruta, isolation_level=None)
+        for pragma in self.PRAGMAS:
+            self.conn.execute(pragma)
+        self.conn.execute("BEGIN")
+        self._inserts = {}
+
+    def _restriccion(self, categoria, columna):
+        """PRIMARY KEY / REFERENCES de las columnas clave (ver relaciones)."""
+        if columna == clave_de(categoria):
+            return " PRIMARY KEY"
+        padre = referencias_de(categoria).get(columna, {}).get("categoria")
+        if padre in self.categorias:
+            return f" REFERENCES {_ident(nombre_tabla(padre))} ({_ident(clave_de(padre))})"
+        return ""
+
+    def _crear_tabla(self, categoria, df):
+        tabla = _ident(nombre_tabla(categoria))
+        tipos = tipos_categoria(categoria, list(df.columns))
+        columnas = ", ".join(f"{_ident(c)} {TIPOS_SQLITE[t]}{self._restriccion(categoria, c)}"
+                             for c, t in tipos.items())
+        if self.anexar:
+            self.conn.execute(f"CREATE TABLE IF NOT EXISTS {tabla} ({columnas})")
+        else:
+            self.conn.execute(f"DROP TABLE IF EXISTS {tabla}")
+            self.conn.execute(f"CREATE TABLE {tabla} ({columnas})")
+        marcas = ", ".join("?" for _ in df.columns)
+        return f"INSERT INTO {tabla} VALUES ({marcas})"
+
+    def escribir(self, categoria, df):
+        insert = self._inserts.get(categoria)
+        if insert is None:
+            insert = self._inserts[categoria] = self._crear_tabla(categoria, df)
+        df = fechas_a_texto(df)
+        # Columnas como listas de objetos Python; SQLite guarda NaN como NULL
+        columnas = [df[c].to_numpy().tolist() for c in df.columns]
+        self.conn.executemany(insert, zip(*columnas))
+        self.filas += len(df)
+
+    def _columnas_indice(self, categoria):
+        pedidas = self.indices.get(categoria, []) if isinstance(self.indices, dict) else self.indices
+        # las claves foráneas siempre se indexan (joins con la tabla padre)
+        return list(dict.fromkeys(list(referencias_de(categoria)) + list(pedidas)))
+
+    def _crear_indices(self):
+        for categoria in self._inserts:
+            tabla = nombre_tabla(categoria)
+            existentes = {r[1] for r in self.conn.execute(f"PRAGMA table_info({_ident(tabla)})")}
+            for col in self._columnas_indice(categoria):
+                if col in existentes:
+                    self.conn.execute(
+                        f"CREATE INDEX IF NOT EXISTS {_ident(f'idx_{tabla}_{col}')} "
+                        f"ON {_ident(tabla)} ({_ident(col)})"
+                    )
+
+    def __exit__(self, tipo_exc, *exc):
+        try:
+            if tipo_exc is None:
+                self._crear_indices()
+                self.conn.execute("COMMIT")
+            else:
+                self.conn.execute("ROLLBACK")
+        finally:
+            self.conn.close()
+
+
+class _EscritorArrow(_EscritorPorBloques):
+    """Base de Parquet/Feather: un archivo (o carpeta) por categoría con esquema tipado.
+
+    ``tipos`` ({categoria: {columna: tipo}}) fija el esquema de antemano;
+    si falta, se deduce del primer bloque de cada categoría. Si la escritura
+    falla a medias se cierran los escritores y se borra lo creado en esta
+    corrida, como el ROLLBACK de SQL: no quedan archivos truncados.
+    """
+    extension = ""
+    diccionarios = True  # columnas "category" como diccionario de Arrow
+
+    def __init__(self, ruta, categorias, compresion=None, tipos=None, anexar=False, **opciones):
+        super().__init__(ruta, categorias)
+        self.anexar = anexar
+        self.rutas = rutas_por_categoria(ruta, self.categorias, self.extension)
+        self.compresion = None if compresion == "ninguna" else (compresion or self.compresion_defecto)
+        self.tipos = tipos or {}
+        self._esquemas = {}
+        self._creados = []  # lo que esta corrida crea o reemplaza
+
+    def _nuevo(self, ruta: Path) -> Path:
+        # al anexar, lo que ya existía queda como estaba
+        if not (self.anexar and ruta.exists()):
+            self._creados.append(ruta)
+        return ruta
+
+    def __exit__(self, tipo_exc, *exc):
+        try:
+            self.cerrar()
+        finally:
+            if tipo_exc is not None:
+                # en orden inverso: los archivos antes que su carpeta
+                for ruta in reversed(self._creados):
+                    if ruta.is_dir():
+                        shutil.rmtree(ruta, ignore_errors=True)
+                    else:
+                        ruta.unlink(missing_ok=True)
+
+    def _tabla(self, categoria, df):
+        esquema = self._esquemas.get(categoria)
+        if esquema is None:
+            tipos = self.tipos.get(categoria) or tipos_efectivos(categoria, df)
+            esquema = self._esquemas[categoria] = esquema_arrow(tipos, self.diccionarios)
+        return tabla_arrow(df, esquema)
+
+    def resultado(self) -> str:
+        return str(self.ruta) if len(self.categorias) == 1 else str(self.ruta.parent)
+
+
+class EscritorParquet(_EscritorArrow):
+    """Parquet con compresión y tamaño de row group configurables.
+
+    Con ``dataset=True`` cada categoría es una carpeta con un archivo por
+    bloque (``part-00000.parquet``...), lista para Spark/DuckDB; con
+    ``anexar`` los archivos nuevos siguen la numeración de los existentes.
+    """
+    extension = ".parquet"
+    compresion_defecto = "snappy"
+
+    def __init__(self, ruta, categorias, filas_por_grupo=None, dataset=False, anexar=False, **opciones):
+        super().__init__(ruta, categorias, anexar=anexar, **opciones)
+        if anexar and not dataset:
+            raise ValueError("Parquet solo se puede anexar como dataset (opción 'dataset').")
+        self.filas_por_grupo = filas_por_grupo
+        self.dataset = dataset
+        self._escritores = {}
+        self._partes = {}
+
+    def escribir(self, categoria, df):
+        import pyarrow.parquet as pq
+
+        tabla = self._tabla(categoria, df)
+        if self.dataset:
+            carpeta = self.rutas[categoria]
+            parte = self._partes.get(categoria)
+            if parte is None:
+                self._nuevo(carpeta).mkdir(parents=True, exist_ok=True)
+                parte = siguiente_parte(carpeta) if self.anexar else 0
+            pq.write_table(tabla, self._nuevo(carpeta / f"part-{parte:05d}.parquet"),
+                           compression=self.compresion, row_group_size=self.filas_por_grupo)
+            self._partes[categoria] = parte + 1
+        else:
+            escritor = self._escritores.get(categoria)
+            if escritor is None:
+                escritor = self._escritores[categoria] = pq.ParquetWriter(
+                    self._nuevo(self.rutas[categoria]), tabla.schema, compression=self.compresion)
+            escritor.write_table(tabla, row_group_size=self.filas_por_grupo)
+        self.filas += len(df)
+
+    def cerrar(self):
+        for escritor in self._escritores.values():
+            escritor.close()
+        self._escritores.clear()
+
+
+class EscritorFeather(_EscritorArrow):
+    """Arrow IPC (Feather v2); cada bloque es un record batch del archivo."""
+    extension = ".feather"
+    compresion_defecto = "lz4"
+    # un archivo IPC admite un solo diccionario por columna, y el ruido de los
+    # datos sucios agrega categorías distintas en cada bloque
+    diccionarios = False
+
+    def __init__(self, ruta, categorias, **opciones):
+        super().__init__(ruta, categorias, **opciones)
+        self._escritores = {}
+
+    def escribir(self, categoria, df):
+        import pyarrow as pa
+
+        tabla = self._tabla(categoria, df)
+        escritor = self._escritores.get(categoria)
+        if escritor is None:
+            opciones = pa.ipc.IpcWriteOptions(compression=self.compresion)
+            escritor = self._escritores[categoria] = pa.ipc.new_file(
+                str(self._nuevo(self.rutas[categoria])), tabla.schema, options=opciones)
+        escritor.write_table(tabla)
+        self.filas += len(df)
+
+    def cerrar(self):
+        for escritor in self._escritores.values():
+            escritor.close()
+        self._escritores.clear()
+
+
+class EscritorExcel(_EscritorPorBloques):
+    """xlsx con xlsxwriter en modo ``constant_memory``: las filas se vuelcan a
+    disco a medida que se escriben, así que la memoria no crece con el libro.
+
+    Una categoría que no cabe en una hoja (``filas_por_hoja`` filas de datos,
+    por defecto el máximo de Excel) se reparte en ``Ventas_1``, ``Ventas_2``...
+    El nombre se decide con ``cantidades`` ({categoria: filas esperadas}); sin
+    ese dato la primera hoja conserva el nombre de la categoría y las
+    siguientes se numeran desde ``_2``.
+    """
+
+    def __init__(self, ruta, categorias, cantidades=None, filas_por_hoja=None, **opciones):
+        import xlsxwriter
+
+        super().__init__(ruta, categorias)
+        self.cantidades = cantidades or {}
+        self.filas_por_hoja = min(filas_por_hoja or MAX_FILAS_EXCEL - 1, MAX_FILAS_EXCEL - 1)
+        self.libro = xlsxwriter.Workbook(str(self.ruta), {
+            "constant_memory": True,
+            # los datos sucios no deben convertirse en fórmulas ni enlaces
+            "strings_to_formulas": False,
+            "strings_to_urls": False,
+            "default_date_format": "yyyy-mm-dd",
+        })
+        self._encabezado = self.libro.add_format({"bold": True})
+        self._fecha = self.libro.add_format({"num_format": "yyyy-mm-dd"})
+        self._hojas = {}  # {categoria: [hoja, número de hoja, filas escritas en ella]}
+
+    def _nombre_hoja(self, categoria, numero):
+        esperadas = self.cantidades.get(categoria)
+        if numero == 1 and (esperadas is None or esperadas <= self.filas_por_hoja):
+            return categoria[:31]
+        sufijo = f"_{numero}"
+        return categoria[:31 - len(sufijo)] + sufijo
+
+    def _nueva_hoja(self, categoria, df, numero):
+        hoja = self.libro.add_worksheet(self._nombre_hoja(categoria, numero))
+        for i, c in enumerate(df.columns):
+            if pd.api.types.is_datetime64_any_dtype(df[c]):
+                hoja.set_column(i, i, 12, self._fecha)
+        hoja.write_row(0, 0, list(df.columns), self._encabezado)
+        self._hojas[categoria] = [hoja, numero, 0]
+
+    @staticmethod
+    def _columnas(df) -> list:
+        """Valores por columna listos para xlsxwriter (fechas como serial de Excel, nulos como None)."""
+        columnas = []
+        for c in df.columns:
+            arr = df[c].to_numpy()
+            if np.issubdtype(arr.dtype, np.datetime64):
+                dias = arr.astype("datetime64[D]")
+                valores = (dias - np.datetime64("1899-12-30")).astype(np.int64).astype(object)
+                valores[np.isnat(dias)] = None
+            elif arr.dtype.kind in "iub":
+                columnas.append(arr.tolist())
+                continue
+            else:
+                valores = arr.astype(object)
+                valores[pd.isna(arr)] = None
+            columnas.append(valores.tolist())
+        return columnas
+
+    def escribir(self, categoria, df):
+        if categoria not in self._hojas:
+            self._nueva_hoja(categoria, df, 1)
+        filas = zip(*self._columnas(df))
+        restantes = len(df)
+        while restantes:
+            hoja, numero, escritas = self._hojas[categoria]
+            if escritas == self.filas_por_hoja:
+                self._nueva_hoja(categoria, df, numero + 1)
+                continue
+            n = min(restantes, self.filas_por_hoja - escritas)
+            escribir_fila = hoja.write_row
+            for r in range(escritas + 1, escritas + n + 1):
+                escribir_fila(r, 0, next(filas))
+            self._hojas[categoria][2] = escritas + n
+            restantes -= n
+        self.filas += len(df)
+
+    def cerrar(self):
+        if self.libro.fileclosed:
+            return
+        if not self._hojas:
+            self.libro.add_worksheet()  # xlsx requiere al menos una hoja
+        self.libro.close()
+
+
+ESCRITORES_POR_BLOQUES = {
+    "CSV": EscritorCSV,
+    "Excel": EscritorExcel,
+    "JSON": EscritorJSON,
+    "JSONL": EscritorJSONL,
+    "SQL": EscritorSQL,
+    "Parquet": EscritorParquet,
+    "Feather": EscritorFeather,
+}
+
+
+def exportar_por_bloques(bloques, formato: str, ruta, categorias, medidor=None, **opciones) -> str:
+    """Escribe los ``(categoria, df)`` de ``bloques`` a medida que llegan."""
+    clase = ESCRITORES_POR_BLOQUES.get(formato)
+    if clase is None:
+        raise ValueError(f"El formato {formato} no admite escritura por bloques.")
+    with clase(ruta, categorias, **opciones) as escritor:
+        for cat, df in bloques:
+            with etapa(medidor, "escritura", cat, len(df)):
+                escritor.escribir(cat, df)
+        fin_bloques = time.perf_counter()
+    if medidor is not None:
+        # cierre de archivos, armado del xlsx, COMMIT e índices de SQL
+        medidor.sumar("escritura", "(cierre)", time.perf_counter() - fin_bloques, 0)
+    return escritor.resultado()
+
+
+def exportar(dataframes: dict, formato: str, ruta, medidor=None, **opciones) -> str:
+    """Escribe los DataFrames y devuelve la ruta (archivo o carpeta) resultante."""
+    if formato not in ESCRITORES_POR_BLOQUES:
+        raise ValueError("Formato no soportado.")
+    opciones.setdefault("cantidades", {cat: len(df) for cat, df in dataframes.items()})
+    return exportar_por_bloques(dataframes.items(), formato, ruta, list(dataframes),
+                                medidor=medidor, **opciones)
@@ -0,0 +1,103 @@
+"""Medición opcional por etapa: tiempo, filas/s y memoria pico.
+
+Las etapas son ``generacion`` (generadores de columnas / Faker),
+``dataframe`` (armado del DataFrame), ``sucios`` (inyección de datos
+sucios), ``cache`` (copia a o lectura de la caché de datasets) y
+``escritura`` (exportador). Se acumulan por categoría; la memoria
+pico de cada etapa es la asignada por encima de lo que había al empezarla,
+medida con ``tracemalloc`` (que encarece la corrida, por eso es opcional).
+"""
+
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+ETAPAS = ["generacion", "dataframe", "sucios", "cache", "escritura"]
+
+
+class Medidor:
+    def __init__(self, memoria: bool = True):
+        self.memoria = memoria
+        self.etapas = {}  # {(etapa, categoria): {"segundos", "filas", "memoria_pico"}}
+        self._inicio = None
+        self._fin = None
+        self._propio = False  # si iniciamos nosotros tracemalloc
+
+    def iniciar(self):
+        self._inicio = time.perf_counter()
+        if self.memoria and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._propio = True
+
+    def detener(self):
+        self._fin = time.perf_counter()
+        if self._propio:
+            tracemalloc.stop()
+            self._propio = False
+
+    @contextmanager
+    def etapa(self, etapa: str, categoria: str, filas: int):
+        midiendo = self.memoria and tracemalloc.is_tracing()
+        if midiendo:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            pico = tracemalloc.get_traced_memory()[1] - base if midiendo else None
+            self.sumar(etapa, categoria, time.perf_counter() - inicio, filas, pico)
+
+    def sumar(self, etapa: str, categoria: str, segundos: float, filas: int, pico=None):
+        e = self.etapas.setdefault((etapa, categoria), {"segundos": 0.0, "filas": 0, "memoria_pico": None})
+        e["segundos"] += segundos
+        e["filas"] += filas
+        if pico is not None:
+            e["memoria_pico"] = max(pico, e["memoria_pico"] or 0)
+
+    def combinar(self, etapas: dict):
+        """Suma las etapas medidas en otro proceso (shards en paralelo)."""
+        for (etapa, categoria), e in etapas.items():
+            self.sumar(etapa, categoria, e["segundos"], e["filas"], e["memoria_pico"])
+
+    def informe(self, **datos) -> dict:
+        """Informe serializable a JSON; ``datos`` se agregan al encabezado."""
+        filas = []
+        # por etapa y, dentro de cada una, en el orden de la corrida
+        for (etapa, categoria), e in sorted(self.etapas.items(), key=lambda kv: ETAPAS.index(kv[0][0])):
+            filas.append({
+                "etapa": etapa,
+                "categoria": categoria,
+                "segundos": round(e["segundos"], 4),
+                "filas": e["filas"],
+                "filas_por_segundo": round(e["filas"] / e["segundos"]) if e["segundos"] and e["filas"] else None,
+                "memoria_pico_mib": None if e["memoria_pico"] is None else round(e["memoria_pico"] / 2**20, 1),
+            })
+        total = (self._fin or time.perf_counter()) - self._inicio if self._inicio else None
+        return {**datos,
+                "segundos_total": None if total is None else round(total, 4),
+                "memoria_medida": self.memoria,
+                "etapas": filas}
+
+
+def resumen(informe: dict) -> str:
+    """Una línea con el tiempo (y pico de memoria) total de cada etapa."""
+    totales = {}
+    for f in informe["etapas"]:
+        t = totales.setdefault(f["etapa"], [0.0, None])
+        t[0] += f["segundos"]
+        if f["memoria_pico_mib"] is not None:
+            t[1] = max(f["memoria_pico_mib"], t[1] or 0)
+    partes = []
+    for etapa in ETAPAS:
+        if etapa in totales:
+            seg, mem = totales[etapa]
+            partes.append(f"{etapa} {seg:.2f}s" + (f" ({mem:.0f} MiB)" if mem is not None else ""))
+    if informe.get("segundos_total") is not None:
+        partes.append(f"total {informe['segundos_total']:.2f}s")
+    return " · ".join(partes)
+
+
+def etapa(medidor, nombre: str, categoria: str, filas: int):
+    """``medidor.etapa(...)`` o un contexto vacío si no se está midiendo."""
+    return nullcontext() if medidor is None else medidor.etapa(nombre, categoria, filas)
@@ -0,0 +1,195 @@
+"""Manifiesto de una salida anexable: lo necesario para continuarla.
+
+Al generar con ``anexar`` se guarda junto a la salida un
+``<archivo>.manifiesto.json`` (p. ej. ``dataset.csv.manifiesto.json``) con la semilla, la fecha de referencia, las
+opciones que definen la disposición de los archivos y, por categoría, sus
+columnas y cuántas filas, shards y bloques se llevan escritos. La corrida
+siguiente retoma desde ahí: los shards y bloques nuevos siguen la
+numeración (y por lo tanto reciben semillas que no se repitieron), las
+claves primarias continúan donde terminaron y las foráneas pueden apuntar
+a filas de corridas anteriores. Así, generar 1000 filas y anexar otras
+1000 equivale a tener un dataset de 2000 filas de la misma semilla, aunque
+no idéntico al de una sola corrida de 2000.
+
+Los duplicados sucios solo copian filas de la corrida en curso: la reserva
+de filas previas no se guarda en el manifiesto.
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+from .esquemas import tipos_corrida
+from .exportar import ANEXABLES, COMPRIMIBLES, compresion_texto, sin_compresion
+
+VERSION = 1
+
+
+def ruta_manifiesto(ruta) -> Path:
+    """dataset.csv(.gz) -> dataset.csv.manifiesto.json
+
+    El nombre completo (con la extensión) evita que ``d.csv`` y ``d.db`` en
+    la misma carpeta compartan manifiesto.
+    """
+    base = sin_compresion(ruta)
+    return base.with_name(f"{base.name}.manifiesto.json")
+
+
+def _disposicion(formato: str, opciones: dict) -> dict:
+    """Opciones de formato que cambian qué archivos se escriben y cómo."""
+    if formato in COMPRIMIBLES:
+        return {
+            "compresion": compresion_texto(opciones.get("compresion")),
+            "partes": bool(opciones.get("filas_por_parte")),
+        }
+    if formato == "Parquet":
+        return {"dataset": bool(opciones.get("dataset"))}
+    return {}
+
+
+def _tipos_activos(spec, categorias) -> dict:
+    tipos = tipos_corrida(spec)
+    return {cat: tipos[cat] for cat in categorias}
+
+
+def cargar_manifiesto(ruta):
+    """El manifiesto de la salida ``ruta``, o None si no existe."""
+    archivo = ruta_manifiesto(ruta)
+    if not archivo.exists():
+        return None
+    try:
+        with open(archivo, "r", encoding="utf-8") as f:
+            manifiesto = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"No se pudo leer el manifiesto {archivo}: {e}")
+    if manifiesto.get("version") != VERSION:
+        raise ValueError(f"Versión de manifiesto no soportada en {archivo}.")
+    return manifiesto
+
+
+def descartar_manifiesto(spec, ruta):
+    """Borra el manifiesto de ``ruta`` si describe una salida de ``spec.formato``.
+
+    Se usa al reemplazar la salida (sin anexar): un manifiesto de otro
+    formato o ilegible no es de esta salida y se deja como está.
+    """
+    try:
+        manifiesto = cargar_manifiesto(ruta)
+    except ValueError:
+        return
+    if manifiesto is not None and manifiesto["formato"] == spec.formato:
+        ruta_manifiesto(ruta).unlink(missing_ok=True)
+
+
+def preparar_anexo(spec, ruta, categorias, rutas_existentes) -> dict:
+    """Valida que ``spec`` pueda continuar la salida ``ruta``; devuelve el manifiesto previo.
+
+    Fija en ``spec`` la semilla y la fecha de referencia del manifiesto. Sin
+    manifiesto (primera corrida) devuelve None, siempre que no haya ya una
+    salida en ``ruta`` que no se sepa continuar. ``rutas_existentes`` son los
+    archivos o carpetas de la salida que ya existen.
+    """
+    if spec.formato not in ANEXABLES:
+        raise ValueError(f"El formato {spec.formato} no admite anexar "
+                         f"(usa {', '.join(sorted(ANEXABLES))}).")
+    if spec.formato == "Parquet" and not spec.opciones_formato.get("dataset"):
+        raise ValueError("Parquet solo se puede anexar como dataset (opción 'dataset').")
+
+    manifiesto = cargar_manifiesto(ruta)
+    archivo = ruta_manifiesto(ruta)
+    if manifiesto is None:
+        if rutas_existentes:
+            raise ValueError(f"{rutas_existentes[0]} ya existe y no tiene manifiesto: "
+                             "no se puede continuar (genera sin anexar o elige otra ruta).")
+        return None
+    if manifiesto["formato"] != spec.formato:
+        raise ValueError(f"La salida es {manifiesto['formato']}; no se le pueden anexar filas en {spec.formato}.")
+    if manifiesto["disposicion"] != _disposicion(spec.formato, spec.opciones_formato):
+        raise ValueError("Las opciones de compresión, partes o dataset no coinciden con las de la salida.")
+    if not rutas_existentes:
+        raise ValueError(f"El manifiesto {archivo} no corresponde a ninguna salida; "
+                         "bórralo para empezar un dataset nuevo.")
+    if spec.idioma != manifiesto["idioma"]:
+        raise ValueError(f"La salida se generó en {manifiesto['idioma']}; "
+                         f"no se le pueden anexar filas en {spec.idioma}.")
+    if spec.relacional != manifiesto["relacional"]:
+        raise ValueError("La salida se generó " + ("con" if manifiesto["relacional"] else "sin")
+                         + " claves entre categorías; al anexar no se puede cambiar.")
+    previas = list(manifiesto["categorias"])
+    if previas != list(categorias):
+        raise ValueError(f"Las categorías no coinciden con las de la salida ({', '.join(previas)}).")
+    indices = {ec.nombre: i for i, ec in enumerate(spec.categorias)}
+    tipos = _tipos_activos(spec, categorias)
+    for cat, datos in manifiesto["categorias"].items():
+        if datos["indice"] != indices[cat]:
+            raise ValueError("El orden de las categorías no coincide con el de la salida.")
+        if list(datos["tipos"]) != list(tipos[cat]):
+            raise ValueError(f"Las columnas de {cat} no coinciden con las de la salida.")
+        if spec.formato == "Parquet" and datos["tipos"] != tipos[cat]:
+            raise ValueError(f"Los tipos de {cat} no coinciden con los del dataset "
+                             "(¿cambió la opción de tipos erróneos?).")
+
+    if spec.semilla is not None and spec.semilla != manifiesto["semilla"]:
+        raise ValueError(f"La salida se generó con la semilla {manifiesto['semilla']}; "
+                         "al anexar no se puede usar otra.")
+    spec.semilla = manifiesto["semilla"]
+    if spec.fecha_referencia is None:
+        spec.fecha_referencia = manifiesto["fecha_referencia"]
+    return manifiesto
+
+
+def avance(manifiesto) -> dict:
+    """{categoria: {"filas", "shards", "bloques"}} ya escritos, para ``generar_bloques``."""
+    if manifiesto is None:
+        return {}
+    return {cat: {k: datos[k] for k in ("filas", "shards", "bloques")}
+            for cat, datos in manifiesto["categorias"].items()}
+
+
+def tipos_anexo(manifiesto) -> dict:
+    """Los tipos con que se escribió la salida: el esquema no puede cambiar al anexar."""
+    if manifiesto is None:
+        return None
+    return {cat: datos["tipos"] for cat, datos in manifiesto["categorias"].items()}
+
+
+def guardar_manifiesto(spec, ruta, categorias, manifiesto, repartos):
+    """Escribe el manifiesto actualizado tras una corrida terminada.
+
+    ``repartos`` es ``motor.reparto`` con el tamaño de bloque usado.
+    """
+    if manifiesto is None:
+        tipos = _tipos_activos(spec, categorias)
+        indices = {ec.nombre: i for i, ec in enumerate(spec.categorias)}
+        manifiesto = {
+            "version": VERSION,
+            "formato": spec.formato,
+            "semilla": spec.semilla,
+            "fecha_referencia": spec.fecha_referencia,
+            "idioma": spec.idioma,
+            "relacional": spec.relacional,
+            "disposicion": _disposicion(spec.formato, spec.opciones_formato),
+            "categorias": {cat: {"indice": indices[cat], "tipos": tipos[cat],
+                                 "filas": 0, "shards": 0, "bloques": 0}
+                           for cat in categorias},
+            "corridas": [],
+        }
+    filas = {}
+    for cat, bloques in repartos.items():
+        datos = manifiesto["categorias"][cat]
+        filas[cat] = sum(n for tamanos in bloques for n in tamanos)
+        datos["filas"] += filas[cat]
+        datos["shards"] += sum(len(tamanos) for tamanos in bloques)
+        datos["bloques"] += len(bloques)
+    manifiesto["corridas"].append({
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "fecha_referencia": spec.fecha_referencia,
+        "filas": filas,
+    })
+
+    archivo = ruta_manifiesto(ruta)
+    temporal = archivo.with_name(archivo.name + ".tmp")
+    with open(temporal, "w", encoding="utf-8") as f:
+        json.dump(manifiesto, f, ensure_ascii=False, indent=2)
+    os.replace(temporal, archivo)
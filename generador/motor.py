@@ -0,0 +1,534 @@
+"""Motor de generación sin interfaz gráfica.
+
+Toma una especificación (categorías, columnas, subconjuntos de ``opciones``,
+idioma, cantidad y datos sucios) y devuelve un DataFrame por categoría. No
+importa Tk ni ttkbootstrap, así que sirve para servidores sin pantalla.
+"""
+
+import random
+import secrets
+import tracemalloc
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from faker import Faker
+
+from .categorias import cargar_categorias, definiciones_usuario, leer_json_o_yaml, registrar_categoria
+from .dominio import IDIOMAS, opciones, config, asegurar_lista_unica, faker_unicos, fijar_fecha_referencia
+from .instrumentacion import Medidor, etapa
+from .pools import TAMANO_POOL, obtener_pool
+from .relaciones import (
+    MAX_PADRES,
+    agregar_claves,
+    clave_de,
+    plan_claves,
+    referencias_de,
+    validar_relacion,
+)
+from .sucios import aplicar_datos_sucios
+
+REQUIRES_MIN = 3
+REQUIRES_MAX = 20
+# Filas de bloques anteriores que se conservan como origen de duplicados
+RESERVA_DUPLICADOS = 10_000
+# Unidad de generación: cada shard tiene su propia semilla derivada de la
+# maestra, así que la salida no depende de cuántos procesos la generen.
+FILAS_POR_SHARD = 100_000
+# Filas por categoría de la vista previa de la GUI
+FILAS_MUESTRA = 50
+
+
+# ===========================
+# Especificación de una corrida
+# ===========================
+
+@dataclass
+class OpcionesSucias:
+    porcentaje: int = 0
+    nulos: bool = True
+    duplicados: bool = True
+    ruido_texto: bool = True
+    outliers: bool = True
+    tipos_erroneos: bool = True
+
+    def activas(self):
+        return self.porcentaje > 0
+
+
+@dataclass
+class EspecCategoria:
+    nombre: str
+    columnas: list = None          # None = todas las columnas de config
+    requires: dict = field(default_factory=dict)  # {require_key: n}
+    cantidad: int = None           # None = la cantidad global de la corrida
+    unicas: list = None            # columnas sin valores repetidos; None = las "unicas" de config
+
+
+@dataclass
+class Especificacion:
+    categorias: list
+    cantidad: int = 200
+    idioma: str = "es_CO"
+    sucios: OpcionesSucias = field(default_factory=OpcionesSucias)
+    formato: str = "CSV"
+    salida: str = None
+    opciones_formato: dict = field(default_factory=dict)  # p. ej. {"compresion": "zstd"}
+    tamano_pool: int = TAMANO_POOL  # 0 = llamar a Faker en cada fila
+    tamano_bloque: int = 0          # 0 = todo en memoria; >0 = generar/escribir por bloques
+    semilla: int = None             # None = se sortea una al generar
+    fecha_referencia: str = None    # "hoy" de las columnas de fecha (AAAA-MM-DD); None = hoy
+    procesos: int = 1
+    relacional: bool = False        # agregar claves primarias/foráneas (ver relaciones)
+    relaciones: dict = field(default_factory=dict)  # {"Ventas.ID_cliente": {"sesgo": 1.2}}
+    anexar: bool = False            # continuar la salida existente (ver manifiesto)
+    cache: bool = False             # reutilizar datasets ya generados (ver cache; solo con semilla fija)
+
+    @classmethod
+    def desde_dict(cls, data: dict):
+        """Construye y valida una especificación a partir de un dict (JSON/YAML)."""
+        cats = data.get("categorias")
+        if not cats:
+            raise ValueError("Selecciona al menos una categoría.")
+        if isinstance(cats, list):
+            cats = {c: {} for c in cats}
+
+        categorias = []
+        for nombre, opts in cats.items():
+            opts = opts or {}
+            categorias.append(EspecCategoria(
+                nombre=nombre,
+                columnas=opts.get("columnas"),
+                requires=dict(opts.get("requires") or {}),
+                cantidad=opts.get("cantidad"),
+                unicas=opts.get("unicas"),
+            ))
+
+        sucios = OpcionesSucias(**(data.get("sucios") or {}))
+        spec = cls(
+            categorias=categorias,
+            cantidad=data.get("cantidad", 200),
+            idioma=data.get("idioma", "es_CO"),
+            sucios=sucios,
+            formato=data.get("formato", "CSV"),
+            salida=data.get("salida"),
+            opciones_formato=dict(data.get("opciones_formato") or {}),
+            tamano_pool=data.get("tamano_pool", TAMANO_POOL),
+            tamano_bloque=data.get("tamano_bloque", 0),
+            semilla=data.get("semilla"),
+            fecha_referencia=data.get("fecha_referencia"),
+            procesos=data.get("procesos", 1),
+            relacional=bool(data.get("relacional", False)),
+            relaciones=dict(data.get("relaciones") or {}),
+            anexar=bool(data.get("anexar", False)),
+            cache=bool(data.get("cache", False)),
+        )
+        spec.validar()
+        return spec
+
+    def validar(self):
+        try:
+            self.cantidad = int(self.cantidad)
+        except (TypeError, ValueError):
+            raise ValueError("La cantidad debe ser un número positivo.")
+        if self.cantidad <= 0:
+            raise ValueError("La cantidad debe ser un número positivo.")
+        self.idioma = resolver_idioma(self.idioma)
+        self.tamano_pool = int(self.tamano_pool or 0)
+        if self.tamano_pool < 0:
+            raise ValueError("El tamaño del pool no puede ser negativo.")
+        self.tamano_bloque = int(self.tamano_bloque or 0)
+        if self.tamano_bloque < 0:
+            raise ValueError("El tamaño de bloque no puede ser negativo.")
+        if self.semilla is not None:
+            self.semilla = int(self.semilla)
+            if self.semilla < 0:
+                raise ValueError("La semilla no puede ser negativa.")
+        if self.fecha_referencia is not None:
+            try:
+                self.fecha_referencia = date.fromisoformat(str(self.fecha_referencia)).isoformat()
+            except ValueError:
+                raise ValueError("La fecha de referencia debe tener formato AAAA-MM-DD.")
+        self.procesos = int(self.procesos or 1)
+        if self.procesos < 1:
+            raise ValueError("El número de procesos debe ser al menos 1.")
+        for ec in self.categorias:
+            if ec.nombre not in config:
+                raise ValueError(f"Categoría desconocida: {ec.nombre}")
+            if ec.cantidad is not None:
+                try:
+                    ec.cantidad = int(ec.cantidad)
+                except (TypeError, ValueError):
+                    ec.cantidad = 0
+                if ec.cantidad <= 0:
+                    raise ValueError(f"La cantidad de {ec.nombre} debe ser un número positivo.")
+            if ec.columnas is not None:
+                desconocidas = [c for c in ec.columnas if c not in config[ec.nombre]["columns"]]
+                if desconocidas:
+                    raise ValueError(f"Columnas desconocidas en {ec.nombre}: {', '.join(desconocidas)}")
+            for key in ec.requires:
+                if key not in config[ec.nombre]["requires"]:
+                    raise ValueError(f"{ec.nombre} no usa el catálogo {key}.")
+            for col in ec.unicas or []:
+                if col not in config[ec.nombre].get("faker", {}):
+                    raise ValueError(f"{ec.nombre}: la columna {col} no admite valores únicos.")
+            if self.relacional and clave_de(ec.nombre) and self.cantidad_de(ec) > MAX_PADRES:
+                raise ValueError(f"{ec.nombre}: demasiadas filas para una clave primaria.")
+        for nombre, relacion in self.relaciones.items():
+            if nombre != "*":
+                cat, _, col = nombre.partition(".")
+                if cat not in config or col not in referencias_de(cat):
+                    raise ValueError(f"Relación desconocida: {nombre} (usa Categoria.columna o *).")
+            validar_relacion(nombre, relacion or {})
+
+    def cantidad_de(self, ec: EspecCategoria) -> int:
+        return ec.cantidad or self.cantidad
+
+    def unicas_de(self, ec: EspecCategoria) -> dict:
+        """{columna: proveedor} de las columnas activas de ``ec`` que no repiten valores."""
+        entrada = config[ec.nombre]
+        unicas = entrada.get("unicas", []) if ec.unicas is None else ec.unicas
+        activas = entrada["columns"] if ec.columnas is None else ec.columnas
+        return {c: entrada["faker"][c] for c in unicas if c in activas}
+
+    def cantidad_maxima(self) -> int:
+        """Tamaño de bloque que deja cada categoría en un solo bloque."""
+        return max([self.cantidad] + [self.cantidad_de(ec) for ec in self.categorias])
+
+
+    def resolver_semilla(self) -> int:
+        """Sortea y fija la semilla maestra (y la fecha de referencia) si no se indicaron.
+
+        Con ambas fijadas la corrida se puede regenerar idéntica más adelante.
+        """
+        if self.semilla is None:
+            self.semilla = secrets.randbelow(2**32)
+        if self.fecha_referencia is None:
+            self.fecha_referencia = date.today().isoformat()
+        return self.semilla
+
+
+def resolver_idioma(idioma: str) -> str:
+    """Acepta la etiqueta de la GUI ("Español (CO)") o el locale ("es_CO")."""
+    if idioma in IDIOMAS:
+        return IDIOMAS[idioma]
+    if idioma in IDIOMAS.values():
+        return idioma
+    raise ValueError(f"Idioma no soportado: {idioma}")
+
+
+def cargar_especificacion(ruta) -> Especificacion:
+    """Lee una especificación JSON o YAML (según la extensión).
+
+    ``"esquemas"`` (lista de archivos o carpetas, relativos al spec) registra
+    antes categorías definidas por el usuario (ver ``categorias``).
+    """
+    ruta = Path(ruta)
+    data = leer_json_o_yaml(ruta) or {}
+    esquemas = data.get("esquemas") or []
+    cargar_categorias(*(ruta.parent / e for e in ([esquemas] if isinstance(esquemas, str) else esquemas)))
+    return Especificacion.desde_dict(data)
+
+
+# ===========================
+# Generación
+# ===========================
+
+def construir_choices(categoria: str, requires: dict = None) -> dict:
+    """Subconjuntos de ``opciones`` para los 'requires' de la categoría."""
+    requires = requires or {}
+    choices = {}
+    for key in config[categoria]["requires"]:
+        n = requires.get(key)
+        if n is None:
+            # fallback: todo el catálogo
+            choices[key] = opciones[key]
+            continue
+        n = int(n)
+        if n < REQUIRES_MIN or n > REQUIRES_MAX:
+            raise ValueError(f"{key} debe estar entre {REQUIRES_MIN} y {REQUIRES_MAX}.")
+        choices[key] = asegurar_lista_unica(opciones[key], n)
+    return choices
+
+
+def generar_categoria(fake, categoria: str, cantidad: int, columnas=None, choices=None,
+                      rng=None, por_filas=False, medidor=None, unicas=None) -> pd.DataFrame:
+    """Genera ``cantidad`` filas de la categoría con las columnas pedidas.
+
+    Usa los generadores por columna ("column_generators") de la categoría
+    cuando existen, llamando solo los de ``columnas``; cae al generador por
+    filas ("generator") en caso contrario o si se pide ``por_filas``.
+    ``unicas`` (``({columna: (proveedor, semilla)}, fila inicial)``) reemplaza
+    esas columnas por valores sin repetidos (ver ``dominio.faker_unicos``);
+    las demás columnas no cambian.
+    """
+    todas = config[categoria]["columns"]
+    columnas = list(todas) if columnas is None else list(columnas)
+    choices = construir_choices(categoria) if choices is None else choices
+
+    gens = config[categoria].get("column_generators")
+    if gens is not None and not por_filas:
+        rng = rng if rng is not None else np.random.default_rng()
+        with etapa(medidor, "generacion", categoria, cantidad):
+            arrays = {c: gens[c](fake, rng, choices, cantidad) for c in columnas}
+            arrays.update(_columnas_unicas(fake, unicas, cantidad))
+        with etapa(medidor, "dataframe", categoria, cantidad):
+            return pd.DataFrame(arrays, columns=columnas)
+
+    generador = config[categoria]["generator"]
+    registros = []
+    with etapa(medidor, "generacion", categoria, cantidad):
+        for _ in range(cantidad):
+            row = generador(fake, choices)
+            row_dict = dict(zip(todas, row))
+            registros.append([row_dict[c] for c in columnas])
+        reemplazos = _columnas_unicas(fake, unicas, cantidad)
+    with etapa(medidor, "dataframe", categoria, cantidad):
+        df = pd.DataFrame(registros, columns=columnas)
+        for c, valores in reemplazos.items():
+            df[c] = valores
+        return df
+
+
+def _columnas_unicas(fake, unicas, n) -> dict:
+    if not unicas:
+        return {}
+    proveedores, inicio = unicas
+    return {c: faker_unicos(fake, proveedor, inicio, n, semilla)
+            for c, (proveedor, semilla) in proveedores.items()}
+
+
+def ensuciar(df: pd.DataFrame, sucios: OpcionesSucias, rng=None, previas=None, excluir=()) -> pd.DataFrame:
+    if not sucios.activas():
+        return df
+    return aplicar_datos_sucios(
+        df,
+        porcentaje=int(sucios.porcentaje),
+        habilitar_nulos=sucios.nulos,
+        habilitar_duplicados=sucios.duplicados,
+        habilitar_ruido_texto=sucios.ruido_texto,
+        habilitar_outliers=sucios.outliers,
+        habilitar_tipos_erroneos=sucios.tipos_erroneos,
+        rng=rng,
+        previas=previas,
+        excluir=excluir,
+    )
+
+
+def _actualizar_reserva(reserva, bloque: pd.DataFrame, rng, maximo=RESERVA_DUPLICADOS):
+    """Muestra acotada de filas ya emitidas, origen de duplicados en bloques posteriores."""
+    if len(bloque) > maximo:
+        bloque = bloque.iloc[rng.choice(len(bloque), maximo, replace=False)]
+    reserva = bloque if reserva is None else pd.concat([reserva, bloque])
+    if len(reserva) > maximo:
+        reserva = reserva.iloc[rng.choice(len(reserva), maximo, replace=False)]
+    return reserva.reset_index(drop=True)
+
+
+def _faker_para(spec: Especificacion):
+    return obtener_pool(spec.idioma, spec.tamano_pool) if spec.tamano_pool else Faker(spec.idioma)
+
+
+def _secuencia(semilla: int, *clave) -> np.random.SeedSequence:
+    """Semilla independiente para (categoría, shard/bloque, etapa), derivada de la maestra."""
+    return np.random.SeedSequence(semilla, spawn_key=clave)
+
+
+def _generar_shard(fake, categoria, columnas, choices, n, secuencia, claves=None, unicas=None,
+                   medidor=None):
+    semilla_py = int(secuencia.generate_state(1)[0])
+    fake.seed_instance(semilla_py)
+    if config[categoria].get("column_generators") is None:
+        # el generador por filas usa el módulo random global
+        random.seed(semilla_py)
+    df = generar_categoria(fake, categoria, n, columnas, choices,
+                           rng=np.random.default_rng(secuencia), medidor=medidor, unicas=unicas)
+    if claves is not None:
+        # (pk, fila inicial del shard, foráneas, semilla propia de las claves)
+        pk, inicio, fks, secuencia_claves = claves
+        df = agregar_claves(df, np.random.default_rng(secuencia_claves), pk, inicio, fks)
+    return df
+
+
+_fake_proceso = None
+_medir_proceso = None  # None = sin medición; True/False = medir también la memoria
+
+
+def _iniciar_proceso(idioma, tamano_pool, fecha, medir=None, definiciones=None):
+    global _fake_proceso, _medir_proceso
+    # Con "spawn" el proceso no hereda las categorías del usuario: se recompilan
+    for definicion in (definiciones or {}).values():
+        registrar_categoria(definicion)
+    _fake_proceso = obtener_pool(idioma, tamano_pool) if tamano_pool else Faker(idioma)
+    fijar_fecha_referencia(fecha)
+    _medir_proceso = medir
+    if medir:
+        tracemalloc.start()
+
+
+def _shard_en_proceso(tarea):
+    """Devuelve ``(df, etapas)``; ``etapas`` es None si no se está midiendo."""
+    if _medir_proceso is None:
+        return _generar_shard(_fake_proceso, *tarea), None
+    medidor = Medidor(memoria=_medir_proceso)
+    return _generar_shard(_fake_proceso, *tarea, medidor=medidor), medidor.etapas
+
+
+def _shards_en_orden(spec: Especificacion, tareas, fake, medidor=None):
+    """Genera los shards de ``tareas`` (en serie o en procesos) y los entrega en orden."""
+    if spec.procesos <= 1:
+        for tarea in tareas:
+            yield _generar_shard(fake, *tarea, medidor=medidor)
+        return
+
+    medir = None if medidor is None else medidor.memoria
+    ex = ProcessPoolExecutor(spec.procesos, initializer=_iniciar_proceso,
+                             initargs=(spec.idioma, spec.tamano_pool,
+                                       date.fromisoformat(spec.fecha_referencia), medir,
+                                       definiciones_usuario()))
+
+    def recibir(futuro):
+        df, etapas = futuro.result()
+        if etapas is not None:
+            medidor.combinar(etapas)
+        return df
+
+    try:
+        # Ventana acotada de shards en vuelo: la memoria no crece con cantidad
+        pendientes = deque()
+        for tarea in tareas:
+            pendientes.append(ex.submit(_shard_en_proceso, tarea))
+            if len(pendientes) >= 2 * spec.procesos:
+                yield recibir(pendientes.popleft())
+        while pendientes:
+            yield recibir(pendientes.popleft())
+    finally:
+        ex.shutdown(cancel_futures=True)
+
+
+def reparto(spec: Especificacion, tamano_bloque: int = None) -> dict:
+    """{categoria: [[n por shard] por bloque]} de las categorías con columnas activas."""
+    tamano = tamano_bloque or spec.tamano_bloque or spec.cantidad
+    por_shard = min(tamano, FILAS_POR_SHARD)
+    shards_por_bloque = max(1, tamano // por_shard)
+    resultado = {}
+    for ec in spec.categorias:
+        if ec.columnas is not None and not ec.columnas:
+            continue
+        cantidad = spec.cantidad_de(ec)
+        tamanos = [min(por_shard, cantidad - i) for i in range(0, cantidad, por_shard)]
+        resultado[ec.nombre] = [tamanos[i:i + shards_por_bloque] for i in range(0, len(tamanos), shards_por_bloque)]
+    return resultado
+
+
+def generar_bloques(spec: Especificacion, fake=None, tamano_bloque: int = None, medidor=None, inicio=None):
+    """Genera ``(categoria, df)`` en bloques de a lo sumo ``tamano_bloque`` filas.
+
+    Cada bloque se arma con shards de hasta FILAS_POR_SHARD filas, cada uno
+    con su propio generador sembrado desde ``spec.semilla``; con
+    ``spec.procesos > 1`` los shards se reparten entre procesos y el
+    resultado es idéntico al de la generación en serie. Los datos sucios se
+    aplican a cada bloque en el proceso principal; los duplicados pueden
+    copiar filas de bloques anteriores a través de una reserva acotada.
+    Con ``medidor`` (ver ``instrumentacion``) se mide cada etapa.
+
+    ``inicio`` ({categoria: {"filas", "shards", "bloques"}}, ver
+    ``manifiesto``) continúa un dataset ya escrito: la numeración de shards
+    y bloques (de la que salen las semillas) y las claves siguen desde ahí.
+    """
+    semilla = spec.resolver_semilla()
+    fijar_fecha_referencia(date.fromisoformat(spec.fecha_referencia))
+    fake = fake if fake is not None else _faker_para(spec)
+    tamano = tamano_bloque or spec.tamano_bloque or spec.cantidad
+    por_shard = min(tamano, FILAS_POR_SHARD)
+    con_reserva = spec.sucios.activas() and spec.sucios.duplicados
+    inicio = inicio or {}
+    claves = plan_claves(spec, {cat: avance["filas"] for cat, avance in inicio.items()})
+    repartos = reparto(spec, tamano)
+
+    plan = []      # (i_cat, categoria, [n por shard, agrupados por bloque], columnas clave, primer bloque)
+    tareas = []
+    for i_cat, ec in enumerate(spec.categorias):
+        if ec.nombre not in repartos:
+            # Si no hay columnas activas, omitimos esta categoría
+            continue
+        choices = construir_choices(ec.nombre, ec.requires)
+        bloques = repartos[ec.nombre]
+        avance = inicio.get(ec.nombre, {})
+        primer_shard = avance.get("shards", 0)
+        pk, fks = claves.get(ec.nombre, (None, []))
+        plan.append((i_cat, ec.nombre, bloques, ([pk] if pk else []) + [c for c, *_ in fks],
+                     avance.get("bloques", 0)))
+        # las columnas únicas usan la misma semilla en todos los shards (etapa 3, por columna)
+        todas = config[ec.nombre]["columns"]
+        unicas = {c: (proveedor, int(_secuencia(semilla, i_cat, todas.index(c), 3).generate_state(1)[0]))
+                  for c, proveedor in spec.unicas_de(ec).items()}
+        for i, n in enumerate(n for tamanos in bloques for n in tamanos):
+            i_shard = primer_shard + i
+            fila = avance.get("filas", 0) + i * por_shard
+            claves_shard = None
+            if pk or fks:
+                claves_shard = (pk, fila, fks, _secuencia(semilla, i_cat, i_shard, 2))
+            tareas.append((ec.nombre, ec.columnas, choices, n, _secuencia(semilla, i_cat, i_shard, 0),
+                           claves_shard, (unicas, fila) if unicas else None))
+        if spec.procesos > 1:
+            # Extrae los pools en este proceso para que los trabajadores los lean de disco
+            generar_categoria(fake, ec.nombre, 1, ec.columnas, choices)
+
+    shards = _shards_en_orden(spec, tareas, fake, medidor)
+    for i_cat, categoria, bloques, columnas_clave, primer_bloque in plan:
+        reserva = None
+        for i_bloque, tamanos in enumerate(bloques, start=primer_bloque):
+            partes = [next(shards) for _ in tamanos]
+            df = partes[0] if len(partes) == 1 else pd.concat(partes, ignore_index=True)
+            rng = np.random.default_rng(_secuencia(semilla, i_cat, i_bloque, 1))
+            if spec.sucios.activas():
+                with etapa(medidor, "sucios", categoria, len(df)):
+                    # las claves no se ensucian: la integridad referencial se mantiene
+                    df = ensuciar(df, spec.sucios, rng, previas=reserva, excluir=columnas_clave)
+            if con_reserva:
+                reserva = _actualizar_reserva(reserva, df, rng)
+            yield categoria, df
+
+
+def unir_bloques(bloques) -> dict:
+    """{categoria: df} a partir de los ``(categoria, df)`` de ``generar_bloques``.
+
+    Aunque el bloque cubra la categoría entera, una de más de FILAS_POR_SHARD
+    filas puede llegar en varios bloques (se agrupan shards completos); aquí
+    se concatenan en orden.
+    """
+    partes = {}
+    for categoria, df in bloques:
+        partes.setdefault(categoria, []).append(df)
+    return {cat: dfs[0] if len(dfs) == 1 else pd.concat(dfs, ignore_index=True)
+            for cat, dfs in partes.items()}
+
+
+def generar_dataframes(spec: Especificacion, fake=None, medidor=None) -> dict:
+    """Un DataFrame por categoría; omite las categorías sin columnas activas."""
+    return unir_bloques(generar_bloques(spec, fake, tamano_bloque=spec.cantidad_maxima(), medidor=medidor))
+
+
+def generar_muestra(spec: Especificacion, filas: int = FILAS_MUESTRA) -> dict:
+    """Las primeras ``filas`` de cada categoría, con sus datos sucios, para una vista previa.
+
+    Cada categoría sale de un único shard en el proceso actual, sin importar
+    las cantidades, bloques o procesos de ``spec`` (que no se modifica). Sin
+    semilla se usa 0: la muestra cambia solo cuando cambia la configuración.
+    """
+    muestra = replace(
+        spec,
+        cantidad=filas,
+        categorias=[replace(ec, cantidad=None) for ec in spec.categorias],
+        tamano_bloque=0,
+        procesos=1,
+        anexar=False,
+        cache=False,
+        semilla=0 if spec.semilla is None else spec.semilla,
+    )
+    return generar_dataframes(muestra)
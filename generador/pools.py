@@ -0,0 +1,184 @@
+"""Pools de valores Faker pre-generados con caché en disco por idioma.
+
+``fake.name()``, ``fake.email()`` y compañía son las llamadas más lentas de
+la generación. En lugar de invocarlas una vez por fila se extrae, una sola
+vez por idioma, un conjunto de valores únicos por proveedor; ese conjunto se
+guarda en disco como una lista JSON (clave: idioma, versión de Faker, semilla
+y tamaño; JSON conserva los valores de varias líneas, como ``address``) y las
+columnas se muestrean con indexado vectorizado sobre él.
+
+El mismo pool sirve las columnas únicas (ver ``PoolFaker.unicos``): sus
+valores se recorren en un orden sembrado y se numeran al agotarse, así que
+la unicidad no depende de recordar lo ya emitido.
+"""
+
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+from faker import Faker, VERSION as FAKER_VERSION
+
+TAMANO_POOL = 10_000
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+# Intentos máximos por valor único antes de aceptar un pool más pequeño
+# (p. ej. first_name tiene pocos cientos de valores en algunos idiomas).
+INTENTOS_POR_VALOR = 3
+# Separadores de la numeración de las columnas únicas, en orden de
+# preferencia; se usa el primero que no aparece en ningún valor del pool.
+SEPARADORES_CORREO = ("+", "~", "^")
+SEPARADORES_TEXTO = (" #", " ~", "~", "|")
+
+
+def directorio_cache() -> Path:
+    base = os.environ.get("GENERADOR_CACHE") or Path.home() / ".cache" / "generador"
+    return Path(base) / "pools"
+
+
+def _podar_cache(directorio: Path, max_bytes: int):
+    """Borra los archivos usados hace más tiempo hasta quedar bajo ``max_bytes``."""
+    # los .txt son pools de versiones anteriores (una línea por valor)
+    archivos = sorted([*directorio.glob("*.json"), *directorio.glob("*.txt")],
+                      key=lambda p: p.stat().st_mtime)
+    total = sum(p.stat().st_size for p in archivos)
+    for p in archivos:
+        if total <= max_bytes:
+            break
+        total -= p.stat().st_size
+        p.unlink(missing_ok=True)
+
+
+class PoolFaker:
+    """Envoltorio de Faker que sirve columnas muestreadas de pools únicos.
+
+    Los generadores por columna reciben esta instancia como ``fake``; los
+    atributos que no son del pool (p. ej. ``date_between``) se delegan al
+    Faker subyacente, así que también sirve para los generadores por filas.
+    """
+
+    def __init__(self, locale: str, tamano: int = TAMANO_POOL, semilla: int = 0,
+                 directorio=None, max_bytes: int = CACHE_MAX_BYTES):
+        self.locale = locale
+        self.tamano = tamano
+        self.semilla = semilla
+        self.directorio = Path(directorio) if directorio else directorio_cache()
+        self.max_bytes = max_bytes
+        self.faker = Faker(locale)
+        self._pools = {}  # {proveedor: np.ndarray[object]}
+        self._unicos = {}  # {proveedor: (base, sufijo, separador)}
+
+    def __getattr__(self, nombre):
+        return getattr(self.faker, nombre)
+
+    def _ruta(self, proveedor: str) -> Path:
+        return self.directorio / (
+            f"{self.locale}_faker{FAKER_VERSION}_s{self.semilla}_{proveedor}_{self.tamano}.json"
+        )
+
+    def _extraer(self, proveedor: str) -> list:
+        # Faker propio y sembrado: el pool depende solo de la clave de caché
+        fake = Faker(self.locale)
+        fake.seed_instance(self.semilla)
+        metodo = getattr(fake, proveedor)
+        vistos = {}
+        for _ in range(self.tamano * INTENTOS_POR_VALOR):
+            vistos.setdefault(metodo(), None)
+            if len(vistos) >= self.tamano:
+                break
+        return list(vistos)
+
+    def valores(self, proveedor: str) -> np.ndarray:
+        """Pool de valores únicos del proveedor (memoria → disco → Faker)."""
+        pool = self._pools.get(proveedor)
+        if pool is not None:
+            return pool
+
+        ruta = self._ruta(proveedor)
+        valores = None
+        if ruta.exists():
+            try:
+                valores = json.loads(ruta.read_text(encoding="utf-8"))
+                os.utime(ruta)  # marca de uso reciente para la poda
+            except (OSError, ValueError):
+                # un archivo ilegible (p. ej. truncado) se vuelve a extraer
+                valores = None
+        if not valores:
+            valores = self._extraer(proveedor)
+            try:
+                self.directorio.mkdir(parents=True, exist_ok=True)
+                tmp = ruta.with_suffix(f".{os.getpid()}.tmp")
+                tmp.write_text(json.dumps(valores, ensure_ascii=False), encoding="utf-8")
+                os.replace(tmp, ruta)
+                _podar_cache(self.directorio, self.max_bytes)
+            except OSError:
+                # Sin caché en disco seguimos con el pool en memoria
+                pass
+
+        pool = np.array(valores, dtype=object)
+        self._pools[proveedor] = pool
+        return pool
+
+    def muestrear(self, proveedor: str, rng, n: int) -> np.ndarray:
+        pool = self.valores(proveedor)
+        return pool[rng.integers(0, len(pool), n)]
+
+    def _partes_unicas(self, proveedor: str):
+        """Cada valor partido donde va la numeración (antes de la @ en los correos) y el separador."""
+        partes = self._unicos.get(proveedor)
+        if partes is not None:
+            return partes
+        pool = self.valores(proveedor)
+        correo = all("@" in v for v in pool)
+        candidatos = SEPARADORES_CORREO if correo else SEPARADORES_TEXTO
+        separador = next((s for s in candidatos if not any(s in v for v in pool)), None)
+        if separador is None:
+            raise ValueError(f"No se pueden generar valores únicos de {proveedor}: "
+                             f"todos los separadores ({' '.join(candidatos)}) aparecen en sus valores.")
+        if correo:
+            base = np.array([v.partition("@")[0] for v in pool], dtype=object)
+            sufijo = np.array(["@" + v.partition("@")[2] for v in pool], dtype=object)
+        else:
+            base, sufijo = pool, None
+        partes = self._unicos[proveedor] = (base, sufijo, separador)
+        return partes
+
+    def unicos(self, proveedor: str, inicio: int, n: int, semilla: int) -> np.ndarray:
+        """Valores distintos entre sí para las filas ``inicio`` .. ``inicio + n - 1`` de una columna.
+
+        La fila i toma el valor σ_r(i mod P) del pool de P valores, donde σ_r
+        es una permutación sembrada con ``semilla`` para la vuelta r = i // P;
+        desde la segunda vuelta se agrega r con un separador que no aparece en
+        el pool (ana+3@example.com, "Ana Pérez #3"). Como el valor depende solo
+        del número de fila, cada shard o proceso calcula los suyos sin conocer
+        los demás y la memoria no crece con la cantidad de filas.
+        """
+        pool = self.valores(proveedor)
+        total = len(pool)
+        valores = np.empty(n, dtype=object)
+        # las filas son consecutivas: cada vuelta es un tramo contiguo
+        for vuelta in range(inicio // total, (inicio + n - 1) // total + 1 if n else 0):
+            desde = max(vuelta * total - inicio, 0)
+            hasta = min((vuelta + 1) * total - inicio, n)
+            posiciones = np.arange(inicio + desde, inicio + hasta, dtype=np.int64) % total
+            indices = np.random.default_rng([semilla, vuelta]).permutation(total)[posiciones]
+            if vuelta == 0:
+                valores[desde:hasta] = pool[indices]
+                continue
+            base, sufijo, separador = self._partes_unicas(proveedor)
+            tramo = base[indices] + f"{separador}{vuelta}"
+            if sufijo is not None:
+                tramo += sufijo[indices]
+            valores[desde:hasta] = tramo
+        return valores
+
+
+_pools_por_idioma = {}
+
+
+def obtener_pool(locale: str, tamano: int = TAMANO_POOL, semilla: int = 0) -> PoolFaker:
+    """PoolFaker compartido por proceso, para no reconstruir Faker en cada corrida."""
+    clave = (locale, tamano, semilla)
+    pool = _pools_por_idioma.get(clave)
+    if pool is None:
+        pool = _pools_por_idioma[clave] = PoolFaker(locale, tamano, semilla)
+    return pool
@@ -0,0 +1,130 @@
+"""Claves primarias y foráneas entre categorías.
+
+Una categoría declara en ``config`` su clave primaria (``"clave"``) y las
+foráneas que apuntan a otras categorías (``"referencias"``). Las claves
+primarias son enteros consecutivos 1..N, así que una foránea es válida con
+solo caer en ese rango: se muestrea directamente como arreglo de enteros,
+sin buscar nada en la tabla padre, y la integridad referencial se mantiene
+con cualquier número de filas, shards o procesos.
+
+La forma de la relación se controla con:
+
+- ``cobertura``: fracción de padres que reciben al menos una referencia posible
+  (p. ej. 0.8 = el 20% de los clientes nunca compra).
+- ``sesgo``: exponente tipo Zipf; 0 reparte uniforme, 1 o más concentra las
+  referencias en pocos padres (clientes frecuentes, productos estrella).
+- la cantidad de filas de cada categoría (``EspecCategoria.cantidad``), que
+  fija cuántos hijos hay por padre en promedio.
+"""
+
+import numpy as np
+
+from .dominio import config
+
+# Primo grande: (rango * MULTIPLICADOR) % n es una permutación de 0..n-1 para
+# todo n que no sea múltiplo suyo; reparte los padres populares por todo el
+# rango de ids en lugar de dejarlos en los primeros.
+MULTIPLICADOR = 2_654_435_761
+MAX_PADRES = MULTIPLICADOR - 1
+RELACION_DEFECTO = {"sesgo": 0.0, "cobertura": 1.0}
+
+
+def clave_de(categoria: str):
+    """Columna de clave primaria de la categoría (o None)."""
+    return config[categoria].get("clave")
+
+
+def referencias_de(categoria: str) -> dict:
+    """{columna: definición} de las claves foráneas declaradas por la categoría.
+
+    En ``config`` cada referencia puede ser el nombre de la categoría padre o
+    un dict ``{"categoria": ..., "sesgo": ..., "cobertura": ...}``.
+    """
+    refs = {}
+    for col, ref in (config[categoria].get("referencias") or {}).items():
+        refs[col] = {"categoria": ref} if isinstance(ref, str) else dict(ref)
+    return refs
+
+
+def columnas_clave(categoria: str) -> list:
+    """Clave primaria y foráneas de la categoría, en el orden en que se agregan."""
+    pk = clave_de(categoria)
+    return ([pk] if pk else []) + list(referencias_de(categoria))
+
+
+def validar_relacion(donde: str, relacion: dict):
+    sesgo, cobertura = relacion.get("sesgo", 0.0), relacion.get("cobertura", 1.0)
+    try:
+        sesgo, cobertura = float(sesgo), float(cobertura)
+    except (TypeError, ValueError):
+        raise ValueError(f"{donde}: 'sesgo' y 'cobertura' deben ser números.")
+    if sesgo < 0:
+        raise ValueError(f"{donde}: el sesgo no puede ser negativo.")
+    if not 0 < cobertura <= 1:
+        raise ValueError(f"{donde}: la cobertura debe estar entre 0 (excluido) y 1.")
+    return {"sesgo": sesgo, "cobertura": cobertura}
+
+
+def plan_claves(spec, previas=None) -> dict:
+    """{categoria: (pk, [(columna, n_padre, sesgo, cobertura), ...])} de la corrida.
+
+    Solo con ``spec.relacional``; una foránea se incluye si su categoría
+    padre también se genera en la corrida. Los parámetros salen de
+    ``config`` y se pueden sobrescribir con ``spec.relaciones``
+    (``{"Ventas.ID_cliente": {...}}`` o ``{"*": {...}}`` para todas).
+    ``previas`` ({categoria: filas}) son las filas ya escritas al anexar:
+    las foráneas pueden apuntar también a ellas.
+    """
+    if not spec.relacional:
+        return {}
+    previas = previas or {}
+    cantidades = {ec.nombre: previas.get(ec.nombre, 0) + spec.cantidad_de(ec) for ec in spec.categorias}
+    plan = {}
+    for ec in spec.categorias:
+        fks = []
+        for col, ref in referencias_de(ec.nombre).items():
+            padre = ref["categoria"]
+            if padre not in cantidades or not clave_de(padre):
+                continue
+            relacion = {**RELACION_DEFECTO, **ref, **spec.relaciones.get("*", {}),
+                        **spec.relaciones.get(f"{ec.nombre}.{col}", {})}
+            relacion = validar_relacion(f"{ec.nombre}.{col}", relacion)
+            fks.append((col, cantidades[padre], relacion["sesgo"], relacion["cobertura"]))
+        plan[ec.nombre] = (clave_de(ec.nombre), fks)
+    return plan
+
+
+def muestrear_claves(rng, n: int, n_padre: int, sesgo: float = 0.0, cobertura: float = 1.0) -> np.ndarray:
+    """n claves foráneas en 1..n_padre, vectorizado y sin tablas auxiliares.
+
+    El rango de popularidad se sortea por inversión de la distribución
+    continua x^-sesgo en [1, k+1) (k = padres cubiertos), que aproxima una Zipf
+    acotada; luego se permuta a ids con una multiplicación modular.
+    """
+    k = max(1, int(round(n_padre * cobertura)))
+    if sesgo == 0:
+        rango = rng.integers(0, k, n)
+    else:
+        u = rng.random(n)
+        if abs(sesgo - 1.0) < 1e-9:
+            x = np.exp(u * np.log(k + 1))
+        else:
+            a = 1.0 - sesgo
+            x = (((k + 1) ** a - 1) * u + 1) ** (1 / a)
+        rango = np.minimum(x.astype(np.int64) - 1, k - 1)
+    return (rango * MULTIPLICADOR) % n_padre + 1
+
+
+def agregar_claves(df, rng, pk, inicio: int, fks):
+    """Antepone la clave primaria (inicio+1..inicio+n) y las foráneas a ``df``."""
+    n = len(df)
+    claves = {}
+    if pk:
+        claves[pk] = np.arange(inicio + 1, inicio + n + 1, dtype=np.int64)
+    for col, n_padre, sesgo, cobertura in fks:
+        claves[col] = muestrear_claves(rng, n, n_padre, sesgo, cobertura)
+    if not claves:
+        return df
+    for i, (col, valores) in enumerate(claves.items()):
+        df.insert(i, col, valores)
+    return df
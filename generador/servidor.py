@@ -0,0 +1,371 @@
+"""Servicio HTTP local que genera datos bajo demanda: ``python -m generador.servidor``.
+
+Cada categoría de ``config`` es un recurso que se descarga como CSV o
+JSON Lines (``/Ventas.csv``, ``/Clientes.jsonl``); ``/`` describe las
+categorías, sus columnas y catálogos. Los parámetros de la consulta son
+los de la GUI::
+
+    /Ventas.csv?cantidad=1000000&idioma=en_US&columnas=Fecha,Producto&Productos=5&sucios=10
+
+- ``cantidad``, ``idioma`` (locale o etiqueta de IDIOMAS), ``columnas`` y
+  ``unicas`` (separadas por comas), ``semilla`` y ``fecha_referencia``.
+- El tamaño de cada subconjunto, con el nombre del catálogo
+  (``Productos=5``, ``Ciudades=8``...).
+- ``sucios`` (porcentaje; 0 = datos limpios) y los tipos de suciedad
+  ``nulos``, ``duplicados``, ``ruido_texto``, ``outliers`` y
+  ``tipos_erroneos`` (1/0; todos activos por defecto).
+- ``bloque``: filas por trozo de la respuesta.
+
+La respuesta se envía con ``Transfer-Encoding: chunked`` a medida que se
+generan los bloques, sin armar el dataset en memoria. Cada bloque es una
+tarea independiente para un pool de procesos: se genera como si se
+anexara tras los anteriores (ver ``manifiesto``), con su propia semilla
+derivada de la maestra, así que la misma consulta con la misma semilla
+devuelve siempre los mismos bytes. Por conexión hay a lo sumo ``adelanto``
+bloques en curso y no se pide el siguiente hasta que el cliente recibe el
+anterior; ``max_clientes`` limita las descargas simultáneas y las que
+excedan ``max_en_espera`` reciben 503.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from http import HTTPStatus
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from .categorias import cargar_categorias, cargar_categorias_entorno, definiciones_usuario, registrar_categoria
+from .dominio import IDIOMAS, config, opciones
+from .exportar import texto_csv, texto_jsonl
+from .motor import FILAS_POR_SHARD, REQUIRES_MAX, REQUIRES_MIN, Especificacion, generar_bloques
+
+HOST = "127.0.0.1"
+PUERTO = 8765
+FILAS_POR_BLOQUE = 10_000
+MAX_CLIENTES = 8
+MAX_EN_ESPERA = 32
+# Bloques pedidos al pool por conexión antes de que el cliente reciba el primero
+ADELANTO = 2
+# Segundos para recibir la línea de petición y los encabezados
+TIEMPO_PETICION = 10
+MAX_ENCABEZADOS = 100
+
+FORMATOS = {
+    "csv": "text/csv; charset=utf-8",
+    "jsonl": "application/x-ndjson; charset=utf-8",
+}
+PARAMETROS = {"cantidad", "idioma", "columnas", "unicas", "semilla", "fecha_referencia", "sucios",
+              "nulos", "duplicados", "ruido_texto", "outliers", "tipos_erroneos", "bloque"}
+TIPOS_SUCIEDAD = ("nulos", "duplicados", "ruido_texto", "outliers", "tipos_erroneos")
+
+
+class ErrorHTTP(Exception):
+    def __init__(self, estado: HTTPStatus, mensaje: str):
+        super().__init__(mensaje)
+        self.estado = estado
+
+
+# ===========================
+# Parámetros -> especificación
+# ===========================
+
+def _entero(params: dict, nombre: str, defecto=None):
+    valor = params.get(nombre)
+    if valor is None:
+        return defecto
+    try:
+        return int(valor)
+    except ValueError:
+        raise ValueError(f"'{nombre}' debe ser un número entero.")
+
+
+def _booleano(params: dict, nombre: str, defecto: bool) -> bool:
+    valor = params.get(nombre)
+    if valor is None:
+        return defecto
+    if valor.lower() in ("1", "true", "si", "sí"):
+        return True
+    if valor.lower() in ("0", "false", "no"):
+        return False
+    raise ValueError(f"'{nombre}' debe ser 1 o 0.")
+
+
+def _lista(params: dict, nombre: str):
+    valor = params.get(nombre)
+    return None if valor is None else [c.strip() for c in valor.split(",") if c.strip()]
+
+
+def especificacion_consulta(categoria: str, consulta: str):
+    """(Especificacion, filas por bloque) de la consulta de ``/<categoria>.<formato>``."""
+    params = {}
+    for nombre, valores in parse_qs(consulta, keep_blank_values=True).items():
+        if len(valores) > 1:
+            raise ValueError(f"'{nombre}' aparece más de una vez.")
+        params[nombre] = valores[0]
+    catalogos = config[categoria]["requires"]
+    desconocidos = [p for p in params if p not in PARAMETROS and p not in catalogos]
+    if desconocidos:
+        raise ValueError(f"Parámetros desconocidos: {', '.join(desconocidos)}")
+
+    porcentaje = _entero(params, "sucios", 0)
+    if not 0 <= porcentaje <= 100:
+        raise ValueError("'sucios' debe estar entre 0 y 100.")
+    bloque = _entero(params, "bloque", FILAS_POR_BLOQUE)
+    if not 1 <= bloque <= FILAS_POR_SHARD:
+        raise ValueError(f"'bloque' debe estar entre 1 y {FILAS_POR_SHARD}.")
+    spec = Especificacion.desde_dict({
+        "categorias": {categoria: {
+            "columnas": _lista(params, "columnas"),
+            "requires": {k: _entero(params, k) for k in catalogos if k in params},
+            "unicas": _lista(params, "unicas"),
+        }},
+        "cantidad": _entero(params, "cantidad", 200),
+        "idioma": params.get("idioma", "es_CO"),
+        "sucios": {"porcentaje": porcentaje,
+                   **{t: _booleano(params, t, True) for t in TIPOS_SUCIEDAD}},
+        "semilla": _entero(params, "semilla"),
+        "fecha_referencia": params.get("fecha_referencia"),
+        "tamano_bloque": bloque,
+    })
+    if spec.categorias[0].columnas == []:
+        raise ValueError("No hay columnas activas en la categoría.")
+    for key, n in spec.categorias[0].requires.items():
+        if not REQUIRES_MIN <= n <= REQUIRES_MAX:
+            raise ValueError(f"{key} debe estar entre {REQUIRES_MIN} y {REQUIRES_MAX}.")
+    # todos los bloques deben compartir semilla y fecha: se fijan aquí
+    spec.resolver_semilla()
+    return spec, bloque
+
+
+def descripcion() -> dict:
+    """Lo que devuelve ``/``: categorías, columnas, catálogos e idiomas."""
+    return {
+        "categorias": {
+            nombre: {
+                "columnas": entrada["columns"],
+                "catalogos": {k: len(opciones[k]) for k in entrada["requires"]},
+                "unicas": list(entrada.get("faker", {})),
+            }
+            for nombre, entrada in config.items()
+        },
+        "idiomas": IDIOMAS,
+        "formatos": list(FORMATOS),
+        "limites": {"catalogos": [REQUIRES_MIN, REQUIRES_MAX], "bloque": FILAS_POR_SHARD},
+    }
+
+
+# ===========================
+# Trabajadores
+# ===========================
+
+def _iniciar_trabajador(definiciones):
+    # Con "spawn" el proceso no hereda las categorías del usuario: se recompilan
+    for definicion in definiciones.values():
+        registrar_categoria(definicion)
+
+
+def generar_trozo(spec: Especificacion, i_bloque: int, tamano: int, formato: str) -> bytes:
+    """El bloque ``i_bloque`` de la respuesta, ya codificado.
+
+    Se genera como si continuara un dataset de ``i_bloque`` bloques (ver
+    ``motor.generar_bloques``): shards, semillas, claves y columnas únicas
+    siguen la numeración, así que no depende de los otros bloques.
+    """
+    categoria = spec.categorias[0].nombre
+    filas = i_bloque * tamano
+    parte = replace(spec, cantidad=min(tamano, spec.cantidad - filas), procesos=1)
+    inicio = {categoria: {"filas": filas, "shards": i_bloque, "bloques": i_bloque}}
+    (_, df), = generar_bloques(parte, tamano_bloque=tamano, inicio=inicio)
+    texto = texto_csv(df, encabezado=i_bloque == 0) if formato == "csv" else texto_jsonl(df)
+    return texto.encode("utf-8")
+
+
+# ===========================
+# Servidor
+# ===========================
+
+class Servidor:
+    def __init__(self, host=HOST, puerto=PUERTO, procesos=None, max_clientes=MAX_CLIENTES,
+                 max_en_espera=MAX_EN_ESPERA, adelanto=ADELANTO):
+        self.host = host
+        self.puerto = puerto
+        self.procesos = procesos or os.cpu_count() or 1
+        self.max_clientes = max_clientes
+        self.max_en_espera = max_en_espera
+        self.adelanto = max(1, adelanto)
+        self._pool = None
+        self._cupos = None
+        self._en_espera = 0
+
+    async def servir(self):
+        self._pool = ProcessPoolExecutor(self.procesos, initializer=_iniciar_trabajador,
+                                         initargs=(definiciones_usuario(),))
+        self._cupos = asyncio.Semaphore(self.max_clientes)
+        try:
+            servidor = await asyncio.start_server(self._atender, self.host, self.puerto)
+            async with servidor:
+                puertos = ", ".join(f"http://{s.getsockname()[0]}:{s.getsockname()[1]}" for s in servidor.sockets)
+                print(f"Sirviendo en {puertos} ({self.procesos} procesos, {self.max_clientes} clientes)",
+                      flush=True)
+                await servidor.serve_forever()
+        finally:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    async def _leer_linea(reader) -> bytes:
+        try:
+            return await reader.readline()
+        except ValueError:  # más larga que el límite del StreamReader
+            raise ErrorHTTP(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Línea de petición demasiado larga.")
+
+    async def _leer_peticion(self, reader):
+        linea = await self._leer_linea(reader)
+        try:
+            metodo, destino, _ = linea.decode("latin-1").split(" ", 2)
+        except ValueError:
+            raise ErrorHTTP(HTTPStatus.BAD_REQUEST, "Petición HTTP mal formada.")
+        for _ in range(MAX_ENCABEZADOS):
+            if (await self._leer_linea(reader)).strip() == b"":
+                return metodo, destino
+        raise ErrorHTTP(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Demasiados encabezados.")
+
+    async def _atender(self, reader, writer):
+        try:
+            try:
+                metodo, destino = await asyncio.wait_for(self._leer_peticion(reader), TIEMPO_PETICION)
+                if metodo != "GET":
+                    raise ErrorHTTP(HTTPStatus.METHOD_NOT_ALLOWED, "Solo se admite GET.")
+                partes = urlsplit(destino)
+                ruta = unquote(partes.path).strip("/")
+                if ruta in ("", "categorias"):
+                    await self._responder_json(writer, HTTPStatus.OK, descripcion())
+                    return
+                categoria, _, formato = ruta.rpartition(".")
+                if categoria not in config or formato not in FORMATOS:
+                    raise ErrorHTTP(HTTPStatus.NOT_FOUND,
+                                    f"No existe {ruta}: usa /<Categoria>.csv o /<Categoria>.jsonl.")
+                spec, tamano = especificacion_consulta(categoria, partes.query)
+            except ValueError as e:
+                raise ErrorHTTP(HTTPStatus.BAD_REQUEST, str(e))
+            except asyncio.TimeoutError:
+                raise ErrorHTTP(HTTPStatus.REQUEST_TIMEOUT, "La petición no llegó completa.")
+
+            if self._cupos.locked() and self._en_espera >= self.max_en_espera:
+                raise ErrorHTTP(HTTPStatus.SERVICE_UNAVAILABLE, "Servidor ocupado; reintenta más tarde.")
+            self._en_espera += 1
+            try:
+                await self._cupos.acquire()
+            finally:
+                self._en_espera -= 1
+            try:
+                await self._transmitir(writer, spec, formato, tamano)
+            finally:
+                self._cupos.release()
+        except ErrorHTTP as e:
+            try:
+                await self._responder_json(writer, e.estado, {"error": str(e)})
+            except ConnectionError:
+                pass
+        except ConnectionError:
+            pass  # el cliente cerró la conexión: se descarta lo que faltaba
+        finally:
+            writer.close()
+
+    async def _enviar_encabezados(self, writer, estado: HTTPStatus, encabezados: dict):
+        lineas = [f"HTTP/1.1 {estado.value} {estado.phrase}"]
+        lineas += [f"{k}: {v}" for k, v in {**encabezados, "Connection": "close"}.items()]
+        writer.write(("\r\n".join(lineas) + "\r\n\r\n").encode("latin-1"))
+        await writer.drain()
+
+    async def _responder_json(self, writer, estado: HTTPStatus, datos: dict):
+        cuerpo = json.dumps(datos, ensure_ascii=False, indent=2).encode("utf-8")
+        encabezados = {"Content-Type": "application/json; charset=utf-8", "Content-Length": len(cuerpo)}
+        if estado == HTTPStatus.SERVICE_UNAVAILABLE:
+            encabezados["Retry-After"] = 5
+        await self._enviar_encabezados(writer, estado, encabezados)
+        writer.write(cuerpo)
+        await writer.drain()
+
+    async def _transmitir(self, writer, spec, formato: str, tamano: int):
+        """Envía los bloques en orden, con a lo sumo ``adelanto`` generándose a la vez."""
+        loop = asyncio.get_running_loop()
+        n_bloques = -(-spec.cantidad // tamano)
+        await self._enviar_encabezados(writer, HTTPStatus.OK, {
+            "Content-Type": FORMATOS[formato],
+            "Transfer-Encoding": "chunked",
+            "X-Filas": spec.cantidad,
+            "X-Semilla": spec.semilla,
+            "X-Fecha-Referencia": spec.fecha_referencia,
+        })
+        pendientes = deque()
+        siguiente = 0
+        try:
+            while siguiente < n_bloques or pendientes:
+                while siguiente < n_bloques and len(pendientes) < self.adelanto:
+                    pendientes.append(loop.run_in_executor(self._pool, generar_trozo,
+                                                           spec, siguiente, tamano, formato))
+                    siguiente += 1
+                datos = await pendientes.popleft()
+                if datos:  # un trozo vacío terminaría la respuesta
+                    writer.write(b"%x\r\n%s\r\n" % (len(datos), datos))
+                    # si el cliente lee más lento, se espera antes de pedir más bloques
+                    await writer.drain()
+            writer.write(b"0\r\n\r\n")
+            await writer.drain()
+        except ConnectionError:
+            raise
+        except Exception as e:
+            # los encabezados ya salieron: la respuesta queda truncada (sin trozo final)
+            print(f"Error generando {spec.categorias[0].nombre}: {e}", file=sys.stderr)
+            raise ConnectionError() from e
+        finally:
+            for futuro in pendientes:
+                futuro.cancel()
+
+
+# ===========================
+# Línea de comandos
+# ===========================
+
+def construir_parser():
+    p = argparse.ArgumentParser(
+        prog="python -m generador.servidor",
+        description="Servicio HTTP local que genera las categorías como CSV o JSON Lines en streaming.",
+    )
+    p.add_argument("--host", default=HOST, help=f"interfaz donde escuchar (por defecto {HOST})")
+    p.add_argument("--puerto", type=int, default=PUERTO, help=f"puerto (por defecto {PUERTO})")
+    p.add_argument("-p", "--procesos", type=int, help="procesos de generación (por defecto, uno por núcleo)")
+    p.add_argument("--max-clientes", type=int, default=MAX_CLIENTES,
+                   help="descargas simultáneas; las demás esperan turno")
+    p.add_argument("--max-en-espera", type=int, default=MAX_EN_ESPERA,
+                   help="descargas en espera antes de responder 503")
+    p.add_argument("-e", "--esquemas", action="append", default=[], metavar="RUTA",
+                   help="archivo o carpeta con categorías definidas por el usuario (repetible)")
+    return p
+
+
+def main(argv=None):
+    args = construir_parser().parse_args(argv)
+    try:
+        cargar_categorias_entorno()
+        cargar_categorias(*args.esquemas)
+        if args.procesos is not None and args.procesos < 1:
+            raise ValueError("El número de procesos debe ser al menos 1.")
+        if args.max_clientes < 1 or args.max_en_espera < 0:
+            raise ValueError("--max-clientes debe ser al menos 1 y --max-en-espera no puede ser negativo.")
+        servidor = Servidor(args.host, args.puerto, args.procesos, args.max_clientes, args.max_en_espera)
+        asyncio.run(servidor.servir())
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
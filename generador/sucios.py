@@ -0,0 +1,212 @@
+"""Inyección de datos sucios para practicar limpieza.
+
+Cada tipo de suciedad sortea de una vez todas las filas y columnas afectadas
+(arreglos de índices) y modifica cada columna con operaciones sobre arreglos,
+en lugar de tocar el DataFrame celda por celda. Las columnas categóricas
+siguen siéndolo: solo cambian los códigos y, si el ruido crea valores
+nuevos, se agregan como categorías.
+"""
+
+import numpy as np
+import pandas as pd
+
+BASURA = np.array(["@@@", "***", "###"], dtype=object)
+FACTORES_OUTLIER = np.array([10, 25, 50])
+
+
+def _es_categorica(arr) -> bool:
+    return isinstance(arr, pd.Categorical)
+
+
+def _es_texto(arr: np.ndarray) -> bool:
+    return _es_categorica(arr) or arr.dtype == object
+
+
+def _es_numerica(arr: np.ndarray) -> bool:
+    return arr.dtype.kind in "iuf"
+
+
+def _sortear(rng, n_filas: int, n_columnas: int, k: int):
+    """k pares (fila, índice de columna) al azar."""
+    return rng.integers(0, n_filas, k), rng.integers(0, n_columnas, k)
+
+
+def _anular(arr: np.ndarray, filas: np.ndarray) -> np.ndarray:
+    if _es_categorica(arr):
+        arr[filas] = np.nan  # código -1
+        return arr
+    if arr.dtype.kind in "iub":
+        # como pandas al asignar None en una columna entera: pasa a float
+        arr = arr.astype(float)
+    if arr.dtype.kind == "f":
+        arr[filas] = np.nan
+    elif arr.dtype.kind == "M":
+        arr[filas] = np.datetime64("NaT")
+    else:
+        arr[filas] = None
+    return arr
+
+
+def _asignar(arr, filas: np.ndarray, valores):
+    """``arr[filas] = valores``; en una categórica agrega antes las categorías nuevas."""
+    if _es_categorica(arr):
+        valores = np.asarray(valores, dtype=object)
+        nuevas = pd.Index(pd.unique(valores)).dropna().difference(arr.categories)
+        if len(nuevas):
+            arr = arr.add_categories(nuevas)
+    arr[filas] = valores
+    return arr
+
+
+def _ruido(valores: np.ndarray, variantes: np.ndarray, basura: np.ndarray, es_email: bool) -> np.ndarray:
+    """Espacios, mayúsculas raras, caracteres basura o '@' eliminado (emails)."""
+    s = pd.Series(valores, dtype=object).astype(str)
+    out = s.copy()
+    m = variantes == 0
+    out[m] = "  " + s[m] + "   "
+    m = variantes == 1
+    out[m] = s[m].str.swapcase()
+    m = variantes == 2
+    out[m] = s[m] + basura[m]
+    m = variantes == 3
+    if es_email:
+        out[m] = s[m].str.replace("@", "", regex=False)  # email inválido
+    return out.to_numpy(dtype=object)
+
+
+def _copias_no_numericas(prev, numericos, src, dst, dst_locales):
+    """(filas, valores) de los duplicados cuyo origen previo no es numérico.
+
+    Solo cuenta la última copia de cada fila destino y no las que pisa
+    después un duplicado local, igual que la asignación en orden.
+    """
+    ultima = len(dst) - 1 - np.unique(dst[::-1], return_index=True)[1]
+    ultima = ultima[~np.isin(dst[ultima], dst_locales)]
+    originales = prev[src[ultima]]
+    texto = pd.isna(numericos[src[ultima]]) & pd.notna(originales)
+    return dst[ultima][texto], originales[texto]
+
+
+def aplicar_datos_sucios(df: pd.DataFrame, porcentaje: int,
+                         habilitar_nulos=True,
+                         habilitar_duplicados=True,
+                         habilitar_ruido_texto=True,
+                         habilitar_outliers=True,
+                         habilitar_tipos_erroneos=True,
+                         rng=None,
+                         previas: pd.DataFrame = None,
+                         excluir=()):
+    """Devuelve una copia de ``df`` con suciedad; las columnas de ``excluir``
+    (p. ej. claves primarias/foráneas) quedan intactas."""
+    if porcentaje <= 0 or df.empty:
+        return df
+
+    rng = rng if rng is not None else np.random.default_rng()
+    n = len(df)
+    nombres = [c for c in df.columns if c not in set(excluir)]
+    if not nombres:
+        return df
+    datos = {c: df[c].array.copy() if isinstance(df[c].dtype, pd.CategoricalDtype) else df[c].to_numpy(copy=True)
+             for c in nombres}
+    filas_afectadas = max(1, int(n * porcentaje / 100))
+
+    # 1) Nulos
+    if habilitar_nulos:
+        filas, cols = _sortear(rng, n, len(nombres), filas_afectadas)
+        for j, c in enumerate(nombres):
+            sel = filas[cols == j]
+            if len(sel):
+                datos[c] = _anular(datos[c], sel)
+
+    # 2) Duplicados (copiamos filas aleatorias encima de otras; con ``previas``
+    #    la fila origen también puede venir de bloques ya emitidos)
+    n_prev = 0 if previas is None else len(previas)
+    pendientes = {}  # {columna: (filas, valores)} no numéricos copiados de bloques previos
+    if habilitar_duplicados and n + n_prev > 1:
+        k = filas_afectadas // 3 + 1
+        src = rng.integers(0, n_prev + n, k)
+        dst = rng.integers(0, n, k)
+        de_previas = src < n_prev
+        for c in nombres:
+            arr = datos[c]
+            locales = arr[src[~de_previas] - n_prev]
+            if _es_categorica(arr):
+                if de_previas.any():
+                    arr = _asignar(arr, dst[de_previas], previas[c].to_numpy()[src[de_previas]])
+                    locales = locales.set_categories(arr.categories)
+                arr[dst[~de_previas]] = locales
+                datos[c] = arr
+                continue
+            if de_previas.any():
+                prev = previas[c].to_numpy()
+                if _es_numerica(arr) and not _es_numerica(prev):
+                    # la columna sigue numérica para outliers y tipos erróneos; los
+                    # "???" copiados de bloques previos se reponen tal cual al final
+                    numericos = pd.to_numeric(prev, errors="coerce")
+                    pendientes[c] = _copias_no_numericas(prev, numericos, src[de_previas],
+                                                         dst[de_previas], dst[~de_previas])
+                    prev = numericos
+                if prev.dtype != arr.dtype:
+                    arr = arr.astype(np.result_type(arr.dtype, prev.dtype))
+                arr[dst[de_previas]] = prev[src[de_previas]]
+            arr[dst[~de_previas]] = locales
+            datos[c] = arr
+
+    # 3) Ruido en texto (espacios, mayúsculas raras, caracteres)
+    if habilitar_ruido_texto:
+        text_cols = [c for c in nombres if _es_texto(datos[c])]
+        if text_cols:
+            k = max(1, filas_afectadas // 2)
+            filas, cols = _sortear(rng, n, len(text_cols), k)
+            variantes = rng.integers(0, 4, k)
+            basura = BASURA[rng.integers(0, len(BASURA), k)]
+            for j, c in enumerate(text_cols):
+                m = cols == j
+                sel = filas[m]
+                valores = datos[c][sel]
+                validos = pd.notna(valores)
+                if not validos.any():
+                    continue
+                datos[c] = _asignar(datos[c], sel[validos],
+                                    _ruido(valores[validos], variantes[m][validos],
+                                           basura[m][validos], "email" in c.lower()))
+
+    # 4) Outliers numéricos
+    if habilitar_outliers:
+        num_cols = [c for c in nombres if _es_numerica(datos[c])]
+        if num_cols:
+            k = max(1, filas_afectadas // 2)
+            filas, cols = _sortear(rng, n, len(num_cols), k)
+            factores = FACTORES_OUTLIER[rng.integers(0, len(FACTORES_OUTLIER), k)]
+            for j, c in enumerate(num_cols):
+                m = cols == j
+                sel = filas[m]
+                base = datos[c][sel]
+                validos = ~np.isnan(base) if base.dtype.kind == "f" else np.ones(len(sel), bool)
+                datos[c][sel[validos]] = base[validos].astype(np.int64) * factores[m][validos]
+
+    # 5) Tipos erróneos en columnas numéricas
+    if habilitar_tipos_erroneos:
+        num_cols = [c for c in nombres if _es_numerica(datos[c])]
+        if num_cols:
+            k = max(1, filas_afectadas // 3)
+            filas, cols = _sortear(rng, n, len(num_cols), k)
+            for j, c in enumerate(num_cols):
+                sel = filas[cols == j]
+                if len(sel):
+                    arr = datos[c].astype(object)
+                    arr[sel] = "???"
+                    datos[c] = arr
+
+    # 6) Copias no numéricas de bloques previos, salvo donde otra etapa ya escribió
+    for c, (filas, valores) in pendientes.items():
+        libres = pd.isna(datos[c][filas])
+        if libres.any():
+            arr = datos[c].astype(object)
+            arr[filas[libres]] = valores[libres]
+            datos[c] = arr
+
+    for c in excluir:
+        if c in df.columns:
+            datos[c] = df[c].to_numpy()
+    return pd.DataFrame(datos, index=df.index, columns=list(df.columns))
@@ -1,111 +1,32 @@
 import os
-import sys
-import json
-import random
-import sqlite3
 import platform
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
-import pandas as pd
-from faker import Faker
+from generador import IDIOMAS, opciones, config, FORMATOS
+from generador.cache import entradas as entradas_cache, purgar as purgar_cache
+from generador.categorias import cargar_categorias, cargar_categorias_entorno
+from generador.corrida import Cancelado, categorias_activas, ejecutar_corrida
+from generador.exportar import EXTENSIONES, POR_CATEGORIA, ESCRITORES_POR_BLOQUES, fechas_a_texto
+from generador.instrumentacion import Medidor, resumen
+from generador.motor import (
+    REQUIRES_MIN,
+    REQUIRES_MAX,
+    FILAS_POR_SHARD,
+    FILAS_MUESTRA,
+    OpcionesSucias,
+    EspecCategoria,
+    Especificacion,
+    generar_muestra,
+)
 
 import ttkbootstrap as tb
 from ttkbootstrap.constants import *
 from tkinter import filedialog, messagebox, Canvas, BOTH, RIGHT, LEFT, Y, X, BOTTOM, NW, HORIZONTAL, VERTICAL
 
-# =========================
-# Configuración de dominio
-# =========================
-
-IDIOMAS = {
-    "Español (CO)": "es_CO",
-    "Inglés (US)": "en_US",
-    "Francés (FR)": "fr_FR",
-    "Alemán (DE)": "de_DE",
-    "Portugués (BR)": "pt_BR",
-}
-
-# Opciones globales
-opciones = {
-    "Productos": ["Café", "Té", "Pan", "Leche", "Queso", "Arepa", "Chocolate", "Yogurt", "Mantequilla", "Galletas"],
-    "Ciudades": ["Bogotá", "Medellín", "Cali", "Barranquilla", "Cartagena",
-                 "Bucaramanga", "Pereira", "Santa Marta", "Cúcuta", "Manizales",
-                 "Neiva", "Villavicencio", "Armenia", "Ibagué", "Popayán",
-                 "Montería", "Sincelejo", "Riohacha", "Quibdó", "Tunja"],
-    "Departamentos": ["Ventas", "TI", "Recursos Humanos", "Logística", "Marketing", "Finanzas", "Producción"],
-    "Rutas": ["Ruta A", "Ruta B", "Ruta C", "Ruta D", "Ruta E", "Ruta F", "Ruta G"],
-    "Géneros": ["Novela", "Ciencia Ficción", "Historia", "Infantil", "Fantasía", "Poesía", "Ensayo", "Drama"],
-    "Autores": ["Gabo", "Orwell", "Rowling", "Cervantes", "Huxley", "Tolstoi", "Shakespeare", "Borges"]
-}
-
-# Catálogo de categorías
-config = {
-    "Ventas": {
-        "columns": ["Fecha", "Producto", "Cantidad", "Precio_unitario"],
-        "requires": ["Productos"],
-        "generator": lambda fake, choices: [
-            fake.date_between(start_date="-30d", end_date="today"),
-            random.choice(choices["Productos"]),
-            random.randint(1, 10),
-            random.randint(1000, 5000)
-        ]
-    },
-    "Biblioteca": {
-        "columns": ["Usuario", "Género", "Autor", "Días_prestamo", "Email"],
-        "requires": ["Géneros", "Autores"],
-        "generator": lambda fake, choices: [
-            fake.first_name(),
-            random.choice(choices["Géneros"]),
-            random.choice(choices["Autores"]),
-            random.randint(2, 14),
-            fake.email()
-        ]
-    },
-    "Clientes": {
-        "columns": ["Nombre", "Ciudad", "Edad", "Email"],
-        "requires": ["Ciudades"],
-        "generator": lambda fake, choices: [
-            fake.name(),
-            random.choice(choices["Ciudades"]),
-            random.randint(18, 65),
-            fake.email()
-        ]
-    },
-    "Inventario": {
-        "columns": ["Producto", "Categoría", "Stock", "Precio"],
-        "requires": [],
-        "generator": lambda fake, choices: [
-            random.choice(["Café", "Azúcar", "Leche", "Arroz", "Aceite", "Harina", "Chocolate"]),
-            random.choice(["Bebidas", "Aseo", "Alimentos", "Tecnología"]),
-            random.randint(0, 100),
-            random.randint(1000, 50000)
-        ]
-    },
-    "Empleados": {
-        "columns": ["Nombre", "Departamento", "Salario", "Años_empresa", "Estado", "Email"],
-        "requires": ["Departamentos"],
-        "generator": lambda fake, choices: [
-            fake.name(),
-            random.choice(choices["Departamentos"]),
-            random.randint(1_000_000, 6_000_000),
-            random.randint(1, 20),
-            random.choice(["Activo", "Inactivo"]),
-            fake.company_email()
-        ]
-    },
-    "Viajes": {
-        "columns": ["Fecha", "Ruta", "Pasajeros", "Tarifa"],
-        "requires": ["Rutas"],
-        "generator": lambda fake, choices: [
-            fake.date_between(start_date="-15d", end_date="today"),
-            random.choice(choices["Rutas"]),
-            random.randint(5, 50),
-            random.randint(2000, 8000)
-        ]
-    }
-}
-
 # ===============
 # Utilitarios
 # ===============
@@ -124,88 +45,11 @@ def abrir_carpeta(path: str):
     except Exception as e:
         messagebox.showerror("Error", f"No se pudo abrir la carpeta:\n{e}")
 
-def asegurar_lista_unica(lst, n):
-    """Devuelve los primeros n elementos (o todos si n>len) sin fallar."""
-    return lst[:max(0, min(n, len(lst)))]
-
-def aplicar_datos_sucios(df: pd.DataFrame, porcentaje: int,
-                         habilitar_nulos=True,
-                         habilitar_duplicados=True,
-                         habilitar_ruido_texto=True,
-                         habilitar_outliers=True,
-                         habilitar_tipos_erroneos=True):
-    if porcentaje <= 0 or df.empty:
-        return df
-
-    filas_afectadas = max(1, int(len(df) * porcentaje / 100))
-
-    # 1) Nulos
-    if habilitar_nulos:
-        for _ in range(filas_afectadas):
-            r = random.randrange(len(df))
-            c = random.choice(df.columns)
-            df.iat[r, df.columns.get_loc(c)] = None
-
-    # 2) Duplicados (copiamos filas aleatorias encima de otras)
-    if habilitar_duplicados and len(df) > 1:
-        for _ in range(filas_afectadas // 3 + 1):
-            src = df.sample(1).iloc[0]
-            dst = random.randrange(len(df))
-            df.loc[df.index[dst]] = src
-
-    # 3) Ruido en texto (espacios, mayúsculas raras, caracteres)
-    if habilitar_ruido_texto:
-        text_cols = [c for c in df.columns if df[c].dtype == object]
-        ruido_samples = max(1, filas_afectadas // 2)
-        for _ in range(ruido_samples):
-            if not text_cols:
-                break
-            c = random.choice(text_cols)
-            r = random.randrange(len(df))
-            val = df.at[df.index[r], c]
-            if val is None:
-                continue
-            s = str(val)
-            # Variantes de suciedad
-            choice = random.choice(["spaces", "caps", "garbage", "email_break"])
-            if choice == "spaces":
-                s = "  " + s + "   "
-            elif choice == "caps":
-                s = s.swapcase()
-            elif choice == "garbage":
-                s = s + random.choice(["@@@", "***", "###"])
-            elif choice == "email_break" and "email" in c.lower():
-                s = s.replace("@", "")  # email inválido
-            df.at[df.index[r], c] = s
-
-    # 4) Outliers numéricos
-    if habilitar_outliers:
-        num_cols = [c for c in df.columns if pd.api.types.is_numeric_dtype(df[c])]
-        out_samples = max(1, filas_afectadas // 2)
-        for _ in range(out_samples):
-            if not num_cols:
-                break
-            c = random.choice(num_cols)
-            r = random.randrange(len(df))
-            base = df.at[df.index[r], c]
-            if pd.isna(base):
-                continue
-            factor = random.choice([10, 25, 50])
-            df.at[df.index[r], c] = int(base) * factor
-
-    # 5) Tipos erróneos en columnas numéricas
-    if habilitar_tipos_erroneos:
-        num_cols = [c for c in df.columns if pd.api.types.is_numeric_dtype(df[c])]
-        err_samples = max(1, filas_afectadas // 3)
-        for _ in range(err_samples):
-            if not num_cols:
-                break
-            c = random.choice(num_cols)
-            r = random.randrange(len(df))
-            df.at[df.index[r], c] = "???"
-
-    return df
-
+# Cada cuánto (ms) el hilo principal revisa el progreso del hilo de trabajo
+INTERVALO_SONDEO = 100
+# Vista previa: espera (ms) tras el último cambio y sondeo de su resultado
+RETARDO_VISTA_PREVIA = 250
+INTERVALO_VISTA_PREVIA = 20
 
 # ===========================
 # Clase principal de la app
@@ -216,13 +60,14 @@ class App:
         self.root = root
         self.root.title("Generador Avanzado de Datos para Análisis")
         self.root.geometry("920x720")
-        self.fake = Faker("es_CO")
 
         # Estado
-        self.historial = []  # lista de (fecha, ruta, formato, categorias)
+        self.historial = []  # lista de (fecha, ruta, formato, categorias, semilla, fecha_referencia, informe)
         self.check_categorias = {}        # {categoria: IntVar}
         self.column_vars = {}             # {categoria: {col: IntVar}}
+        self.unica_vars = {}              # {categoria: {col: IntVar}} columnas sin repetidos
         self.requires_spin = {}           # {categoria: {require_key: Spinbox}}
+        self.cantidad_cat_vars = {}       # {categoria: StringVar} (vacío = cantidad global)
         self.cantidad_var = tb.StringVar(value="200")
         self.formato_var = tb.StringVar(value="Excel")
         self.idioma_var = tb.StringVar(value="Español (CO)")
@@ -233,9 +78,44 @@ class App:
         self.chk_ruido = tb.BooleanVar(value=True)
         self.chk_outliers = tb.BooleanVar(value=True)
         self.chk_tipos = tb.BooleanVar(value=True)
+        self.semilla_var = tb.StringVar(value="")
+        self.fecha_ref_var = tb.StringVar(value="")
+        self.medir_var = tb.BooleanVar(value=False)
+        self.relacional_var = tb.BooleanVar(value=False)
+        self.anexar_var = tb.BooleanVar(value=False)
+        self.cache_var = tb.BooleanVar(value=False)
+        self.sesgo_var = tb.DoubleVar(value=0.0)
+        self.cobertura_var = tb.IntVar(value=100)
         self.ultima_ruta = ""
 
+        # Trabajo en segundo plano: un solo hilo; el progreso llega por una cola
+        self._ejecutor = ThreadPoolExecutor(max_workers=1)
+        self._cola = queue.Queue()
+        self._cancelar = threading.Event()
+        self._futuro = None
+        self._en_curso = None             # (spec, categorias, medidor) de la corrida en marcha
+        self.progreso_var = tb.DoubleVar(value=0)
+        self.estado_var = tb.StringVar(value="Listo.")
+
+        # Vista previa: se calcula en el mismo hilo de trabajo, nunca a la vez que una corrida
+        self._vista = {}                  # {categoria: DataFrame de muestra}
+        self._vista_id = None             # after() pendiente (debounce)
+        self._vista_futuro = None
+        self._vista_pendiente = False     # hubo cambios mientras el hilo estaba ocupado
+        self.vista_cat_var = tb.StringVar(value="")
+        self.vista_estado_var = tb.StringVar(value="Selecciona una categoría para ver una muestra.")
+
+        # Categorías del usuario en $GENERADOR_CATEGORIAS (antes de armar la UI)
+        error_categorias = None
+        try:
+            cargar_categorias_entorno()
+        except ValueError as e:
+            error_categorias = str(e)
+
         self._construir_ui()
+        self.root.protocol("WM_DELETE_WINDOW", self._al_cerrar)
+        if error_categorias:
+            messagebox.showerror("Error", f"No se pudieron cargar las categorías del usuario:\n{error_categorias}")
 
     # ------------- UI --------------
 
@@ -253,13 +133,24 @@ class App:
         tb.Entry(top, textvariable=self.cantidad_var, width=8).pack(side=LEFT)
 
         tb.Label(top, text="Exportar como:", font=("", 10, "bold")).pack(side=LEFT, padx=(16, 6))
-        self.combo_formato = tb.Combobox(top, values=["CSV", "Excel", "JSON", "SQL"],
+        self.combo_formato = tb.Combobox(top, values=FORMATOS,
                                          textvariable=self.formato_var, width=10, state="readonly")
         self.combo_formato.pack(side=LEFT)
 
-        tb.Button(top, text="Generar y Exportar", bootstyle=SUCCESS, command=self.generar_exportar).pack(side=RIGHT)
+        self.btn_generar = tb.Button(top, text="Generar y Exportar", bootstyle=SUCCESS, command=self.generar_exportar)
+        self.btn_generar.pack(side=RIGHT)
         tb.Button(top, text="Abrir carpeta", bootstyle=INFO, command=lambda: abrir_carpeta(self.ultima_ruta)).pack(side=RIGHT, padx=8)
 
+        # Barra de progreso (abajo)
+        barra = tb.Frame(self.root)
+        barra.pack(side=BOTTOM, fill=X, padx=12, pady=(0, 10))
+        self.btn_cancelar = tb.Button(barra, text="Cancelar", bootstyle=DANGER,
+                                      command=self.cancelar, state="disabled")
+        self.btn_cancelar.pack(side=RIGHT)
+        tb.Progressbar(barra, variable=self.progreso_var, maximum=100,
+                       bootstyle=SUCCESS).pack(side=RIGHT, fill=X, expand=True, padx=8)
+        tb.Label(barra, textvariable=self.estado_var, width=36).pack(side=LEFT)
+
         # Notebook
         nb = tb.Notebook(self.root)
         nb.pack(fill=BOTH, expand=True, padx=12, pady=(0, 12))
@@ -280,9 +171,17 @@ class App:
         self._construir_tab_avanzadas()
         self._construir_tab_historial()
 
+        # La vista previa sigue también a las opciones que cambian los datos
+        for var in (self.idioma_var, self.datos_sucios_var, self.porc_sucios_var, self.chk_nulos,
+                    self.chk_dups, self.chk_ruido, self.chk_outliers, self.chk_tipos, self.semilla_var,
+                    self.fecha_ref_var, self.relacional_var, self.sesgo_var, self.cobertura_var):
+            var.trace_add("write", self._programar_vista_previa)
+
     def _construir_tab_seleccion(self):
-        wrapper = tb.Frame(self.tab_sel)
-        wrapper.pack(fill=BOTH, expand=True)
+        paneles = tb.Panedwindow(self.tab_sel, orient=VERTICAL)
+        paneles.pack(fill=BOTH, expand=True)
+        wrapper = tb.Frame(paneles)
+        paneles.add(wrapper, weight=3)
 
         # Panel izquierdo: categorías
         left = tb.Labelframe(wrapper, text="Categorías", padding=10)
@@ -298,17 +197,16 @@ class App:
             lambda e: canvas_left.configure(scrollregion=canvas_left.bbox("all"))
         )
         canvas_left.create_window((0, 0), window=frame_left_inner, anchor=NW)
-        canvas_left.configure(yscrollcommand=scroll_y.set, width=220, height=520)
+        canvas_left.configure(yscrollcommand=scroll_y.set, width=220, height=320)
 
+        tb.Button(left, text="Cargar categorías…", bootstyle=(SECONDARY, OUTLINE),
+                  command=self._cargar_categorias).pack(side=BOTTOM, fill=X, pady=(8, 0))
         canvas_left.pack(side=LEFT, fill=Y, expand=False)
         scroll_y.pack(side=RIGHT, fill=Y)
 
+        self.frame_categorias = frame_left_inner
         for cat in config.keys():
-            var = tb.IntVar(value=0)
-            cb = tb.Checkbutton(frame_left_inner, text=cat, variable=var,
-                                command=lambda c=cat: self._on_toggle_categoria(c))
-            cb.pack(anchor="w", pady=2)
-            self.check_categorias[cat] = var
+            self._agregar_check_categoria(cat)
 
         # Panel derecho: columnas + requires
         right = tb.Labelframe(wrapper, text="Columnas y Opciones por Categoría", padding=10)
@@ -329,6 +227,61 @@ class App:
         self.canvas_right.pack(side=LEFT, fill=BOTH, expand=True)
         self.scroll_y_right.pack(side=RIGHT, fill=Y)
 
+        self._construir_vista_previa(paneles)
+
+    def _construir_vista_previa(self, paneles):
+        vista = tb.Labelframe(paneles, text=f"Vista previa (primeras {FILAS_MUESTRA} filas, con datos sucios)",
+                              padding=8)
+        paneles.add(vista, weight=2)
+
+        barra = tb.Frame(vista)
+        barra.pack(fill=X, pady=(0, 6))
+        tb.Label(barra, text="Categoría:").pack(side=LEFT)
+        self.combo_vista = tb.Combobox(barra, textvariable=self.vista_cat_var, width=18, state="readonly")
+        self.combo_vista.pack(side=LEFT, padx=6)
+        self.combo_vista.bind("<<ComboboxSelected>>", lambda e: self._mostrar_vista_previa())
+        tb.Label(barra, textvariable=self.vista_estado_var).pack(side=LEFT, padx=10)
+
+        scroll_x = tb.Scrollbar(vista, orient=HORIZONTAL)
+        scroll_x.pack(side=BOTTOM, fill=X)
+        marco = tb.Frame(vista)
+        marco.pack(fill=BOTH, expand=True)
+        self.tabla_vista = tb.Treeview(marco, show="headings", height=8)
+        scroll_y = tb.Scrollbar(marco, orient=VERTICAL, command=self.tabla_vista.yview)
+        scroll_x.configure(command=self.tabla_vista.xview)
+        self.tabla_vista.configure(yscrollcommand=scroll_y.set, xscrollcommand=scroll_x.set)
+        self.tabla_vista.pack(side=LEFT, fill=BOTH, expand=True)
+        scroll_y.pack(side=RIGHT, fill=Y)
+
+    def _agregar_check_categoria(self, cat: str):
+        var = tb.IntVar(value=0)
+        cb = tb.Checkbutton(self.frame_categorias, text=cat, variable=var,
+                            command=lambda c=cat: self._on_toggle_categoria(c))
+        cb.pack(anchor="w", pady=2)
+        self.check_categorias[cat] = var
+
+    def _cargar_categorias(self):
+        rutas = filedialog.askopenfilenames(
+            title="Archivos de categorías",
+            filetypes=[("Esquemas de categoría", "*.json *.yaml *.yml")],
+        )
+        if not rutas:
+            return
+        try:
+            nombres = cargar_categorias(*rutas)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        for cat in nombres:
+            if cat not in self.check_categorias:
+                self._agregar_check_categoria(cat)
+            elif self.check_categorias[cat].get() == 1:
+                # redefinida: rehacer su panel con las columnas nuevas
+                self._eliminar_panel_categoria(cat)
+                self._crear_panel_categoria(cat)
+        self._programar_vista_previa()
+        messagebox.showinfo("Categorías", f"Cargadas: {', '.join(nombres) or 'ninguna'}")
+
     def _construir_tab_avanzadas(self):
         f = tb.Labelframe(self.tab_adv, text="Datos Sucios (para practicar limpieza)", padding=12)
         f.pack(fill=X, padx=12, pady=12)
@@ -348,6 +301,35 @@ class App:
 
         tb.Label(self.tab_adv, text="Consejo: genera con 5–15% para ejercicios realistas.").pack(anchor="w", padx=16)
 
+        rep = tb.Labelframe(self.tab_adv, text="Reproducibilidad", padding=12)
+        rep.pack(fill=X, padx=12, pady=12)
+
+        tb.Label(rep, text="Semilla:").grid(row=0, column=0, sticky="w", pady=4)
+        tb.Entry(rep, textvariable=self.semilla_var, width=14).grid(row=0, column=1, sticky="w", padx=(6, 20))
+        tb.Label(rep, text="Fecha de referencia (AAAA-MM-DD):").grid(row=0, column=2, sticky="w")
+        tb.Entry(rep, textvariable=self.fecha_ref_var, width=12).grid(row=0, column=3, sticky="w", padx=6)
+        tb.Label(rep, text="Vacío = aleatoria / hoy. La semilla usada queda en el Historial.").grid(row=1, column=0, columnspan=4, sticky="w")
+        tb.Checkbutton(rep, text="Anexar a un dataset existente (CSV, JSONL o SQL; sigue su semilla y sus claves)",
+                       variable=self.anexar_var).grid(row=2, column=0, columnspan=4, sticky="w", pady=(8, 0))
+        tb.Checkbutton(rep, text="Reusar datasets ya generados (caché en disco; solo con semilla fija)",
+                       variable=self.cache_var).grid(row=3, column=0, columnspan=4, sticky="w", pady=(4, 0))
+
+        rel = tb.Labelframe(self.tab_adv, text="Relaciones entre categorías", padding=12)
+        rel.pack(fill=X, padx=12, pady=(0, 12))
+        tb.Checkbutton(rel, text="Agregar claves primarias y foráneas (p. ej. Ventas → Clientes, Inventario)",
+                       variable=self.relacional_var).grid(row=0, column=0, columnspan=4, sticky="w", pady=4)
+        tb.Label(rel, text="Sesgo (0 = uniforme):").grid(row=1, column=0, sticky="w")
+        tb.Scale(rel, from_=0, to=2, orient=HORIZONTAL, variable=self.sesgo_var, length=160).grid(row=1, column=1, sticky="w", padx=(6, 20))
+        tb.Label(rel, text="Cobertura de padres (%):").grid(row=1, column=2, sticky="w")
+        tb.Spinbox(rel, from_=1, to=100, textvariable=self.cobertura_var, width=6).grid(row=1, column=3, sticky="w", padx=6)
+        tb.Label(rel, text="La cantidad de filas por categoría (en su panel) fija cuántos hijos tiene cada padre.").grid(row=2, column=0, columnspan=4, sticky="w")
+
+        diag = tb.Labelframe(self.tab_adv, text="Diagnóstico", padding=12)
+        diag.pack(fill=X, padx=12, pady=(0, 12))
+        tb.Checkbutton(diag, text="Medir tiempo y memoria por etapa (la corrida es más lenta)",
+                       variable=self.medir_var).grid(row=0, column=0, sticky="w", pady=4)
+        tb.Label(diag, text="El resumen aparece en el Historial.").grid(row=1, column=0, sticky="w")
+
     def _construir_tab_historial(self):
         self.frame_hist = tb.Frame(self.tab_hist)
         self.frame_hist.pack(fill=BOTH, expand=True, padx=12, pady=12)
@@ -362,14 +344,69 @@ class App:
 
         if not self.historial:
             tb.Label(self.frame_hist, text="No hay exportaciones aún.").pack(anchor="w")
-            return
 
         for item in self.historial[-5:][::-1]:
-            fecha, ruta, formato, cats = item
+            fecha, ruta, formato, cats, semilla, fecha_ref, informe = item
             row = tb.Frame(self.frame_hist)
             row.pack(fill=X, pady=4)
-            tb.Label(row, text=f"• {fecha}  |  {formato}  |  {', '.join(cats)}").pack(side=LEFT)
+            tb.Label(row, text=f"• {fecha}  |  {formato}  |  {', '.join(cats)}  |  semilla {semilla} ({fecha_ref})").pack(side=LEFT)
             tb.Button(row, text="Abrir carpeta", bootstyle=INFO, command=lambda p=ruta: abrir_carpeta(p)).pack(side=RIGHT)
+            tb.Button(row, text="Reusar semilla", bootstyle=SECONDARY,
+                      command=lambda s=semilla, f=fecha_ref: self._reusar_semilla(s, f)).pack(side=RIGHT, padx=8)
+            if informe:
+                row_inf = tb.Frame(self.frame_hist)
+                row_inf.pack(fill=X)
+                tb.Label(row_inf, text=f"    {resumen(informe)}", bootstyle=SECONDARY).pack(side=LEFT)
+                tb.Button(row_inf, text="Detalle", bootstyle=(SECONDARY, LINK),
+                          command=lambda i=informe: self._mostrar_informe(i)).pack(side=RIGHT)
+
+        self._render_cache()
+
+    def _render_cache(self):
+        tb.Label(self.frame_hist, text="Caché de datasets", font=("", 11, "bold")).pack(anchor="w", pady=(16, 8))
+        lista = entradas_cache()
+        row = tb.Frame(self.frame_hist)
+        row.pack(fill=X, pady=4)
+        tb.Label(row, text=f"{len(lista)} datasets, {sum(m['bytes'] for m in lista) / 2**20:.1f} MiB").pack(side=LEFT)
+        tb.Button(row, text="Vaciar", bootstyle=DANGER, command=self._vaciar_cache).pack(side=RIGHT)
+        tb.Button(row, text="Ver contenido", bootstyle=SECONDARY,
+                  command=lambda: self._mostrar_cache(lista)).pack(side=RIGHT, padx=8)
+
+    def _mostrar_cache(self, lista):
+        if not lista:
+            messagebox.showinfo("Caché de datasets", "La caché está vacía.")
+            return
+        lineas = []
+        for meta in lista[:15]:
+            filas = ", ".join(f"{c} {d['filas']:,}" for c, d in meta["categorias"].items())
+            lineas.append(f"{meta['usado']}  semilla {meta['semilla']} ({meta['fecha_referencia']})  "
+                          f"{meta['bytes'] / 2**20:.1f} MiB\n    {filas}")
+        if len(lista) > 15:
+            lineas.append(f"... y {len(lista) - 15} más")
+        messagebox.showinfo("Caché de datasets", "\n".join(lineas))
+
+    def _vaciar_cache(self):
+        if self._futuro is not None:
+            messagebox.showinfo("Caché de datasets", "Espera a que termine la exportación en curso.")
+            return
+        if not messagebox.askyesno("Caché de datasets", "¿Borrar todos los datasets guardados en la caché?"):
+            return
+        liberados = purgar_cache()
+        self._render_historial()
+        messagebox.showinfo("Caché de datasets", f"Se liberaron {liberados / 2**20:.1f} MiB.")
+
+    def _mostrar_informe(self, informe):
+        lineas = []
+        for f in informe["etapas"]:
+            mem = "" if f["memoria_pico_mib"] is None else f"  {f['memoria_pico_mib']:.1f} MiB"
+            vel = "" if f["filas_por_segundo"] is None else f"  {f['filas_por_segundo']:,} filas/s"
+            lineas.append(f"{f['etapa']:<11} {f['categoria']:<12} {f['segundos']:.3f}s{vel}{mem}")
+        lineas.append(f"\nTotal: {informe['segundos_total']:.2f}s")
+        messagebox.showinfo("Informe por etapa", "\n".join(lineas))
+
+    def _reusar_semilla(self, semilla, fecha_ref):
+        self.semilla_var.set(str(semilla))
+        self.fecha_ref_var.set(fecha_ref)
 
     # --------- Eventos dinámicos ----------
 
@@ -383,6 +420,7 @@ class App:
         # refrescar scroll
         self.frame_right_inner.update_idletasks()
         self.canvas_right.configure(scrollregion=self.canvas_right.bbox("all"))
+        self._programar_vista_previa()
 
     def _crear_panel_categoria(self, categoria: str):
         # Evitar duplicados
@@ -393,14 +431,32 @@ class App:
         panel.pack(fill=X, padx=6, pady=6)
         setattr(self, f"panel_{categoria}", panel)
 
+        # Cantidad propia (opcional)
+        fila_cant = tb.Frame(panel)
+        fila_cant.pack(fill=X, pady=(0, 6))
+        tb.Label(fila_cant, text="Filas (vacío = cantidad global):").pack(side=LEFT)
+        self.cantidad_cat_vars[categoria] = tb.StringVar(value="")
+        tb.Entry(fila_cant, textvariable=self.cantidad_cat_vars[categoria], width=10).pack(side=LEFT, padx=6)
+
         # Columnas
         cols_frame = tb.Labelframe(panel, text="Columnas", padding=6)
         cols_frame.pack(fill=X, pady=(0, 6))
         self.column_vars.setdefault(categoria, {})
+        self.unica_vars.setdefault(categoria, {})
+        proveedores = config[categoria].get("faker", {})
         for col in config[categoria]["columns"]:
             var = tb.IntVar(value=1)
-            tb.Checkbutton(cols_frame, text=col, variable=var).pack(anchor="w")
+            fila = tb.Frame(cols_frame)
+            fila.pack(fill=X)
+            tb.Checkbutton(fila, text=col, variable=var,
+                           command=self._programar_vista_previa).pack(side=LEFT)
             self.column_vars[categoria][col] = var
+            if col in proveedores:
+                # columnas de Faker (nombres, correos): opción de no repetir valores
+                unica = tb.IntVar(value=int(col in config[categoria].get("unicas", [])))
+                tb.Checkbutton(fila, text="sin repetidos", variable=unica, bootstyle=SECONDARY,
+                               command=self._programar_vista_previa).pack(side=LEFT, padx=12)
+                self.unica_vars[categoria][col] = unica
 
         # Requires (spinboxes)
         reqs = config[categoria]["requires"]
@@ -412,8 +468,10 @@ class App:
             for key in reqs:
                 row = tb.Frame(req_frame)
                 row.pack(fill=X, pady=2)
-                tb.Label(row, text=f"{key} (3-20):", width=18).pack(side=LEFT)
-                spin = tb.Spinbox(row, from_=3, to=20, width=6)
+                tb.Label(row, text=f"{key} ({REQUIRES_MIN}-{REQUIRES_MAX}):", width=18).pack(side=LEFT)
+                spin = tb.Spinbox(row, from_=REQUIRES_MIN, to=REQUIRES_MAX, width=6,
+                                  command=self._programar_vista_previa)
+                spin.bind("<KeyRelease>", self._programar_vista_previa)
                 # valor por defecto = min(8, len(opciones[key]))
                 defecto = min(8, len(opciones[key]))
                 spin.delete(0, "end")
@@ -428,7 +486,74 @@ class App:
             setattr(self, f"panel_{categoria}", None)
         # limpiar estados
         self.column_vars.pop(categoria, None)
+        self.unica_vars.pop(categoria, None)
         self.requires_spin.pop(categoria, None)
+        self.cantidad_cat_vars.pop(categoria, None)
+
+    # --------- Vista previa ----------
+
+    def _programar_vista_previa(self, *_):
+        # Se recalcula cuando los cambios se calman, no en cada clic o tecla
+        if self._vista_id is not None:
+            self.root.after_cancel(self._vista_id)
+        self._vista_id = self.root.after(RETARDO_VISTA_PREVIA, self._actualizar_vista_previa)
+
+    def _actualizar_vista_previa(self):
+        self._vista_id = None
+        if self._futuro is not None or self._vista_futuro is not None:
+            # el hilo de trabajo está ocupado: se recalcula cuando se libere
+            self._vista_pendiente = True
+            return
+        self._vista_pendiente = False
+        try:
+            spec = self._leer_especificacion()
+        except ValueError as e:
+            self._vista = {}
+            self._mostrar_vista_previa(str(e))
+            return
+        self.vista_estado_var.set("Generando muestra...")
+        self._vista_futuro = self._ejecutor.submit(generar_muestra, spec)
+        self.root.after(INTERVALO_VISTA_PREVIA, self._sondear_vista_previa)
+
+    def _sondear_vista_previa(self):
+        futuro = self._vista_futuro
+        if not futuro.done():
+            self.root.after(INTERVALO_VISTA_PREVIA, self._sondear_vista_previa)
+            return
+        self._vista_futuro = None
+        try:
+            self._vista = futuro.result()
+            mensaje = None
+        except Exception as e:
+            self._vista = {}
+            mensaje = f"Vista previa no disponible: {e}"
+        self._mostrar_vista_previa(mensaje)
+        if self._vista_pendiente:
+            self._programar_vista_previa()
+
+    def _mostrar_vista_previa(self, mensaje=None):
+        categorias = list(self._vista)
+        self.combo_vista.configure(values=categorias)
+        if self.vista_cat_var.get() not in categorias:
+            self.vista_cat_var.set(categorias[0] if categorias else "")
+        tabla = self.tabla_vista
+        tabla.delete(*tabla.get_children())
+        df = self._vista.get(self.vista_cat_var.get())
+        if df is None:
+            tabla.configure(columns=())
+            self.vista_estado_var.set(mensaje or "Selecciona una categoría para ver una muestra.")
+            return
+
+        columnas = [str(c) for c in df.columns]
+        tabla.configure(columns=columnas)
+        for col in columnas:
+            tabla.heading(col, text=col)
+            tabla.column(col, width=120, stretch=False)
+        texto = fechas_a_texto(df).astype(object)
+        texto = texto.where(texto.notna(), "")
+        for fila in texto.itertuples(index=False):
+            tabla.insert("", "end", values=[str(v) for v in fila])
+        self.vista_estado_var.set(mensaje or f"{len(df)} filas · {len(columnas)} columnas")
 
     # ------------- Generación y exportación ----------------
 
@@ -443,168 +568,182 @@ class App:
             return []
         return activas
 
-    def _build_choices_for_categoria(self, categoria):
-        # Construye subconjuntos (choices) para los 'requires' de cada categoría
-        reqs = config[categoria]["requires"]
-        if not reqs:
-            return {}
-
-        choices = {}
-        for key in reqs:
-            spin = self.requires_spin.get(categoria, {}).get(key)
-            if spin is None:
-                # fallback: todo el catálogo
-                choices[key] = opciones[key]
-            else:
-                try:
-                    n = int(spin.get())
-                except Exception:
-                    n = 5
-                if n < 3 or n > 20:
-                    raise ValueError(f"{key} debe estar entre 3 y 20.")
-                choices[key] = asegurar_lista_unica(opciones[key], n)
-        return choices
-
-    def generar_exportar(self):
-        # Configurar Faker por idioma
-        self.fake = Faker(IDIOMAS.get(self.idioma_var.get(), "es_CO"))
-
-        categorias = self._leer_categorias_seleccionadas()
+    def _leer_unicas(self, categoria):
+        return [c for c, v in self.unica_vars.get(categoria, {}).items() if v.get() == 1]
+
+    def _leer_requires(self, categoria):
+        # Tamaño de los subconjuntos (choices) para los 'requires' de cada categoría
+        requires = {}
+        for key, spin in self.requires_spin.get(categoria, {}).items():
+            try:
+                requires[key] = int(spin.get())
+            except Exception:
+                requires[key] = 5
+        return requires
+
+    def _leer_cantidad_categoria(self, categoria):
+        var = self.cantidad_cat_vars.get(categoria)
+        return (var.get().strip() or None) if var is not None else None
+
+    def _leer_especificacion(self):
+        categorias = [
+            EspecCategoria(
+                nombre=cat,
+                columnas=self._leer_columnas_activas(cat),
+                requires=self._leer_requires(cat),
+                cantidad=self._leer_cantidad_categoria(cat),
+                unicas=self._leer_unicas(cat),
+            )
+            for cat in self._leer_categorias_seleccionadas()
+        ]
         if not categorias:
-            messagebox.showerror("Error", "Selecciona al menos una categoría.")
-            return
-
-        # Cantidad
+            raise ValueError("Selecciona al menos una categoría.")
+
+        sucios = OpcionesSucias(
+            porcentaje=int(self.porc_sucios_var.get()) if self.datos_sucios_var.get() else 0,
+            nulos=self.chk_nulos.get(),
+            duplicados=self.chk_dups.get(),
+            ruido_texto=self.chk_ruido.get(),
+            outliers=self.chk_outliers.get(),
+            tipos_erroneos=self.chk_tipos.get()
+        )
         try:
-            cantidad = int(self.cantidad_var.get())
-            if cantidad <= 0:
-                raise ValueError
+            cobertura = int(self.cobertura_var.get())
         except Exception:
-            messagebox.showerror("Error", "La cantidad debe ser un número positivo.")
-            return
+            raise ValueError("La cobertura debe ser un entero entre 1 y 100.")
+        semilla = self.semilla_var.get().strip()
+        if semilla and not semilla.isdigit():
+            raise ValueError("La semilla debe ser un entero no negativo.")
+        spec = Especificacion(
+            categorias=categorias,
+            cantidad=self.cantidad_var.get(),
+            idioma=self.idioma_var.get(),
+            sucios=sucios,
+            formato=self.formato_var.get(),
+            semilla=int(semilla) if semilla else None,
+            fecha_referencia=self.fecha_ref_var.get().strip() or None,
+            relacional=self.relacional_var.get(),
+            relaciones={"*": {"sesgo": round(float(self.sesgo_var.get()), 2),
+                              "cobertura": cobertura / 100}},
+            anexar=self.anexar_var.get(),
+            cache=self.cache_var.get(),
+        )
+        spec.validar()
+        return spec
+
+    def _pedir_ruta(self, formato, categorias, anexar=False):
+        ext = EXTENSIONES[formato]
+        opts = dict(
+            defaultextension=ext,
+            filetypes=[("SQLite" if formato == "SQL" else formato, f"*{ext}")],
+            initialfile=f"dataset{ext}"
+        )
+        if anexar:
+            # se elige la salida existente: no hay que confirmar que se reemplace
+            opts["confirmoverwrite"] = False
+        if formato in POR_CATEGORIA and len(categorias) == 1:
+            # Un archivo
+            opts["initialfile"] = f"{categorias[0].lower()}{ext}"
+        elif formato in POR_CATEGORIA:
+            # Varios archivos: base + sufijo por categoría
+            opts["title"] = "Elige nombre base (se generará un archivo por categoría)"
+        return filedialog.asksaveasfilename(**opts)
 
-        # Construcción de DataFrames por categoría
-        dataframes = {}
+    def generar_exportar(self):
+        if self._futuro is not None:
+            return
         try:
-            for cat in categorias:
-                cols_activas = self._leer_columnas_activas(cat)
-                if not cols_activas:
-                    # Si no hay columnas activas, omitimos esta categoría
-                    continue
-
-                choices = self._build_choices_for_categoria(cat)
-                registros = []
-                for _ in range(cantidad):
-                    row = config[cat]["generator"](self.fake, choices)
-                    row_dict = dict(zip(config[cat]["columns"], row))
-                    registros.append([row_dict[c] for c in cols_activas])
-
-                df = pd.DataFrame(registros, columns=cols_activas)
-
-                # Aplicar datos sucios si corresponde
-                if self.datos_sucios_var.get():
-                    df = aplicar_datos_sucios(
-                        df,
-                        porcentaje=int(self.porc_sucios_var.get()),
-                        habilitar_nulos=self.chk_nulos.get(),
-                        habilitar_duplicados=self.chk_dups.get(),
-                        habilitar_ruido_texto=self.chk_ruido.get(),
-                        habilitar_outliers=self.chk_outliers.get(),
-                        habilitar_tipos_erroneos=self.chk_tipos.get()
-                    )
-
-                dataframes[cat] = df
-
-            if not dataframes:
-                messagebox.showerror("Error", "No hay columnas activas en las categorías seleccionadas.")
-                return
+            spec = self._leer_especificacion()
+            categorias = categorias_activas(spec)
+            if not categorias:
+                raise ValueError("No hay columnas activas en las categorías seleccionadas.")
+            if spec.formato not in FORMATOS:
+                raise ValueError("Formato no soportado.")
         except ValueError as e:
             messagebox.showerror("Error", str(e))
             return
-        except Exception as e:
-            messagebox.showerror("Error", f"Ocurrió un problema generando los datos:\n{e}")
+
+        # La ruta se pide antes de generar: el diálogo debe abrirse en el hilo principal
+        ruta = self._pedir_ruta(spec.formato, categorias, spec.anexar)
+        if not ruta:
             return
 
-        # Exportación
-        formato = self.formato_var.get()
-        ruta_export = None
+        # Los formatos por bloques se escriben a medida que se generan:
+        # progreso por bloque y memoria acotada
+        if spec.formato in ESCRITORES_POR_BLOQUES:
+            spec.tamano_bloque = FILAS_POR_SHARD
+
+        self._cancelar.clear()
+        self._vaciar_cola()
+        self.progreso_var.set(0)
+        self.estado_var.set("Generando...")
+        self.btn_generar.configure(state="disabled")
+        self.btn_cancelar.configure(state="normal")
+        medidor = Medidor() if self.medir_var.get() else None
+        self._futuro = self._ejecutor.submit(
+            ejecutar_corrida, spec, ruta,
+            progreso=lambda cat, hechas, total: self._cola.put((cat, hechas, total)),
+            cancelar=self._cancelar,
+            medidor=medidor,
+        )
+        self._en_curso = (spec, categorias, medidor)
+        self.root.after(INTERVALO_SONDEO, self._sondear)
+
+    def cancelar(self):
+        if self._futuro is not None:
+            self._cancelar.set()
+            self.estado_var.set("Cancelando...")
+            self.btn_cancelar.configure(state="disabled")
+
+    def _vaciar_cola(self):
+        ultimo = None
+        while True:
+            try:
+                ultimo = self._cola.get_nowait()
+            except queue.Empty:
+                return ultimo
+
+    def _sondear(self):
+        # Solo el último mensaje importa: la barra muestra el avance acumulado
+        ultimo = self._vaciar_cola()
+        if ultimo is not None and not self._cancelar.is_set():
+            cat, hechas, total = ultimo
+            self.progreso_var.set(100 * hechas / total if total else 100)
+            self.estado_var.set(f"{cat}: {hechas:,} / {total:,} filas")
+
+        futuro = self._futuro
+        if not futuro.done():
+            self.root.after(INTERVALO_SONDEO, self._sondear)
+            return
 
+        self._futuro = None
+        self.btn_generar.configure(state="normal")
+        self.btn_cancelar.configure(state="disabled")
+        if self._vista_pendiente:
+            self._programar_vista_previa()
         try:
-            if formato == "CSV":
-                if len(dataframes) == 1:
-                    # Un archivo CSV
-                    ruta_export = filedialog.asksaveasfilename(
-                        defaultextension=".csv",
-                        filetypes=[("CSV", "*.csv")],
-                        initialfile=f"{list(dataframes.keys())[0].lower()}.csv"
-                    )
-                    if not ruta_export:
-                        return
-                    list(dataframes.values())[0].to_csv(ruta_export, index=False)
-                else:
-                    # Varios CSV: base + sufijo por categoría
-                    ruta_base = filedialog.asksaveasfilename(
-                        defaultextension=".csv",
-                        filetypes=[("CSV", "*.csv")],
-                        initialfile="dataset.csv",
-                        title="Elige nombre base (se generará un archivo por categoría)"
-                    )
-                    if not ruta_base:
-                        return
-                    base = Path(ruta_base)
-                    for cat, df in dataframes.items():
-                        out = base.with_name(f"{base.stem}_{cat}.csv")
-                        df.to_csv(out, index=False)
-                    ruta_export = str(base.parent)
-            elif formato == "Excel":
-                ruta_export = filedialog.asksaveasfilename(
-                    defaultextension=".xlsx",
-                    filetypes=[("Excel", "*.xlsx")],
-                    initialfile="dataset.xlsx"
-                )
-                if not ruta_export:
-                    return
-                with pd.ExcelWriter(ruta_export, engine="xlsxwriter") as writer:
-                    for cat, df in dataframes.items():
-                        # sheet name <= 31 chars
-                        sheet = cat[:31]
-                        df.to_excel(writer, sheet_name=sheet, index=False)
-            elif formato == "JSON":
-                ruta_export = filedialog.asksaveasfilename(
-                    defaultextension=".json",
-                    filetypes=[("JSON", "*.json")],
-                    initialfile="dataset.json"
-                )
-                if not ruta_export:
-                    return
-                payload = {cat: df.to_dict(orient="records") for cat, df in dataframes.items()}
-                with open(ruta_export, "w", encoding="utf-8") as f:
-                    json.dump(payload, f, ensure_ascii=False, indent=2, default=str)
-            elif formato == "SQL":
-                ruta_export = filedialog.asksaveasfilename(
-                    defaultextension=".db",
-                    filetypes=[("SQLite", "*.db")],
-                    initialfile="dataset.db"
-                )
-                if not ruta_export:
-                    return
-                conn = sqlite3.connect(ruta_export)
-                for cat, df in dataframes.items():
-                    table = cat.lower().replace(" ", "_")
-                    df.to_sql(table, conn, index=False, if_exists="replace")
-                conn.close()
-            else:
-                messagebox.showerror("Error", "Formato no soportado.")
-                return
-
+            ruta_export = futuro.result()
+        except Cancelado:
+            self.progreso_var.set(0)
+            self.estado_var.set("Cancelado.")
+            messagebox.showinfo("Cancelado", "Generación cancelada; la salida quedó como estaba antes."
+                                if self._en_curso[0].anexar else "Generación cancelada; se borró la salida parcial.")
+            return
         except Exception as e:
-            messagebox.showerror("Error", f"Ocurrió un problema al exportar:\n{e}")
+            self.progreso_var.set(0)
+            self.estado_var.set("Error.")
+            messagebox.showerror("Error", f"Ocurrió un problema generando o exportando los datos:\n{e}")
             return
 
-        # Historial / estado
+        # Historial / estado (siempre en el hilo principal)
+        spec, categorias, medidor = self._en_curso
+        self.progreso_var.set(100)
+        self.estado_var.set("Listo.")
         self.ultima_ruta = ruta_export or ""
         fecha = datetime.now().strftime("%Y-%m-%d %H:%M")
-        self.historial.append((fecha, self.ultima_ruta, formato, list(dataframes.keys())))
+        informe = medidor.informe(formato=spec.formato, cantidad=spec.cantidad) if medidor else None
+        self.historial.append((fecha, self.ultima_ruta, spec.formato, categorias,
+                               spec.semilla, spec.fecha_referencia, informe))
         # Mantener últimos 20
         if len(self.historial) > 20:
             self.historial = self.historial[-20:]
@@ -612,6 +751,12 @@ class App:
 
         messagebox.showinfo("Éxito", f"✅ Exportado correctamente:\n{self.ultima_ruta}")
 
+    def _al_cerrar(self):
+        # Si hay una corrida en curso se cancela (borra lo parcial) antes de salir
+        self._cancelar.set()
+        self._ejecutor.shutdown(wait=False, cancel_futures=True)
+        self.root.destroy()
+
 # ===========================
 # Lanzamiento
 # ===========================
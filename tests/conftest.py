@@ -0,0 +1,15 @@
+import os
+
+import pytest
+
+
+@pytest.fixture(scope="session", autouse=True)
+def cache_aislada(tmp_path_factory):
+    """Pools y caché de datasets en una carpeta temporal, no en ~/.cache."""
+    anterior = os.environ.get("GENERADOR_CACHE")
+    os.environ["GENERADOR_CACHE"] = str(tmp_path_factory.mktemp("cache"))
+    yield
+    if anterior is None:
+        os.environ.pop("GENERADOR_CACHE", None)
+    else:
+        os.environ["GENERADOR_CACHE"] = anterior
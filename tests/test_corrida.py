@@ -0,0 +1,44 @@
+import sqlite3
+import threading
+
+import pytest
+
+from generador.corrida import Cancelado, ejecutar_corrida
+from generador.motor import Especificacion
+
+
+def _cancelar_tras_el_primer_bloque(spec, ruta):
+    cancelar = threading.Event()
+    with pytest.raises(Cancelado):
+        ejecutar_corrida(spec, ruta, progreso=lambda *_: cancelar.set(), cancelar=cancelar)
+
+
+def _spec_sql():
+    return Especificacion.desde_dict({"categorias": ["Ventas", "Clientes"], "cantidad": 300,
+                                      "tamano_bloque": 100, "semilla": 1, "formato": "SQL"})
+
+
+def test_cancelar_sql_conserva_la_base_existente(tmp_path):
+    ruta = tmp_path / "existente.db"
+    with sqlite3.connect(ruta) as conn:
+        conn.execute("CREATE TABLE mia (x INTEGER)")
+        conn.execute("INSERT INTO mia VALUES (1)")
+        conn.execute("CREATE TABLE Ventas (y TEXT)")
+        conn.execute("INSERT INTO Ventas VALUES ('previa')")
+    conn.close()
+
+    _cancelar_tras_el_primer_bloque(_spec_sql(), ruta)
+
+    assert ruta.exists()
+    conn = sqlite3.connect(ruta)
+    try:
+        assert conn.execute("SELECT x FROM mia").fetchall() == [(1,)]
+        assert conn.execute("SELECT y FROM Ventas").fetchall() == [("previa",)]
+    finally:
+        conn.close()
+
+
+def test_cancelar_sql_borra_la_base_creada(tmp_path):
+    ruta = tmp_path / "nueva.db"
+    _cancelar_tras_el_primer_bloque(_spec_sql(), ruta)
+    assert not ruta.exists()
@@ -0,0 +1,23 @@
+import pandas as pd
+
+from generador import config
+from generador.corrida import ejecutar_corrida
+from generador.motor import Especificacion, generar_dataframes
+
+CANTIDAD = 250_000  # más de un shard y no múltiplo de FILAS_POR_SHARD
+
+
+def test_generar_dataframes_conserva_todas_las_filas():
+    spec = Especificacion.desde_dict({"categorias": list(config), "cantidad": CANTIDAD, "semilla": 1})
+    dataframes = generar_dataframes(spec)
+    assert set(dataframes) == set(config)
+    for categoria, df in dataframes.items():
+        assert len(df) == CANTIDAD, categoria
+
+
+def test_corrida_en_memoria_escribe_todas_las_filas(tmp_path):
+    spec = Especificacion.desde_dict({"categorias": ["Ventas", "Clientes"], "cantidad": CANTIDAD,
+                                      "semilla": 1, "formato": "CSV"})
+    ejecutar_corrida(spec, tmp_path / "d.csv")
+    for categoria in ("Ventas", "Clientes"):
+        assert len(pd.read_csv(tmp_path / f"d_{categoria}.csv")) == CANTIDAD, categoria
@@ -0,0 +1,30 @@
+import pandas as pd
+
+from generador import categorias, config, pools
+from generador.categorias import registrar_categoria
+from generador.motor import Especificacion, generar_dataframes
+
+
+def test_pool_de_varias_lineas_se_lee_igual_de_disco(tmp_path):
+    primero = pools.PoolFaker("es_CO", tamano=50, directorio=tmp_path).valores("address")
+    assert any("\n" in v for v in primero)
+    segundo = pools.PoolFaker("es_CO", tamano=50, directorio=tmp_path).valores("address")
+    assert list(segundo) == list(primero)
+
+
+def test_esquema_con_proveedor_de_varias_lineas_es_reproducible(monkeypatch):
+    nombre = registrar_categoria({"nombre": "Envios", "columnas": {
+        "Destino": {"tipo": "faker", "proveedor": "address"},
+        "Peso": {"tipo": "entero", "min": 1, "max": 30},
+    }})
+    try:
+        spec = Especificacion.desde_dict({"categorias": [nombre], "cantidad": 500, "semilla": 7})
+        primera = generar_dataframes(spec)[nombre]
+        # otra corrida en un proceso nuevo lee el pool de disco
+        monkeypatch.setattr(pools, "_pools_por_idioma", {})
+        segunda = generar_dataframes(spec)[nombre]
+    finally:
+        config.pop(nombre, None)
+        categorias._definiciones.pop(nombre, None)
+    assert primera["Destino"].str.contains("\n").any()
+    pd.testing.assert_frame_equal(primera, segunda)